@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Synthetic BOM generator for MIL-HDBK-217F benchmarks
+Builds reproducible component lists from the real style and factor tables
+"""
+
+import os
+import random
+import sqlite3
+
+# Share of components per family, roughly what a mixed-signal board looks like
+FAMILY_MIX = (
+    ('capacitor', 0.45),
+    ('resistor', 0.45),
+    ('inductor', 0.10),
+)
+
+# Share of components whose continuous parameters fall off the table grid,
+# so both the exact-table path and the equation path are exercised
+OFF_GRID_RATIO = 0.2
+
+class ReferenceTables:
+    """Style codes and factor grid points read from mil_hdbk_217.db"""
+
+    def __init__(self, database_path):
+        conn = sqlite3.connect(database_path)
+        try:
+            def column(sql):
+                return [row[0] for row in conn.execute(sql).fetchall()]
+
+            self.capacitor_styles = column('SELECT style FROM capacitor_styles ORDER BY id')
+            self.resistor_styles = column('SELECT style FROM resistor_styles ORDER BY id')
+            self.inductor_types = column('SELECT inductor_type FROM inductor_styles ORDER BY id')
+
+            self.capacitor_qualities = column('SELECT quality_level FROM quality_factors ORDER BY id')
+            self.resistor_qualities = column('SELECT quality_level FROM resistor_quality_factors ORDER BY id')
+            self.inductor_qualities = column('SELECT quality_level FROM inductor_quality_factors ORDER BY id')
+            self.environments = column('SELECT environment FROM environment_factors ORDER BY id')
+
+            self.temperatures = column('SELECT temperature FROM temperature_factors ORDER BY temperature')
+            self.capacitances = column('SELECT capacitance FROM capacitance_factors ORDER BY capacitance')
+            self.voltage_stresses = column('SELECT voltage_stress FROM voltage_stress_factors ORDER BY voltage_stress')
+            self.power_dissipations = column('SELECT power_dissipation FROM resistor_power_factors ORDER BY power_dissipation')
+            self.power_stresses = column('SELECT power_stress FROM resistor_stress_factors ORDER BY power_stress')
+        finally:
+            conn.close()
+
+class BOMGenerator:
+    """Deterministic generator of /api/calculate component payloads"""
+
+    def __init__(self, database_path, seed=217):
+        if not os.path.exists(database_path):
+            raise FileNotFoundError(f"Database not found at {database_path}")
+        self.tables = ReferenceTables(database_path)
+        self.seed = seed
+
+    def generate(self, size, project_name='Benchmark Project'):
+        """Generate `size` components; the same seed and size always give the same BOM"""
+        rng = random.Random(f'{self.seed}:{size}')
+        families = [family for family, _ in FAMILY_MIX]
+        weights = [weight for _, weight in FAMILY_MIX]
+
+        tables = self.tables
+        temperatures = self._window(tables.temperatures, 20, 125)
+        capacitances = self._window(tables.capacitances, 0.001, 1000.0)
+        voltage_stresses = self._window(tables.voltage_stresses, 0.1, 1.0)
+        power_dissipations = self._window(tables.power_dissipations, 0.01, 5.0)
+        power_stresses = self._window(tables.power_stresses, 0.1, 0.9)
+
+        # All components of a project share the global temperature/environment
+        # in the UI, but imported BOMs mix them, so vary them per board here
+        board_size = 250
+        components = []
+        for index in range(size):
+            if index % board_size == 0:
+                temperature = self._pick(rng, temperatures, 20, 125, integer=True)
+                environment = rng.choice(tables.environments)
+
+            family = rng.choices(families, weights)[0]
+            component = {
+                'id': f'{family}_{index + 1}',
+                'component_type': family,
+                'project_name': project_name,
+                'name': f'{family.capitalize()} {index + 1}',
+                'description': f'Synthetic {family} {index + 1}',
+                'manufacturer': rng.choice(('Vishay', 'KEMET', 'Murata', 'Bourns', 'TDK')),
+                'part_number': f'SYN-{family[0].upper()}{rng.randrange(10 ** 6):06d}',
+                'temperature': temperature,
+                'environment': environment,
+            }
+
+            if family == 'capacitor':
+                component.update({
+                    'style': rng.choice(tables.capacitor_styles),
+                    'capacitance': self._pick(rng, capacitances, 0.001, 1000.0),
+                    'voltage_stress': self._pick(rng, voltage_stresses, 0.1, 1.0),
+                    'series_resistance': round(rng.uniform(0.05, 1.2), 2),
+                    'quality_level': rng.choice(tables.capacitor_qualities),
+                })
+            elif family == 'resistor':
+                component.update({
+                    'style': rng.choice(tables.resistor_styles),
+                    'watts': self._pick(rng, power_dissipations, 0.01, 5.0),
+                    'power_stress': self._pick(rng, power_stresses, 0.1, 0.9),
+                    'quality_level': rng.choice(tables.resistor_qualities),
+                })
+            else:
+                component.update({
+                    'inductor_type': rng.choice(tables.inductor_types),
+                    'quality_level': rng.choice(tables.inductor_qualities),
+                })
+
+            components.append(component)
+
+        return components
+
+    def generate_project(self, size, components=None, results=None):
+        """Wrap a generated BOM in the project structure used by the Excel endpoints"""
+        project = {
+            'id': f'proj_benchmark_{size}',
+            'name': f'Benchmark {size}',
+            'description': f'Synthetic BOM with {size} components (seed {self.seed})',
+            'createdAt': '2025-01-01T00:00:00+07:00',
+            'modifiedAt': '2025-01-01T00:00:00+07:00',
+            'version': '1.1.0',
+            'globalParameters': {'temperature': 25, 'environment': 'GB'},
+            'components': components if components is not None else self.generate(size),
+        }
+        if results is not None:
+            project['results'] = results
+        return project
+
+    @staticmethod
+    def _window(grid, low, high):
+        """Table grid points inside [low, high]"""
+        return [value for value in grid if low <= value <= high] or list(grid)
+
+    @staticmethod
+    def _pick(rng, grid, low, high, integer=False):
+        """Pick a table grid point, or an off-grid value within [low, high]"""
+        if rng.random() >= OFF_GRID_RATIO:
+            return rng.choice(grid)
+        if integer:
+            return rng.randint(int(low), int(high))
+        return round(rng.uniform(low, high), 4)
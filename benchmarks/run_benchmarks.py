@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Performance benchmarks for the MIL-HDBK-217F Reliability Prediction backend
+Drives /api/calculate, /api/export/excel and /api/import/excel in-process
+through Flask's test client and records throughput, latency and peak memory.
+The calculate scenario runs with the result cache off; calculate_cached
+repeats an identical request so every timed run is a cache hit.
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes 1000 10000
+    python benchmarks/run_benchmarks.py --save-baseline
+    python benchmarks/run_benchmarks.py --fail-on-regression
+"""
+
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(os.path.dirname(BENCH_DIR), 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from bom_generator import BOMGenerator
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+SCENARIOS = ['calculate', 'calculate_cached', 'export', 'import']
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+# An exported report holds one row per component in the configuration section
+# and again in the results section, and xlsx sheets stop at 1,048,576 rows
+DEFAULT_EXCEL_MAX_SIZE = 100000
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    rank = max(1, int(round(pct / 100.0 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+class BenchmarkRunner:
+    """Runs each scenario against one in-process Flask app"""
+
+    def __init__(self, database_path=None, seed=217, repeat=5, warmup=1, track_memory=True):
+        from config import Config
+        # Work on a copy: importing projects writes to the part library
+        self.source_path = os.path.abspath(database_path) if database_path else Config.get_database_path()
+        self.work_dir = tempfile.mkdtemp(prefix='reliability-bench-')
+        Config.DATABASE_PATH = os.path.join(self.work_dir, 'mil_hdbk_217.db')
+        shutil.copyfile(self.source_path, Config.DATABASE_PATH)
+
+        import app as flask_app
+        self.config = Config
+        self.app = flask_app.app
+        self.client = self.app.test_client()
+        self.generator = BOMGenerator(Config.DATABASE_PATH, seed=seed)
+        self.seed = seed
+        self.repeat = repeat
+        self.warmup = warmup
+        self.track_memory = track_memory
+
+    # -- scenario requests -------------------------------------------------
+
+    def _calculate(self, components):
+        # Identical payloads would otherwise be answered from the result cache
+        self.config.RESULT_CACHE_ENABLED = False
+        response = self.client.post('/api/calculate', json={'components': components})
+        return self._check(response, 'calculate')
+
+    def _calculate_cached(self, components):
+        self.config.RESULT_CACHE_ENABLED = True
+        response = self._check(self.client.post('/api/calculate', json={'components': components}), 'calculate_cached')
+        if response.headers.get('X-Result-Cache') != 'memory':
+            raise RuntimeError(f"calculate_cached answered from {response.headers.get('X-Result-Cache')!r}")
+        return response
+
+    def _export(self, project):
+        response = self.client.post('/api/export/excel', json={'project': project})
+        return self._check(response, 'export')
+
+    def _import(self, workbook_bytes):
+        response = self.client.post(
+            '/api/import/excel',
+            data={'file': (io.BytesIO(workbook_bytes), 'benchmark.xlsx')},
+            content_type='multipart/form-data'
+        )
+        return self._check(response, 'import')
+
+    @staticmethod
+    def _check(response, scenario):
+        if response.status_code != 200:
+            try:
+                message = response.get_json().get('error')
+            except Exception:
+                message = response.data[:200]
+            raise RuntimeError(f"{scenario} failed with HTTP {response.status_code}: {message}")
+        return response
+
+    # -- measurement -------------------------------------------------------
+
+    def _measure(self, size, func, *args):
+        """Time `repeat` calls of func and, optionally, one traced call for peak memory"""
+        for _ in range(self.warmup):
+            func(*args)
+
+        samples = []
+        response = None
+        for _ in range(self.repeat):
+            gc.collect()
+            start = time.perf_counter()
+            response = func(*args)
+            samples.append(time.perf_counter() - start)
+
+        peak_memory = None
+        if self.track_memory:
+            gc.collect()
+            tracemalloc.start()
+            try:
+                func(*args)
+                _, peak_memory = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        p50 = percentile(samples, 50)
+        return response, {
+            'size': size,
+            'samples_s': [round(sample, 6) for sample in samples],
+            'p50_s': round(p50, 6),
+            'p99_s': round(percentile(samples, 99), 6),
+            'mean_s': round(sum(samples) / len(samples), 6),
+            'throughput_per_s': round(size / p50, 2) if p50 > 0 else None,
+            'peak_memory_bytes': peak_memory,
+            'response_bytes': len(response.data),
+        }
+
+    def run(self, sizes, scenarios, excel_max_size=DEFAULT_EXCEL_MAX_SIZE):
+        results = {scenario: {} for scenario in scenarios}
+
+        for size in sizes:
+            components = self.generator.generate(size)
+            print(f"[{size}] generated {len(components)} components")
+
+            # Export needs calculated results and import needs an exported workbook,
+            # so the calculation always runs first (timed only if requested)
+            if 'calculate' in scenarios:
+                response, stats = self._measure(size, self._calculate, components)
+                results['calculate'][str(size)] = stats
+                self._report('calculate', stats)
+            else:
+                response = self._calculate(components)
+            calc_results = response.get_json()
+
+            # Fill the cache first so every measured run is a hit
+            if 'calculate_cached' in scenarios:
+                self.config.RESULT_CACHE_ENABLED = True
+                self._check(self.client.post('/api/calculate', json={'components': components}), 'calculate_cached')
+                _, stats = self._measure(size, self._calculate_cached, components)
+                results['calculate_cached'][str(size)] = stats
+                self._report('calculate_cached', stats)
+
+            if size > excel_max_size:
+                if 'export' in scenarios or 'import' in scenarios:
+                    print(f"[{size}] skipping Excel scenarios (--excel-max-size {excel_max_size})")
+                continue
+
+            project = self.generator.generate_project(size, components=components, results=calc_results)
+            if 'export' in scenarios:
+                response, stats = self._measure(size, self._export, project)
+                results['export'][str(size)] = stats
+                self._report('export', stats)
+            else:
+                response = self._export(project)
+            workbook_bytes = response.data
+
+            if 'import' in scenarios:
+                _, stats = self._measure(size, self._import, workbook_bytes)
+                stats['request_bytes'] = len(workbook_bytes)
+                results['import'][str(size)] = stats
+                self._report('import', stats)
+
+        return {
+            'meta': {
+                'created_at': datetime.now().isoformat(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'seed': self.seed,
+                'repeat': self.repeat,
+                'warmup': self.warmup,
+                'database': self.source_path,
+            },
+            'results': results,
+        }
+
+    @staticmethod
+    def _report(scenario, stats):
+        memory = stats['peak_memory_bytes']
+        memory_str = f"{memory / (1024 * 1024):.1f} MiB" if memory is not None else 'n/a'
+        print(f"[{stats['size']}] {scenario:<16} p50 {stats['p50_s'] * 1000:10.2f} ms  "
+              f"p99 {stats['p99_s'] * 1000:10.2f} ms  "
+              f"{stats['throughput_per_s']:>12,.0f} comp/s  peak {memory_str}")
+
+def compare_with_baseline(current, baseline, threshold):
+    """Print p50 and peak-memory deltas against a baseline; return the regressions"""
+    regressions = []
+    print(f"\nComparison against baseline from {baseline['meta'].get('created_at', 'unknown')}:")
+    for scenario, by_size in current['results'].items():
+        for size, stats in by_size.items():
+            base = baseline['results'].get(scenario, {}).get(size)
+            if not base:
+                continue
+            for metric in ('p50_s', 'peak_memory_bytes'):
+                old, new = base.get(metric), stats.get(metric)
+                if not old or new is None:
+                    continue
+                change = (new - old) / old
+                flag = ''
+                if change > threshold:
+                    flag = '  REGRESSION'
+                    regressions.append((scenario, size, metric, change))
+                print(f"  {scenario:<16} {size:>8} {metric:<18} {old:>14.6g} -> {new:<14.6g} {change:+7.1%}{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark calculate, Excel export and Excel import')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='BOM sizes to benchmark (default: 1k 10k 100k 1M)')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per scenario and size')
+    parser.add_argument('--warmup', type=int, default=1, help='untimed runs before timing')
+    parser.add_argument('--seed', type=int, default=217, help='generator seed')
+    parser.add_argument('--database', help='mil_hdbk_217.db to copy factors from')
+    parser.add_argument('--excel-max-size', type=int, default=DEFAULT_EXCEL_MAX_SIZE,
+                        help='largest BOM used for the Excel scenarios')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc peak-memory run')
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'latest.json'))
+    parser.add_argument('--baseline', default=os.path.join(RESULTS_DIR, 'baseline.json'),
+                        help='baseline JSON to compare against, if it exists')
+    parser.add_argument('--save-baseline', action='store_true', help='also write the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='relative slowdown reported as a regression (default: 0.10)')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args(argv)
+
+    runner = BenchmarkRunner(
+        database_path=args.database,
+        seed=args.seed,
+        repeat=max(1, args.repeat),
+        warmup=max(0, args.warmup),
+        track_memory=not args.no_memory
+    )
+    try:
+        current = runner.run(sorted(args.sizes), args.scenarios, excel_max_size=args.excel_max_size)
+    finally:
+        shutil.rmtree(runner.work_dir, ignore_errors=True)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(current, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            regressions = compare_with_baseline(current, json.load(f), args.threshold)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+
+    if regressions and args.fail_on_regression:
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
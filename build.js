@@ -5,6 +5,12 @@ const path = require("path");
 console.log("🔨 Building Flask App with PyInstaller...");
 
 try {
+  // Compile the handbook factor tables into database/factor_snapshot.py
+  execSync("python src/database/compile_snapshot.py", {
+    stdio: "inherit",
+    cwd: __dirname,
+  });
+
   // Build dengan python -m PyInstaller
   execSync("python -m PyInstaller build_app.spec --clean", {
     stdio: "inherit",
@@ -2,6 +2,7 @@ const { app, BrowserWindow, Menu, shell, dialog } = require("electron");
 const path = require("path");
 const { spawn } = require("child_process");
 const fs = require("fs");
+const http = require("http");
 
 let mainWindow;
 let splashWindow;
@@ -12,6 +13,8 @@ const isDev =
 // Flask server configuration
 const FLASK_PORT = 5000;
 const FLASK_HOST = "127.0.0.1";
+const HEALTH_POLL_INTERVAL = 100; // ms between readiness checks
+const HEALTH_TIMEOUT = 60000; // give up if the backend never becomes ready
 
 function createSplashWindow() {
   splashWindow = new BrowserWindow({
@@ -366,6 +369,28 @@ function getFlaskExecutablePath() {
   }
 }
 
+// Resolves with the health report once /api/health answers 200 (ready)
+function checkHealth() {
+  return new Promise((resolve) => {
+    const request = http.get(
+      { host: FLASK_HOST, port: FLASK_PORT, path: "/api/health", timeout: 1000 },
+      (response) => {
+        let body = "";
+        response.on("data", (chunk) => (body += chunk));
+        response.on("end", () => {
+          try {
+            resolve({ ready: response.statusCode === 200, status: JSON.parse(body) });
+          } catch (error) {
+            resolve({ ready: false, status: null });
+          }
+        });
+      }
+    );
+    request.on("timeout", () => request.destroy());
+    request.on("error", () => resolve({ ready: false, status: null }));
+  });
+}
+
 function startFlaskServer() {
   return new Promise((resolve, reject) => {
     try {
@@ -404,57 +429,69 @@ function startFlaskServer() {
 
       let serverStarted = false;
       let startupTimeout;
+      let healthPoll;
+      const startedAt = Date.now();
 
-      pythonProcess.stdout.on("data", (data) => {
-        const output = data.toString();
-        console.log(`Flask stdout: ${output}`);
-        if (
-          (output.includes("Running on") ||
-            output.includes("Serving Flask app")) &&
-          !serverStarted
-        ) {
+      const stopWaiting = () => {
+        if (startupTimeout) clearTimeout(startupTimeout);
+        if (healthPoll) clearTimeout(healthPoll);
+      };
+
+      // Poll readiness instead of guessing from stdout; the backend flips
+      // ready once its warm-up (factor caches, reference data, database) is done
+      const pollHealth = async () => {
+        const { ready, status } = await checkHealth();
+        if (serverStarted) return;
+        if (ready) {
           serverStarted = true;
-          if (startupTimeout) clearTimeout(startupTimeout);
-          setTimeout(resolve, 2000);
+          stopWaiting();
+          console.log(`Flask server ready after ${Date.now() - startedAt} ms`);
+          resolve();
+        } else if (status && status.error) {
+          serverStarted = true;
+          stopWaiting();
+          reject(new Error(`Flask warm-up failed: ${status.error}`));
+        } else {
+          healthPoll = setTimeout(pollHealth, HEALTH_POLL_INTERVAL);
         }
+      };
+      pollHealth();
+
+      pythonProcess.stdout.on("data", (data) => {
+        console.log(`Flask stdout: ${data.toString()}`);
       });
 
+      // Logged only: startup succeeds or fails by /api/health and the process
+      // exit code, not by what the server happens to print
       pythonProcess.stderr.on("data", (data) => {
-        const error = data.toString();
-        console.error(`Flask stderr: ${error}`);
-        if (
-          error.includes("Error") ||
-          error.includes("Failed") ||
-          error.includes("ImportError")
-        ) {
-          if (!serverStarted && startupTimeout) {
-            clearTimeout(startupTimeout);
-            reject(new Error(`Flask startup error: ${error}`));
-          }
-        }
+        console.error(`Flask stderr: ${data.toString()}`);
       });
 
       pythonProcess.on("error", (err) => {
         console.error("Failed to start Flask server:", err);
-        if (startupTimeout) clearTimeout(startupTimeout);
+        serverStarted = true;
+        stopWaiting();
         reject(err);
       });
 
       pythonProcess.on("close", (code) => {
         console.log(`Flask server exited with code ${code}`);
-        if (code !== 0 && code !== null && !serverStarted) {
-          if (startupTimeout) clearTimeout(startupTimeout);
+        if (!serverStarted) {
+          serverStarted = true;
+          stopWaiting();
           reject(new Error(`Flask server exited with code ${code}`));
         }
       });
 
       startupTimeout = setTimeout(() => {
-        if (!serverStarted && !pythonProcess.killed) {
-          console.log("Flask server timeout - assuming started");
+        if (!serverStarted) {
           serverStarted = true;
-          resolve();
+          stopWaiting();
+          reject(
+            new Error(`Flask server not ready after ${HEALTH_TIMEOUT / 1000} s`)
+          );
         }
-      }, 10000);
+      }, HEALTH_TIMEOUT);
     } catch (error) {
       console.error("Error in startFlaskServer:", error);
       reject(error);
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Contributor analysis for calculated BOMs
+Top-N λ_P contributors with cumulative Pareto shares, and λ_P histograms by
+family, style and environment.
+"""
+
+import heapq
+
+HISTOGRAM_DIMENSIONS = ('family', 'style', 'environment')
+
+def _share(value, total):
+    return round(100.0 * value / total, 4) if total else 0.0
+
+def top_contributors(components, results, total_lambda_p, n):
+    """
+    The n largest λ_P contributors, largest first, with cumulative percentages
+
+    Uses heap selection, O(len(results) log n), instead of sorting every row.
+    """
+    indexes = heapq.nlargest(n, range(len(results)), key=lambda i: results[i]['lambda_p'])
+    contributors = []
+    cumulative = 0.0
+    for i in indexes:
+        result = results[i]
+        cumulative += result['lambda_p']
+        contributors.append({
+            'index': i,
+            'name': result.get('name'),
+            'component_type': components[i].get('component_type', 'capacitor'),
+            'style': result.get('style'),
+            'part_number': result.get('parameters', {}).get('part_number', ''),
+            'lambda_p': result['lambda_p'],
+            'share_pct': _share(result['lambda_p'], total_lambda_p),
+            'cumulative_pct': _share(cumulative, total_lambda_p)
+        })
+    return contributors
+
+def lambda_histograms(components, results, total_lambda_p):
+    """Component count and summed λ_P per family, style and environment, largest first"""
+    buckets = {dimension: {} for dimension in HISTOGRAM_DIMENSIONS}
+    by_family, by_style, by_environment = (buckets[dimension] for dimension in HISTOGRAM_DIMENSIONS)
+    for component, result in zip(components, results):
+        lambda_p = result['lambda_p']
+        for histogram, key in (
+            (by_family, component.get('component_type', 'capacitor')),
+            (by_style, result.get('style')),
+            (by_environment, result.get('parameters', {}).get('environment')),
+        ):
+            entry = histogram.get(key)
+            if entry is None:
+                histogram[key] = [1, lambda_p]
+            else:
+                entry[0] += 1
+                entry[1] += lambda_p
+
+    return {
+        dimension: [
+            {
+                'key': key,
+                'count': count,
+                'lambda_p': round(lambda_p, 10),
+                'share_pct': _share(lambda_p, total_lambda_p)
+            }
+            for key, (count, lambda_p) in sorted(histogram.items(), key=lambda item: -item[1][1])
+        ]
+        for dimension, histogram in buckets.items()
+    }
+
+def summarize(components, results, total_lambda_p, top_n, pareto_pct=80.0):
+    """Top contributors, Pareto cut-off and histograms for one calculation"""
+    contributors = top_contributors(components, results, total_lambda_p, top_n)
+    pareto_count = next(
+        (position for position, item in enumerate(contributors, 1) if item['cumulative_pct'] >= pareto_pct), None)
+    return {
+        'top_contributors': contributors,
+        'pareto_pct': pareto_pct,
+        # Contributors needed to reach pareto_pct, or None if the top N fall short
+        'pareto_count': pareto_count,
+        'histograms': lambda_histograms(components, results, total_lambda_p)
+    }
@@ -4,22 +4,85 @@ Enhanced Flask backend for MIL-HDBK-217F Reliability Prediction Calculator
 Project-based application with improved functionality
 """
 
+import startup
 import os
 import sqlite3
 import math
 import json
-import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from openpyxl.utils import get_column_letter
+from functools import wraps
 import io
 from flask import send_file
 from datetime import datetime, timezone, timedelta
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, Response, render_template, request, jsonify, session, redirect, url_for
+from flask.json.provider import DefaultJSONProvider
 from config import Config
+import timing
+import metrics
+import profiling
+import search
+import assembly
+import rbd
+import parts_count
+import derating
+import analysis
+import diff
+import live
+import health
+import result_sets
+import result_cache
+import engine
+from engine import catalog
+from engine import (
+    CALCULATION_FIELDS, STYLE_FIELDS, DEFAULT_QUALITY_LEVELS, get_component_type, get_component_name, get_calculation_key,
+    get_reference_component, calculate_single_component, get_factor_overrides)
+from database import migrations
+from werkzeug.serving import make_server
+
+try:
+    from database import factor_snapshot
+except ImportError:
+    factor_snapshot = None  # only generated by the build
+
+startup.report.mark('imports')
+
+class ResultJSONProvider(DefaultJSONProvider):
+    """JSON provider that serializes engine result records, rounding their factors"""
+    
+    @staticmethod
+    def default(o):
+        if isinstance(o, engine.ComponentResult):
+            return o.to_dict()
+        return DefaultJSONProvider.default(o)
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = ResultJSONProvider(app)
 app.config.from_object(Config)
+timing.init_app(app)
+metrics.init_app(app)
+profiling.init_app(app)
+
+assembly_store = assembly.AssemblyStore(Config.ASSEMBLY_MAX_TREES)
+result_store = result_sets.ResultStore(
+    Config.RESULT_STORE_MAX_SETS, Config.RESULT_STORE_MAX_ROWS, Config.RESULT_STORE_TTL)
+metrics.registry.register_cache('result_store', result_store.cache_stats)
+calculation_cache = result_cache.ResultCache(
+    Config.RESULT_CACHE_MAX_ENTRIES, Config.RESULT_CACHE_MAX_ROWS, Config.RESULT_CACHE_TTL,
+    result_cache.open_disk_tier(Config.RESULT_CACHE_PATH, Config.RESULT_CACHE_DISK_MAX_ENTRIES, Config.RESULT_CACHE_TTL),
+    Config.VERSION)
+metrics.registry.register_cache('result_cache', calculation_cache.cache_stats)
+live_sessions = live.LiveSessionStore(
+    Config.LIVE_MAX_SESSIONS, Config.LIVE_DEBOUNCE, Config.LIVE_MAX_DELAY,
+    Config.LIVE_EVENT_HISTORY, Config.LIVE_IDLE_TIMEOUT)
+
+def admin_required(view):
+    """Restrict an endpoint to requests from the local machine"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.remote_addr not in Config.ADMIN_ALLOWED_ADDRESSES:
+            return jsonify({'error': 'Admin endpoints are only available locally'}), 403
+        return view(*args, **kwargs)
+    return wrapper
 
 def init_database():
     """Initialize database if it doesn't exist"""
@@ -37,241 +100,15 @@ def init_database():
                 sys.path.append(database_dir)
             
             from database.init_db import create_database
-            create_database()
+            create_database(database_path)
             print(f"Database created successfully at: {database_path}")
         except ImportError as e:
             print(f"Error importing init_db: {e}")
-            # Create database manually if import fails
-            create_database_manually(database_path)
-
-def create_database_manually(db_path):
-    """Fallback database creation"""
-    try:
-        import sqlite3
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Basic capacitor_styles table
-        cursor.execute('''
-        CREATE TABLE capacitor_styles (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            style TEXT NOT NULL,
-            spec_number TEXT,
-            description TEXT,
-            lambda_b REAL NOT NULL,
-            pi_t_column INTEGER,
-            pi_c_column INTEGER,
-            pi_v_column INTEGER,
-            pi_sr REAL DEFAULT 1.0,
-            created_at TIMESTAMP DEFAULT (datetime('now', '+7 hours'))
-            )
-            ''')
-    
-        # Temperature factor table
-        cursor.execute('''
-        CREATE TABLE temperature_factors (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            temperature INTEGER NOT NULL,
-            column_1 REAL,
-            column_2 REAL,
-            created_at TIMESTAMP DEFAULT (datetime('now', '+7 hours'))
-        )
-        ''')
-        
-        # Capacitance factor table
-        cursor.execute('''
-        CREATE TABLE capacitance_factors (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            capacitance REAL NOT NULL,
-            column_1 REAL,
-            column_2 REAL,
-            created_at TIMESTAMP DEFAULT (datetime('now', '+7 hours'))
-        )
-        ''')
-        
-        # Voltage stress factor table
-        cursor.execute('''
-        CREATE TABLE voltage_stress_factors (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            voltage_stress REAL NOT NULL,
-            column_1 REAL,
-            column_2 REAL,
-            column_3 REAL,
-            column_4 REAL,
-            column_5 REAL,
-            created_at TIMESTAMP DEFAULT (datetime('now', '+7 hours'))
-        )
-        ''')
-        
-        # Quality factor table
-        cursor.execute('''
-        CREATE TABLE quality_factors (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            quality_level TEXT NOT NULL,
-            pi_q REAL NOT NULL,
-            created_at TIMESTAMP DEFAULT (datetime('now', '+7 hours'))
-        )
-        ''')
-        
-        # Environment factor table
-        cursor.execute('''
-        CREATE TABLE environment_factors (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            environment TEXT NOT NULL,
-            pi_e REAL NOT NULL,
-            created_at TIMESTAMP DEFAULT (datetime('now', '+7 hours'))
-        )
-        ''')
-        
-        # Series resistance factor table (for tantalum capacitors)
-        cursor.execute('''
-        CREATE TABLE series_resistance_factors (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            resistance_range TEXT NOT NULL,
-            pi_sr REAL NOT NULL,
-            created_at TIMESTAMP DEFAULT (datetime('now', '+7 hours'))
-        )
-        ''')
-        
-        # Insert basic data
-        cursor.execute('''
-            INSERT OR REPLACE INTO capacitor_styles 
-            (style, spec_number, description, lambda_b, pi_t_column, pi_c_column, pi_v_column, pi_sr)
-            VALUES ('CP', '25', 'Capacitor, Fixed, Paper-Dielectric, Direct Current (Hermetically Sealed in Metal Cases)', 0.00037, 1, 1, 1, 1.0),
-            ('CA', '12889', 'Capacitor, By-Pass, Radio Interference Reduction, Paper Dielectric, AC and DC (Hermetically sealed in Metallic Case)', 0.00037, 1, 1, 1, 1.0),
-            ('CZ, CZR', '11693', 'Capacitor, Feed through, Radio Interference Reduction AC and DC (Hermetically sealed in metal cases), Established and Nonestablished Reliability', 0.00037, 1, 1, 1, 1.0),
-            ('CQ, CQR', '19978', 'Capacitor, Fixed Plastic (or Paper-Plastic) Dielectric (Hermetically sealed in metal, ceramic, or glass cases), Established and Nonestablished Reliability', 0.00051, 1, 1, 1, 1.0),
-            ('CH', '18312', 'Capacitor, Fixed, Metallized (Paper, Paper Plastic or Plastic Film) Dielectric, Direct Current (Hermetically Sealed in Metal Cases)', 0.00037, 1, 1, 1, 1.0),
-            ('CHR', '39022', 'Capacitor, Fixed, Metallized Paper, Paper-Plastic Film or Plastic Film Dielectric', 0.00051, 1, 1, 1, 1.0),
-            ('CFR', '55514', 'Capacitor, Fixed, Plastic (or Metallized Plastic) Dielectric, Direct Current in Non-Metal Cases', 0.00051, 1, 1, 1, 1.0),
-            ('CRH', '83421', 'Capacitor, Fixed Supermetallized Plastic Film Dielectric (DC, AC or DC and AC) Hermetically sealed Established Reliability', 0.00051, 1, 1, 1, 1.0),
-            ('CM', '5', 'Capacitor, Fixed, Mica Dielectric', 0.00076, 2, 1, 2, 1.0),
-            ('CMR', '39001', 'Capacitor, Fixed, Mica Dielectric, Established Reliability', 0.00076, 2, 1, 2, 1.0),
-            ('CB', '10950', 'Capacitor, Fixed, Mica Dielectric, Button Style', 0.00076, 2, 1, 2, 1.0),
-            ('CY', '11272', 'Capacitor, Fixed, Glass Dielectric', 0.00076, 2, 1, 2, 1.0),
-            ('CYR', '23269', 'Capacitor, Fixed, Glass Dielectric, Established Reliability', 0.00076, 2, 1, 2, 1.0),
-            ('CK', '11015', 'Capacitor, Fixed, Ceramic Dielectric (General Purpose)', 0.00099, 2, 1, 3, 1.0),
-            ('CKR', '39014', 'Capacitor, Fixed, Ceramic Dielectric (General Purpose), Established Reliability', 0.00099, 2, 1, 3, 1.0),
-            ('CC, CCR', '20', 'Capacitor, Fixed, Ceramic Dielectric (Temperature Compensating), Established and Nonestablished Reliability', 0.00099, 2, 1, 3, 1.0),
-            ('CDR', '55681', 'Capacitor, Chip, Multiple Layer, Fixed, Ceramic Dielectric, Established Reliability', 0.0020, 2, 1, 3, 1.0),
-            ('CSR', '39003', 'Capacitor, Fixed, Electrolytic (Solid Electrolyte), Tantalum, Established Reliability', 0.00040, 1, 2, 4, 1.0),
-            ('CWR', '55365', 'Capacitor, Fixed, Electrolytic (Tantalum), Chip, Established Reliability', 0.00005, 1, 2, 4, 1.0),
-            ('CL', '3965', 'Capacitor, Fixed, Electrolytic (Nonsolid Electrolyte), Tantalum', 0.00040, 1, 2, 4, 1.0),
-            ('CLR', '39006', 'Capacitor, Fixed, Electrolytic (Nonsolid Electrolyte), Tantalum, Established Reliability', 0.00040, 1, 2, 4, 1.0),
-            ('CRL', '83500', 'Capacitor, Fixed, Electrolytic (Nonsolid Electrolyte), Tantalum Cathode', 0.00040, 1, 2, 4, 1.0),
-            ('CU, CUR', '39018', 'Capacitor, Fixed, Electrolytic (Aluminum Oxide), Established Reliability and Nonestablished Reliability', 0.00012, 2, 2, 1, 1.0),
-            ('CE', '62', 'Capacitor, Fixed Electrolytic (DC, Aluminum, Dry Electrolyte, Polarized)', 0.00012, 2, 2, 1, 1.0),
-            ('CV', '81', 'Capacitor, Variable, Ceramic Dielectric (Trimmer)', 0.0079, 1, 1, 5, 1.0),
-            ('PC', '14409', 'Capacitor, Variable (Piston Type, Tubular Trimmer)', 0.0060, 2, 1, 5, 1.0),
-            ('CT', '92', 'Capacitor, Variable, Air Dielectric (Trimmer)', 0.0000072, 2, 1, 5, 1.0),
-            ('CG', '23183', 'Capacitor, Fixed or Variable, Vacuum Dielectric', 0.0060, 1, 1, 5, 1.0)
-        ''')
-        
-        cursor.execute(''' 
-            INSERT OR REPLACE INTO temperature_factors
-            (temperature, column_1, column_2)
-            VALUES  (20, 0.91, 0.79),
-                    (30, 1.1, 1.3),
-                    (40, 1.3, 1.9),
-                    (50, 1.6, 2.9),
-                    (60, 1.8, 4.2),
-                    (70, 2.2, 6.0),
-                    (80, 2.5, 8.4),
-                    (90, 2.8, 11),
-                    (100, 3.2, 15),
-                    (110, 3.7, 21),
-                    (120, 4.1, 27),
-                    (130, 4.6, 35),
-                    (140, 5.1, 44),
-                    (150, 5.6, 56)
-        ''')
-
-        cursor.execute(''' 
-            INSERT OR REPLACE INTO capacitance_factors 
-            (capacitance, column_1, column_2)
-            VALUES  (0.000001, 0.29, 0.04),
-                    (0.00001, 0.35, 0.07),
-                    (0.0001, 0.44, 0.12),
-                    (0.001, 0.54, 0.20),
-                    (0.01, 0.66, 0.35),
-                    (0.05, 0.76, 0.50),
-                    (0.1, 0.81, 0.59),
-                    (0.5, 0.94, 0.85),
-                    (1.0, 1.0, 1.0),
-                    (3.0, 1.1, 1.3),
-                    (10.0, 1.2, 1.6),
-                    (30.0, 1.3, 1.9),
-                    (100.0, 1.4, 2.3),
-                    (300.0, 1.6, 3.4),
-                    (1000.0, 1.9, 4.9),
-                    (3000.0, 2.1, 6.3),
-                    (10000.0, 2.3, 8.3),
-                    (30000.0, 2.5, 11),
-                    (60000.0, 2.7, 13),
-                    (120000.0, 2.9, 15)           
-        ''')
-
-        cursor.execute(''' 
-            INSERT OR REPLACE INTO voltage_stress_factors 
-        (voltage_stress, column_1, column_2, column_3, column_4, column_5)
-        VALUES  (0.1, 1.0, 1.0, 1.0, 1.0, 1.0),
-                (0.2, 1.0, 1.0, 1.0, 1.0, 1.1),
-                (0.3, 1.0, 1.0, 1.1, 1.0, 1.2),
-                (0.4, 1.1, 1.0, 1.3, 1.0, 1.5),
-                (0.5, 1.4, 1.2, 1.6, 1.0, 2.0),
-                (0.6, 2.0, 2.0, 2.0, 2.0, 2.7),
-                (0.7, 3.2, 5.7, 2.6, 15, 3.7),
-                (0.8, 5.2, 19, 3.4, 130, 5.1),
-                (0.9, 8.6, 59, 4.4, 990, 6.8),
-                (1.0, 14, 166, 5.6, 5900, 9.0)
-        ''')
-
-        cursor.execute(''' 
-            INSERT OR REPLACE INTO quality_factors (quality_level, pi_q)
-        VALUES  ('D', 0.001),
-                ('C', 0.01),
-                ('S,B', 0.03),
-                ('R', 0.1),
-                ('P', 0.3),
-                ('M', 1.0),
-                ('L', 1.5),
-                ('Non-Established Reliability', 3.0),
-                ('Commercial or Unknown', 10.0)
-        ''')
-
-        cursor.execute(''' 
-            INSERT OR REPLACE INTO environment_factors (environment, pi_e)
-        VALUES  ('GB', 1.0),
-                ('GF', 10),
-                ('GM', 20),
-                ('NS', 7.0),
-                ('NU', 15),
-                ('AIC', 12),
-                ('AIF', 15),
-                ('AUC', 25),
-                ('AUF', 30),
-                ('ARW', 40),
-                ('SF', 0.50),
-                ('MF', 20),
-                ('ML', 50),
-                ('CL', 570)
-        ''')
-
-        cursor.execute(''' 
-            INSERT OR REPLACE INTO series_resistance_factors (resistance_range, pi_sr)
-        VALUES  ('>0.8', 0.66),
-                ('>0.6 to 0.8', 1.0),
-                ('>0.4 to 0.6', 1.3),
-                ('>0.2 to 0.4', 2.0),
-                ('>0.1 to 0.2', 2.7),
-                ('0 to 0.1', 3.3)
-        ''')
-
-        conn.commit()
-        conn.close()
-        print(f"Basic database created at: {db_path}")
-    except Exception as e:
-        print(f"Error creating database manually: {e}")
+            if factor_snapshot is None:
+                raise
+            # Restore the handbook tables from the snapshot compiled at build time
+            catalog.restore_database(database_path, factor_snapshot)
+            print(f"Database restored from the factor snapshot at: {database_path}")
 
 def get_db_connection():
     """Get database connection with proper path resolution"""
@@ -282,74 +119,27 @@ def get_db_connection():
     
     conn = sqlite3.connect(database_path)
     conn.row_factory = sqlite3.Row
+    migrations.ensure_migrated(conn, database_path)
     return conn
 
-def calculate_temperature_factor(temperature, column):
-    """Calculate temperature factor using MIL-HDBK-217F equation"""
-    if temperature < -55 or temperature > 150:
-        raise ValueError(f"Temperature {temperature}°C out of range (-55°C to 150°C)")
-    
-    if column == 1:
-        ea = Config.TEMP_FACTOR_EA_COLUMN1
-    else:
-        ea = Config.TEMP_FACTOR_EA_COLUMN2
-    
-    temp_kelvin = temperature + 273
-    if temp_kelvin <= 0:
-        raise ValueError(f"Temperature must be above -273°C")
-    
-    factor = math.exp(-ea / Config.BOLTZMANN_CONSTANT * 
-                     (1/temp_kelvin - 1/Config.REFERENCE_TEMP))
-    return round(factor, 6)
-
-def calculate_capacitance_factor(capacitance, column):
-    """Calculate capacitance factor using MIL-HDBK-217F equation"""
-    if capacitance <= 0:
-        return 1.0
-    
-    if column == 1:
-        exponent = Config.CAP_FACTOR_EXP_COLUMN1
-    else:
-        exponent = Config.CAP_FACTOR_EXP_COLUMN2
-    
-    # π_C = C^exponent
-    factor = capacitance ** exponent
-    return round(factor, 6)
+factor_catalogs = catalog.CatalogManager(
+    Config.get_database_path, get_db_connection, Config.CATALOG_CHECK_INTERVAL, Config.FACTOR_CACHE_SIZE,
+    snapshot=factor_snapshot if Config.FACTOR_SNAPSHOT_ENABLED else None,
+    code_aliases=Config.FACTOR_CODE_ALIASES)
+metrics.registry.register_cache('factor_lookup', factor_catalogs.cache_stats)
+
+def get_factor_catalog():
+    """Current factor dataset snapshot; take it once per request and calculate against it"""
+    return factor_catalogs.current()
+
+def get_search_connection():
+    """Get database connection with the search indexes in place"""
+    factor_catalog = get_factor_catalog()
+    conn = get_db_connection()
+    # The style index follows the factor dataset: a reload re-indexes the handbook styles
+    search.ensure_search_schema(conn, Config.get_database_path(), factor_catalog.digest)
+    return conn
 
-def get_exact_or_calculate_factor(value, data_points, value_column, factor_column, calculation_type, column_number=None):
-    """Get exact value from table or calculate using equation"""
-    
-    # First, check if exact value exists in table
-    for row in data_points:
-        if abs(row[value_column] - value) < 1e-10:
-            return row[factor_column]
-    
-    # If not found in table, use appropriate calculation
-    if calculation_type == 'temperature':
-        return calculate_temperature_factor(value, column_number)
-    elif calculation_type == 'capacitance':
-        return calculate_capacitance_factor(value, column_number)
-    elif calculation_type == 'voltage_stress':
-        if column_number == 1:
-            return (value / 0.6) ** 5 + 1 
-        elif column_number == 2:
-            return (value / 0.6) ** 10 + 1 
-        elif column_number == 3:
-            return (value / 0.6) ** 3 + 1 
-        elif column_number == 4:
-            return (value / 0.6) ** 17 + 1 
-        elif column_number == 5:
-            return (value / 0.5) ** 3 + 1 
-        else:
-            return 1.0
-    elif calculation_type == 'resistor_temperature':
-        return calculate_resistor_temperature_factor(value, column_number)
-    elif calculation_type == 'resistor_power':
-        return calculate_resistor_power_factor(value)
-    elif calculation_type == 'resistor_stress':
-        return calculate_resistor_stress_factor(value, column_number)
-    else:
-        return 1.0
 # Routes
 @app.route('/')
 def index():
@@ -361,576 +151,882 @@ def splash():
     """Splash screen for desktop application"""
     return render_template('splash.html')
 
-@app.route('/api/capacitor-styles')
-def get_capacitor_styles():
-    """Get all capacitor styles"""
+@app.route('/metrics')
+def get_metrics():
+    """Request, calculation and cache metrics in Prometheus text format"""
+    return Response(metrics.registry.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/health')
+def get_health():
+    """Readiness probe: 200 once warm-up has finished, 503 until then"""
+    status = health.readiness.status()
+    return jsonify(status), 200 if status['ready'] else 503
+
+@app.route('/api/health/live')
+def get_liveness():
+    """Liveness probe: the server is up and answering"""
+    return jsonify({'live': True})
+
+@app.route('/api/admin/startup')
+@admin_required
+def admin_startup():
+    """Startup phases and time-to-listening against the startup budget"""
+    return jsonify(startup.report.to_dict())
+
+@app.route('/api/admin/profile', methods=['GET', 'POST', 'DELETE'])
+@admin_required
+def admin_profile():
+    """Arm, inspect or disarm profiling of the next N heavy requests"""
     try:
-        conn = get_db_connection()
-        styles = conn.execute('''
-            SELECT style, spec_number, description, lambda_b, 
-                   pi_t_column, pi_c_column, pi_v_column, pi_sr
-            FROM capacitor_styles 
-            ORDER BY style
-        ''').fetchall()
-        conn.close()
-        
-        return jsonify([dict(row) for row in styles])
+        if request.method == 'GET':
+            return jsonify(profiling.controller.status())
+        if request.method == 'DELETE':
+            return jsonify(profiling.controller.disarm())
+        
+        data = request.get_json(silent=True) or {}
+        count = int(data.get('count', 1))
+        if count < 1 or count > Config.PROFILE_MAX_REQUESTS:
+            return jsonify({'error': f'count must be between 1 and {Config.PROFILE_MAX_REQUESTS}'}), 400
+        
+        return jsonify(profiling.controller.arm(count, data.get('routes')))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/quality-levels')
-def get_quality_levels():
-    """Get all quality levels"""
+@app.route('/api/admin/result-cache', methods=['GET', 'DELETE'])
+@admin_required
+def admin_result_cache():
+    """Size and hit counts of the /api/calculate result cache, or empty its memory tier"""
     try:
-        conn = get_db_connection()
-        qualities = conn.execute('''
-            SELECT quality_level, pi_q 
-            FROM quality_factors 
-            ORDER BY pi_q
-        ''').fetchall()
-        conn.close()
-        
-        return jsonify([dict(row) for row in qualities])
+        if request.method == 'DELETE':
+            calculation_cache.clear()
+        return jsonify(calculation_cache.info())
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/environments')
-def get_environments():
-    """Get all environment types"""
+@app.route('/api/admin/dataset', methods=['GET'])
+@admin_required
+def admin_dataset():
+    """Version of the factor dataset new calculations run against"""
     try:
-        conn = get_db_connection()
-        environments = conn.execute('''
-            SELECT environment, pi_e 
-            FROM environment_factors 
-            ORDER BY environment
-        ''').fetchall()
-        conn.close()
-        
-        return jsonify([dict(row) for row in environments])
+        info = get_factor_catalog().info()
+        info['reloads'] = factor_catalogs.reloads
+        return jsonify(info)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/resistor-styles')
-def get_resistor_styles():
-    """Get all resistor styles"""
+@app.route('/api/admin/dataset/reload', methods=['POST'])
+@admin_required
+def admin_reload_dataset():
+    """Reload the factor tables now; calculations already running keep their snapshot"""
     try:
-        conn = get_db_connection()
-        styles = conn.execute('''
-            SELECT style, spec_number, description, lambda_b, 
-                   pi_t_column, pi_s_column
-            FROM resistor_styles 
-            ORDER BY style
-        ''').fetchall()
-        conn.close()
-        
-        return jsonify([dict(row) for row in styles])
+        previous = factor_catalogs.current().version
+        info = factor_catalogs.reload().info()
+        info['previous_version'] = previous
+        info['reloads'] = factor_catalogs.reloads
+        return jsonify(info)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/resistor-quality-levels')
-def get_resistor_quality_levels():
-    """Get resistor quality levels"""
+# Reference-data listings used to fill the UI's dropdowns, by endpoint name:
+# (factor catalog table, columns, sort column); the first column is the table's key
+REFERENCE_LISTS = {
+    'capacitor-styles': ('capacitor_styles', ('style', 'spec_number', 'description', 'lambda_b',
+                                              'pi_t_column', 'pi_c_column', 'pi_v_column', 'pi_sr'), 'style'),
+    'quality-levels': ('quality_factors', ('quality_level', 'pi_q'), 'pi_q'),
+    'environments': ('environment_factors', ('environment', 'pi_e'), 'environment'),
+    'resistor-styles': ('resistor_styles', ('style', 'spec_number', 'description', 'lambda_b',
+                                            'pi_t_column', 'pi_s_column'), 'style'),
+    'resistor-quality-levels': ('resistor_quality_factors', ('quality_level', 'pi_q'), 'pi_q'),
+    'resistor-environments': ('resistor_environment_factors', ('environment', 'pi_e'), 'environment'),
+    'inductor-styles': ('inductor_styles', ('inductor_type', 'lambda_b'), 'inductor_type'),
+    'inductor-quality-levels': ('inductor_quality_factors', ('quality_level', 'pi_q'), 'pi_q'),
+    'inductor-environments': ('inductor_environment_factors', ('environment', 'pi_e'), 'environment'),
+}
+
+# Rendered reference-data payloads: name -> (dataset digest, JSON)
+_reference_payloads = {}
+
+def reference_rows(factor_catalog, name):
+    """Rows of a reference-data listing, read from the factor catalog"""
+    table, columns, order_column = REFERENCE_LISTS[name]
+    # Code aliases share their composite key's row; list each row once, in table order for ties
+    rows = [row for key, row in getattr(factor_catalog, table).items() if key == row[columns[0]]]
+    rows.sort(key=lambda row: (row[order_column], row['id']))
+    return [{column: row[column] for column in columns} for row in rows]
+
+def render_reference_data(name):
+    """JSON for a reference-data listing, rendered once per factor dataset"""
+    factor_catalog = get_factor_catalog()
+    cached = _reference_payloads.get(name)
+    if cached is None or cached[0] != factor_catalog.digest:
+        rows = reference_rows(factor_catalog, name)
+        cached = _reference_payloads[name] = (factor_catalog.digest, app.json.response(rows).get_data())
+    return cached[1]
+
+def reference_response(name):
     try:
-        conn = get_db_connection()
-        qualities = conn.execute('''
-            SELECT quality_level, pi_q 
-            FROM resistor_quality_factors 
-            ORDER BY pi_q
-        ''').fetchall()
-        conn.close()
-        
-        return jsonify([dict(row) for row in qualities])
+        return Response(render_reference_data(name), mimetype='application/json')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/capacitor-styles')
+def get_capacitor_styles():
+    """Get all capacitor styles"""
+    return reference_response('capacitor-styles')
+
+@app.route('/api/quality-levels')
+def get_quality_levels():
+    """Get all quality levels"""
+    return reference_response('quality-levels')
+
+@app.route('/api/environments')
+def get_environments():
+    """Get all environment types"""
+    return reference_response('environments')
+
+@app.route('/api/resistor-styles')
+def get_resistor_styles():
+    """Get all resistor styles"""
+    return reference_response('resistor-styles')
+
+@app.route('/api/resistor-quality-levels')
+def get_resistor_quality_levels():
+    """Get resistor quality levels"""
+    return reference_response('resistor-quality-levels')
+
 @app.route('/api/resistor-environments')
 def get_resistor_environments():
     """Get resistor environment types"""
-    try:
-        conn = get_db_connection()
-        environments = conn.execute('''
-            SELECT environment, pi_e 
-            FROM resistor_environment_factors 
-            ORDER BY environment
-        ''').fetchall()
-        conn.close()
-        
-        return jsonify([dict(row) for row in environments])
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    return reference_response('resistor-environments')
 
 @app.route('/api/inductor-styles')
 def get_inductor_styles():
     """Get all inductor styles"""
-    try:
-        conn = get_db_connection()
-        styles = conn.execute('''
-            SELECT inductor_type, lambda_b
-            FROM inductor_styles
-            ORDER BY inductor_type
-        ''').fetchall()
-        conn.close()
-        
-        return jsonify([dict(row) for row in styles])
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    return reference_response('inductor-styles')
 
 @app.route('/api/inductor-quality-levels')
 def get_inductor_quality_levels():
     """Get inductor quality levels"""
-    try:
-        conn = get_db_connection()
-        qualities = conn.execute('''
-            SELECT quality_level, pi_q 
-            FROM inductor_quality_factors 
-            ORDER BY pi_q
-        ''').fetchall()
-        conn.close()
-        
-        return jsonify([dict(row) for row in qualities])
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    return reference_response('inductor-quality-levels')
 
 @app.route('/api/inductor-environments')
 def get_inductor_environments():
     """Get inductor environment types"""
+    return reference_response('inductor-environments')
+
+def evaluate_components(factor_catalog, components, derating_columns=None, factor_overrides=None):
+    """Engine batch evaluation, counted in the calculation metrics"""
+    type_counts = {}
+    results, total_lambda_p, unique_evaluations = engine.evaluate_components(
+        factor_catalog, components, derating_columns, factor_overrides, type_counts)
+    
+    for component_type, count in type_counts.items():
+        metrics.COMPONENTS_CALCULATED.inc(count, labels=(component_type,))
+    metrics.UNIQUE_EVALUATIONS.inc(unique_evaluations)
+    
+    return results, total_lambda_p, unique_evaluations
+
+@app.route('/api/search')
+def search_library():
+    """Prefix search over handbook styles and the part library"""
     try:
-        conn = get_db_connection()
-        environments = conn.execute('''
-            SELECT environment, pi_e 
-            FROM inductor_environment_factors 
-            ORDER BY environment
-        ''').fetchall()
-        conn.close()
+        query = request.args.get('q', '').strip()
+        scope = request.args.get('scope', 'all')
+        component_type = request.args.get('component_type') or None
+        limit = min(max(request.args.get('limit', 20, type=int), 1), Config.SEARCH_MAX_RESULTS)
         
-        return jsonify([dict(row) for row in environments])
+        if scope not in ('all', 'styles', 'parts'):
+            return jsonify({'error': 'Invalid scope. Use all, styles or parts'}), 400
+        
+        styles, parts, truncated = [], [], False
+        conn = get_search_connection()
+        try:
+            if scope != 'parts':
+                styles = search.search_styles(conn, query, component_type, limit)
+            if scope != 'styles':
+                parts, truncated = search.search_parts(
+                    conn, query, component_type, limit, Config.SEARCH_RANK_CANDIDATES)
+        finally:
+            conn.close()
+        
+        return jsonify({'query': query, 'styles': styles, 'parts': parts, 'truncated': truncated})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/calculate', methods=['POST'])
-def calculate_reliability():
-    """Calculate reliability for components"""
+@app.route('/api/library', methods=['POST'])
+def add_library_parts():
+    """Add the parts of a project to the part library"""
     try:
         data = request.get_json()
-        components = data.get('components', [])
+        project_data = data.get('project') or {}
+        components = data.get('components') or project_data.get('components', [])
         
         if not components:
             return jsonify({'error': 'No components provided'}), 400
         
-        results = []
-        total_lambda_p = 0.0
-        
-        conn = get_db_connection()
-        
-        for component in components:
-            # Determine component type
-            component_type = component.get('component_type', 'capacitor')
-            
-            if component_type == 'resistor':
-                result = calculate_resistor_reliability(conn, component)
-            elif component_type == 'inductor':
-                result = calculate_inductor_reliability(conn, component)
-            else:
-                result = calculate_component_reliability(conn, component)
-            
-            results.append(result)
-            total_lambda_p += result['lambda_p']
+        conn = get_search_connection()
+        try:
+            stored = search.upsert_library_parts(conn, components, project_data.get('name'))
+        finally:
+            conn.close()
         
-        conn.close()
+        return jsonify({'stored': stored})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/validate', methods=['POST'])
+def validate_inputs():
+    """Check a component batch against the input schema, reporting every violation"""
+    try:
+        data = request.get_json()
+        components = data.get('components', [])
+        if not isinstance(components, list):
+            return jsonify({'error': 'components must be a list'}), 400
         
+        factor_catalog = get_factor_catalog()
+        violations = engine.validate_components(factor_catalog, components)
+        error_count = sum(1 for violation in violations if violation['severity'] == 'error')
         return jsonify({
-            'components': results,
-            'total_lambda_p': round(total_lambda_p, 10),
-            'calculation_timestamp': datetime.now().isoformat(),
-            'component_count': len(results)
+            'valid': error_count == 0,
+            'component_count': len(components),
+            'error_count': error_count,
+            'warning_count': len(violations) - error_count,
+            'violations': violations,
+            'dataset_version': factor_catalog.version
         })
-        
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-def calculate_resistor_temperature_factor(temperature, column):
-    """Calculate resistor temperature factor using MIL-HDBK-217F equation"""
-    if temperature < -55 or temperature > 150:
-        raise ValueError(f"Temperature {temperature}°C out of range (-55°C to 150°C)")
-    
-    if column == 1:
-        ea = 0.2
-    else:
-        ea = 0.08
-    
-    temp_kelvin = temperature + 273
-    if temp_kelvin <= 0:
-        raise ValueError(f"Temperature must be above -273°C")
+def run_calculation(data, components, factor_catalog):
+    """Validate and calculate a /api/calculate request into its cacheable response"""
+    # Optional server-side contributor summary; summary_only implies the default top 10
+    top_n = min(int(data.get('top_n') or (10 if data.get('summary_only') else 0)), Config.TOP_N_MAX)
     
-    factor = math.exp(-ea / Config.BOLTZMANN_CONSTANT * 
-                     (1/temp_kelvin - 1/Config.REFERENCE_TEMP))
-    return round(factor, 6)
-
-def calculate_resistor_power_factor(power_dissipation):
-    """Calculate resistor power factor using equation"""
-    if power_dissipation <= 0:
-        return 0.068
+    factor_overrides = get_factor_overrides(data.get('factor_overrides'))
     
-    # π_P = (Power Dissipation)^0.39
-    factor = power_dissipation ** 0.39
-    return round(factor, 7)
-
-def calculate_resistor_stress_factor(power_stress, column):
-    """Calculate resistor power stress factor"""
-    if power_stress <= 0:
-        return 0.66 if column == 2 else 0.79
+    derating_columns = None
+    if data.get('derating'):
+        derating_columns = derating.DeratingColumns(
+            derating.merge_rules(Config.DERATING_RULES, data.get('derating_rules')))
     
-    if column == 1:
-        # Column 1: π_S = .71e^1.1(S)
-        factor = 0.71 * math.exp(1.1 * power_stress)
-    else:
-        # Column 2: π_S = .54e^2.04(S)
-        factor = 0.54 * math.exp(2.04 * power_stress)
+    # Report every bad input at once instead of failing on the first one
+    with timing.phase('validate'):
+        violations = engine.validate_components(factor_catalog, components)
+    errors = [violation for violation in violations if violation['severity'] == 'error']
+    if errors:
+        raise engine.ValidationError(engine.describe_violations(errors), violations)
     
-    return round(factor, 6)
-
-def calculate_inductor_temperature_factor(temperature):
-    """Calculate inductor temperature factor using MIL-HDBK-217F equation"""
-    if temperature < -55 or temperature > 190:
-        raise ValueError(f"Temperature {temperature}°C out of range (-55°C to 190°C)")
+    with timing.phase('calc'):
+        results, total_lambda_p, unique_evaluations = evaluate_components(
+            factor_catalog, components, derating_columns, factor_overrides)
     
-    ea = 0.11
-    temp_kelvin = temperature + 273
+    response = {
+        'components': results,
+        'total_lambda_p': round(total_lambda_p, 10),
+        'component_count': len(results),
+        'unique_evaluations': unique_evaluations,
+        'dataset_version': factor_catalog.version,
+        'factor_overrides_digest': get_overrides_digest(factor_overrides)
+    }
+    if violations:
+        response['warnings'] = violations
     
-    if temp_kelvin <= 0:
-        raise ValueError(f"Temperature must be above -273°C")
+    with timing.phase('analyze'):
+        if derating_columns is not None:
+            response['derating'] = derating_columns.analyze(
+                float(data.get('warning_margin', Config.DERATING_WARNING_MARGIN)))
+        if top_n:
+            response['summary'] = analysis.summarize(
+                components, results, total_lambda_p, top_n, Config.PARETO_PCT)
     
-    factor = math.exp(-ea / Config.BOLTZMANN_CONSTANT * 
-                     (1/temp_kelvin - 1/Config.REFERENCE_TEMP))
-    return round(factor, 6)
+    return response
 
-def calculate_inductor_reliability(conn, component):
-    """Calculate reliability for a single inductor component"""
+@app.route('/api/calculate', methods=['POST'])
+def calculate_reliability():
+    """Calculate reliability for components"""
     try:
-        # Get component parameters
-        project_name = component.get('project_name')
-        inductor_type = component.get('inductor_type')
-        temperature = float(component.get('temperature', Config.DEFAULT_TEMPERATURE))
-        quality_level = component.get('quality_level', 'MIL-SPEC')
-        environment = component.get('environment', Config.DEFAULT_ENVIRONMENT)
-        
-        # Enhanced component parameters
-        component_name = component.get('name', 'Inductor_Component')
-        description = component.get('description', '')
-        manufacturer = component.get('manufacturer', '')
-        part_number = component.get('part_number', '')
-        
-        # Get inductor style data
-        style_data = conn.execute('''
-            SELECT * FROM inductor_styles WHERE inductor_type = ?
-        ''', (inductor_type,)).fetchone()
-        
-        if not style_data:
-            raise ValueError(f"Inductor type '{inductor_type}' not found")
-        
-        lambda_b = style_data['lambda_b']
-
-        # Calculate π_T (Temperature Factor)
-        pi_t = calculate_inductor_temperature_factor(temperature)
-        
-        # Get π_Q (Quality Factor)
-        quality_data = conn.execute('''
-            SELECT pi_q FROM inductor_quality_factors WHERE quality_level = ?
-        ''', (quality_level,)).fetchone()
-        
-        if quality_data:
-            pi_q = quality_data['pi_q']
-        else:
-            pi_q = 1.0
-        
-        # Get π_E (Environment Factor)
-        env_data = conn.execute('''
-            SELECT pi_e FROM inductor_environment_factors WHERE environment = ?
-        ''', (environment,)).fetchone()
+        with timing.phase('parse'):
+            data = request.get_json()
+        components = data.get('components', [])
         
-        if env_data:
-            pi_e = env_data['pi_e']
+        if not components:
+            return jsonify({'error': 'No components provided'}), 400
+        window_args = get_window_args(data['window']) if data.get('window') is not None else None
+        
+        with timing.phase('db'):
+            factor_catalog = get_factor_catalog()
+        
+        # Identical requests share one calculation; the paging window doesn't change it
+        if Config.RESULT_CACHE_ENABLED:
+            with timing.phase('cache'):
+                key = calculation_cache.key(
+                    request.get_data(), {name: value for name, value in data.items() if name != 'window'},
+                    factor_catalog.digest)
+            cached, source = calculation_cache.get_or_calculate(
+                key, lambda: run_calculation(data, components, factor_catalog))
         else:
-            pi_e = 1.0
-        
-        # Calculate λ_P: λ_P = λ_b × π_T × π_Q × π_E
-        lambda_p = lambda_b * pi_t * pi_q * pi_e
-        
+            key = None
+            cached, source = run_calculation(data, components, factor_catalog), 'calculated'
+        metrics.RESULT_CACHE_LOOKUPS.inc(labels=(source,))
+        response = dict(cached)
+        response['calculation_timestamp'] = datetime.now().isoformat()
+        
+        # Kept server-side so the results table can page through it; identical
+        # requests share the rows and sort orders, each under its own result_id
+        with timing.phase('store'):
+            result_id, result_set = result_store.put(
+                response['components'], response['total_lambda_p'], response['dataset_version'], key)
+            response['result_id'] = result_id
+            if window_args is not None:
+                response['window'] = result_set.window(result_id, **window_args)
+        
+        if data.get('summary_only'):
+            del response['components']
+        
+        with timing.phase('serialize'):
+            response = jsonify(response)
+        response.headers['X-Result-Cache'] = source
+        return response
+        
+    except engine.ValidationError as e:
+        return jsonify({'error': str(e), 'violations': e.violations}), 400
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def get_window_args(args):
+    """Window arguments from query parameters or a JSON object"""
+    if not isinstance(args, dict):
+        raise ValueError('window must be an object')
+    order = args.get('order', 'asc')
+    if order not in ('asc', 'desc'):
+        raise ValueError("order must be 'asc' or 'desc'")
+    for name in ('sort', 'style', 'component_type'):
+        if not isinstance(args.get(name, ''), (str, type(None))):
+            raise ValueError(f"window {name} must be a string")
+    min_lambda, max_lambda = args.get('min_lambda'), args.get('max_lambda')
+    try:
         return {
-            'project_name': project_name,
-            'name': component_name,
-            'component_type': 'inductor',
-            'style': inductor_type,
-            'lambda_b': round(lambda_b, 8),
-            'pi_t': round(pi_t, 6),
-            'pi_q': round(pi_q, 6),
-            'pi_e': round(pi_e, 6),
-            'lambda_p': round(lambda_p, 12),
-            'parameters': {
-                'description': description,
-                'manufacturer': manufacturer,
-                'part_number': part_number,
-                'temperature': temperature,
-                'quality_level': quality_level,
-                'environment': environment
-            }
+            'offset': max(int(args.get('offset', 0)), 0),
+            'limit': min(max(int(args.get('limit', 100)), 1), Config.RESULT_WINDOW_MAX),
+            'sort': args.get('sort') or 'index',
+            'descending': order == 'desc',
+            'style': args.get('style') or None,
+            'component_type': args.get('component_type') or None,
+            'min_lambda': float(min_lambda) if min_lambda not in (None, '') else None,
+            'max_lambda': float(max_lambda) if max_lambda not in (None, '') else None
         }
-        
+    except (TypeError, ValueError):
+        raise ValueError('window offset and limit must be integers, min_lambda and max_lambda numbers')
+
+def get_result_set(result_id):
+    result_set = result_store.get(result_id)
+    if result_set is None:
+        raise LookupError(f"Result set '{result_id}' not found or expired")
+    return result_set
+
+@app.route('/api/results/<result_id>', methods=['GET'])
+def get_results_window(result_id):
+    """Sorted, filtered window of a stored result set"""
+    try:
+        result_set = get_result_set(result_id)
+        return jsonify(result_set.window(result_id, **get_window_args(request.args)))
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
-        raise Exception(f"Error calculating inductor {component.get('name', 'Unknown')}: {str(e)}")
+        return jsonify({'error': str(e)}), 500
 
-def calculate_resistor_reliability(conn, component):
-    """Calculate reliability for a single resistor component"""
+@app.route('/api/results/<result_id>', methods=['DELETE'])
+def delete_results(result_id):
+    """Drop a stored result set"""
     try:
-        # Get component parameters
-        project_name = component.get('project_name')
-        style = component.get('style')
-        temperature = float(component.get('temperature', Config.DEFAULT_TEMPERATURE))
-        watts = float(component.get('watts', 0.125))  # Power dissipation in Watts
-        power_stress = float(component.get('power_stress', 0.5))  # S value
-        quality_level = component.get('quality_level', Config.DEFAULT_QUALITY)
-        environment = component.get('environment', Config.DEFAULT_ENVIRONMENT)
-        
-        # Enhanced component parameters
-        component_name = component.get('name', f'{style}_Component')
-        description = component.get('description', '')
-        manufacturer = component.get('manufacturer', '')
-        part_number = component.get('part_number', '')
-        
-        # Get resistor style data
-        style_data = conn.execute('''
-            SELECT * FROM resistor_styles WHERE style = ?
-        ''', (style,)).fetchone()
-        
-        if not style_data:
-            raise ValueError(f"Resistor style '{style}' not found")
-        
-        lambda_b = style_data['lambda_b']
-        pi_t_column = style_data['pi_t_column']
-        pi_s_column = style_data['pi_s_column']
-        
-        # Calculate π_T (Temperature Factor)
-        temp_data = conn.execute('''
-            SELECT temperature, column_1, column_2 
-            FROM resistor_temperature_factors 
-            ORDER BY temperature
-        ''').fetchall()
+        if not result_store.delete(result_id):
+            return jsonify({'error': f"Result set '{result_id}' not found or expired"}), 404
+        return jsonify({'deleted': result_id})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        if pi_t_column == 1:
-            pi_t = get_exact_or_calculate_factor(temperature, temp_data, 'temperature', 'column_1', 'resistor_temperature', pi_t_column)
-        else:
-            pi_t = get_exact_or_calculate_factor(temperature, temp_data, 'temperature', 'column_2', 'resistor_temperature', pi_t_column)
-        
-        # Calculate π_P (Power Factor) using Watts
-        power_data = conn.execute('''
-            SELECT power_dissipation, pi_p 
-            FROM resistor_power_factors 
-            ORDER BY power_dissipation
-        ''').fetchall()
+@app.route('/api/derating', methods=['POST'])
+def analyze_derating():
+    """Check applied stresses against derating limits, worst margin first"""
+    try:
+        data = request.get_json()
+        components = data.get('components', [])
+        if not components:
+            return jsonify({'error': 'No components provided'}), 400
         
-        pi_p = get_exact_or_calculate_factor(watts, power_data, 'power_dissipation', 'pi_p', 'resistor_power', None)
+        derating_columns = derating.DeratingColumns(
+            derating.merge_rules(Config.DERATING_RULES, data.get('rules')))
+        for component in components:
+            component_type = get_component_type(component)
+            derating_columns.add(component_type, component, get_component_name(component, component_type))
         
-        # Calculate π_S (Power Stress Factor) using S
-        stress_data = conn.execute('''
-            SELECT power_stress, column_1, column_2
-            FROM resistor_stress_factors 
-            ORDER BY power_stress
-        ''').fetchall()
+        return jsonify(derating_columns.analyze(
+            float(data.get('warning_margin', Config.DERATING_WARNING_MARGIN)), data.get('limit')))
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        column_name = f'column_{pi_s_column}'
-        pi_s = get_exact_or_calculate_factor(power_stress, stress_data, 'power_stress', column_name, 'resistor_stress', pi_s_column)
-        
-        # Get π_Q (Quality Factor)
-        quality_data = conn.execute('''
-            SELECT pi_q FROM resistor_quality_factors WHERE quality_level = ?
-        ''', (quality_level,)).fetchone()
-        
-        if quality_data:
-            pi_q = quality_data['pi_q']
-        else:
-            pi_q = 3.0
+def get_overrides_digest(factor_overrides):
+    """Digest of a project's factor overrides, None without any"""
+    return factor_overrides.digest() if factor_overrides else None
+
+def get_resolved_overrides(factor_overrides, component):
+    """Hashable overrides that apply to one component, () when none do"""
+    if not factor_overrides:
+        return ()
+    return engine.overrides.FactorOverrides.key(factor_overrides.resolve(component, get_component_type(component)))
+
+def get_saved_lambdas(factor_catalog, components, saved, factor_overrides=None):
+    """
+    λ_P of saved results, or None when they can't be trusted for these components
+
+    Saved results are only reused when they were calculated against the
+    current dataset with the project's current factor overrides and each one
+    still belongs to the row at its position: same id (when recorded), name,
+    family, style and part number.
+    """
+    results = (saved or {}).get('components') or []
+    if not components or len(results) != len(components):
+        return None
+    if saved.get('dataset_version', results[0].get('dataset_version')) != factor_catalog.version:
+        return None
+    if saved.get('factor_overrides_digest') != get_overrides_digest(factor_overrides):
+        return None
+    for component, result in zip(components, results):
+        component_type = get_component_type(component)
+        if (result.get('dataset_version', factor_catalog.version) != factor_catalog.version
+                or ('id' in result and result['id'] != component.get('id'))
+                or result.get('name') != get_component_name(component, component_type)
+                or result.get('component_type', 'capacitor') != component_type
+                or result.get('style') != component.get(STYLE_FIELDS[component_type])
+                or (result.get('parameters') or {}).get('part_number', '') != component.get('part_number', '')):
+            return None
+    return [result['lambda_p'] for result in results]
+
+@app.route('/api/diff', methods=['POST'])
+def diff_projects():
+    """λ_P differences between a base and a revised project"""
+    try:
+        data = request.get_json()
+        base_project = data.get('base') or {}
+        revision_project = data.get('revision') or {}
+        base = base_project.get('components', [])
+        revision = revision_project.get('components', [])
+        
+        # Each revision is calculated with its own project's overrides
+        base_overrides = get_factor_overrides(base_project.get('factor_overrides'))
+        revision_overrides = get_factor_overrides(revision_project.get('factor_overrides'))
+        
+        pairs, added, removed = diff.match_components(base, revision)
+        
+        factor_catalog = get_factor_catalog()
+        
+        # Saved results of the base are reused when they line up with its components
+        base_lambdas = get_saved_lambdas(factor_catalog, base, base_project.get('results'), base_overrides)
+        base_recalculated = base_lambdas is None
+        if base_recalculated:
+            base_results = evaluate_components(factor_catalog, base, factor_overrides=base_overrides)[0]
+            base_lambdas = [result['lambda_p'] for result in base_results]
+        
+        # Only added components and pairs whose λ-relevant fields or overrides differ are recalculated
+        revision_lambdas = [None] * len(revision)
+        changes = []
+        for i, j, matched_by in pairs:
+            fields = diff.changed_fields(base[i], revision[j])
+            if get_resolved_overrides(base_overrides, base[i]) != get_resolved_overrides(revision_overrides, revision[j]):
+                fields.append('factor_overrides')
+            if not fields:
+                revision_lambdas[j] = base_lambdas[i]
+                continue
+            base_key = get_calculation_key(base[i], get_component_type(base[i]))
+            if ('factor_overrides' not in fields and base_key is not None
+                    and base_key == get_calculation_key(revision[j], get_component_type(revision[j]))):
+                revision_lambdas[j] = base_lambdas[i]
+            changes.append((i, j, matched_by, fields))
+        
+        pending = [j for j, lambda_p in enumerate(revision_lambdas) if lambda_p is None]
+        recomputed, _, _ = evaluate_components(
+            factor_catalog, [revision[j] for j in pending], factor_overrides=revision_overrides)
+        for j, result in zip(pending, recomputed):
+            revision_lambdas[j] = result['lambda_p']
+        
+        def describe(component, index, lambda_p):
+            return {
+                'index': index,
+                'id': component.get('id'),
+                'name': get_component_name(component, get_component_type(component)),
+                'part_number': component.get('part_number', ''),
+                'lambda_p': lambda_p
+            }
         
-        # Get π_E (Environment Factor)
-        env_data = conn.execute('''
-            SELECT pi_e FROM resistor_environment_factors WHERE environment = ?
-        ''', (environment,)).fetchone()
+        changed = []
+        for i, j, matched_by, fields in changes:
+            entry = describe(revision[j], j, revision_lambdas[j])
+            entry.update({
+                'base_index': i,
+                'matched_by': matched_by,
+                'fields': fields,
+                'base_lambda_p': base_lambdas[i],
+                'delta_lambda_p': round(revision_lambdas[j] - base_lambdas[i], 10)
+            })
+            changed.append(entry)
+        
+        base_total = math.fsum(base_lambdas)
+        revision_total = math.fsum(revision_lambdas)
+        matched_by_counts = {'id': 0, 'part_number': 0, 'content': 0}
+        for _, _, matched_by in pairs:
+            matched_by_counts[matched_by] += 1
         
-        if env_data:
-            pi_e = env_data['pi_e']
-        else:
-            pi_e = 1.0
+        return jsonify({
+            'added': [describe(revision[j], j, revision_lambdas[j]) for j in added],
+            'removed': [describe(base[i], i, base_lambdas[i]) for i in removed],
+            'changed': changed,
+            'unchanged_count': len(pairs) - len(changed),
+            'matched_by': matched_by_counts,
+            'recomputed': len(pending),
+            'base_recalculated': base_recalculated,
+            'dataset_version': factor_catalog.version,
+            'base_total_lambda_p': round(base_total, 10),
+            'revision_total_lambda_p': round(revision_total, 10),
+            'delta_total_lambda_p': round(revision_total - base_total, 10)
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def get_component_id(component, index):
+    """Stable id of a component within an assembly tree"""
+    component_id = component.get('id')
+    return str(component_id) if component_id not in (None, '') else f'component_{index}'
+
+def get_assembly_tree(tree_id):
+    tree = assembly_store.get(tree_id)
+    if tree is None:
+        raise LookupError(f"Assembly tree '{tree_id}' not found")
+    return tree
+
+@app.route('/api/parts-count', methods=['POST'])
+def calculate_parts_count():
+    """Parts-count estimate by family, style, quality and environment"""
+    try:
+        data = request.get_json()
+        components = data.get('components', [])
+        if not components:
+            return jsonify({'error': 'No components provided'}), 400
         
-        # Calculate λ_P: λ_P = λ_b × π_T × π_P × π_S × π_Q × π_E
-        lambda_p = lambda_b * pi_t * pi_p * pi_s * pi_q * pi_e
+        groups = parts_count.aggregate_parts(components, DEFAULT_QUALITY_LEVELS, Config.DEFAULT_ENVIRONMENT)
+        factor_overrides = get_factor_overrides(data.get('factor_overrides'))
+        
+        factor_catalog = get_factor_catalog()
+        
+        # The handbook's generic failure rate tables are not in the database, so
+        # λ_g is the stress model at its default stresses without π_Q. π_Q only
+        # depends on family and quality (and a style override), so both are
+        # looked up once. Groups have no part numbers or ids, so only style
+        # overrides reach the estimate; the full model applies every layer.
+        generic_rates = {}
+        quality_factors = {}
+        
+        def generic_rate(component_type, style, quality, environment):
+            lambda_g = generic_rates.get((component_type, style, environment))
+            pi_q = quality_factors.get((component_type, style, quality))
+            if lambda_g is None or pi_q is None:
+                reference = get_reference_component(component_type, style, quality, environment)
+                row_overrides = factor_overrides.resolve(reference, component_type) if factor_overrides else None
+                result = calculate_single_component(factor_catalog, reference, component_type, row_overrides)
+                pi_q = quality_factors[(component_type, style, quality)] = result['pi_q']
+                if lambda_g is None:
+                    lambda_g = round(result['lambda_p'] / pi_q, 10) if pi_q else 0.0
+                    generic_rates[(component_type, style, environment)] = lambda_g
+            return lambda_g, pi_q
+        
+        lines, total_lambda_p = parts_count.estimate(groups, generic_rate)
+        
+        response = {
+            'mode': 'parts_count',
+            'groups': lines,
+            'total_lambda_p': round(total_lambda_p, 10),
+            'component_count': sum(groups.values()),
+            'line_count': len(components),
+            'dataset_version': factor_catalog.version
+        }
         
-        return {
-            'project_name': project_name,
-            'name': component_name,
-            'component_type': 'resistor',
-            'style': style,
-            'lambda_b': round(lambda_b, 8),
-            'pi_t': round(pi_t, 6),
-            'pi_p': round(pi_p, 7),
-            'pi_s': round(pi_s, 6),
-            'pi_q': round(pi_q, 6),
-            'pi_e': round(pi_e, 6),
-            'lambda_p': round(lambda_p, 10),
-            'parameters': {
-                'description': description,
-                'manufacturer': manufacturer,
-                'part_number': part_number,
-                'temperature': temperature,
-                'watts': watts,
-                'power_stress': power_stress,
-                'quality_level': quality_level,
-                'environment': environment
+        if data.get('compare'):
+            # Full stress model for the same lines, summed into the same groups
+            results, _, unique_evaluations = evaluate_components(
+                factor_catalog, components, factor_overrides=factor_overrides)
+            full_totals = dict.fromkeys(groups, 0.0)
+            for component, result in zip(components, results):
+                key = parts_count.group_key(component, DEFAULT_QUALITY_LEVELS, Config.DEFAULT_ENVIRONMENT)
+                full_totals[key] += result['lambda_p'] * parts_count.line_quantity(component)
+            for line, full_total in zip(lines, full_totals.values()):
+                line['full_model_lambda_p'] = round(full_total, 10)
+            response['full_model'] = {
+                'total_lambda_p': round(math.fsum(full_totals.values()), 10),
+                'unique_evaluations': unique_evaluations
             }
-        }
         
+        return jsonify(response)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
-        raise Exception(f"Error calculating resistor {component.get('name', 'Unknown')}: {str(e)}")
+        return jsonify({'error': str(e)}), 500
 
-def calculate_component_reliability(conn, component):
-    """Calculate reliability for a single component with enhanced parameters"""
+@app.route('/api/rbd', methods=['POST'])
+def evaluate_block_diagram():
+    """System reliability and MTBF of a series/parallel/k-of-n block diagram"""
     try:
-        # Get component parameters
-        project_name = component.get('project_name')
-        style = component.get('style')
-        temperature = float(component.get('temperature', Config.DEFAULT_TEMPERATURE))
-        capacitance = float(component.get('capacitance', 1.0))
-        voltage_stress = float(component.get('voltage_stress', 0.5))
-        quality_level = component.get('quality_level', Config.DEFAULT_QUALITY)
-        environment = component.get('environment', Config.DEFAULT_ENVIRONMENT)
-        series_resistance = float(component.get('series_resistance', 1))
-        
-        # Enhanced component parameters
-        component_name = component.get('name', f'{style}_Component')
-        if not component_name or component_name == f'{style}_Component':
-            component_type = 'Capacitor'
-            component_name = f'{component_type}_{component.get("id", "Unknown")}'
-        description = component.get('description', '')
-        manufacturer = component.get('manufacturer', '')
-        part_number = component.get('part_number', '')
-        
-        # Get capacitor style data
-        style_data = conn.execute('''
-            SELECT * FROM capacitor_styles WHERE style = ?
-        ''', (style,)).fetchone()
-        
-        if not style_data:
-            raise ValueError(f"Capacitor style '{style}' not found")
-        
-        lambda_b = style_data['lambda_b']
-        pi_t_column = style_data['pi_t_column']
-        pi_c_column = style_data['pi_c_column']
-        pi_v_column = style_data['pi_v_column']
-        default_pi_sr = style_data['pi_sr']
-        
-        # Calculate π_T (Temperature Factor)
-        temp_data = conn.execute('''
-            SELECT temperature, column_1, column_2 
-            FROM temperature_factors 
-            ORDER BY temperature
-        ''').fetchall()
-
-        if pi_t_column == 1:
-            pi_t = get_exact_or_calculate_factor(temperature, temp_data, 'temperature', 'column_1', 'temperature', pi_t_column)
+        data = request.get_json()
+        diagram = data.get('diagram')
+        if not diagram:
+            return jsonify({'error': 'No block diagram provided'}), 400
+        
+        # Component blocks are calculated together so repeated parts are evaluated once
+        leaves = rbd.component_leaves(diagram)
+        factor_overrides = get_factor_overrides(data.get('factor_overrides'))
+        factor_catalog = get_factor_catalog()
+        if leaves:
+            results, _, _ = evaluate_components(
+                factor_catalog, [leaf['component'] for leaf in leaves], factor_overrides=factor_overrides)
+            for leaf, result in zip(leaves, results):
+                leaf['lambda_p'] = result['lambda_p']
+        
+        times = data.get('times')
+        if times is None:
+            mission_time = float(data.get('mission_time', Config.RBD_DEFAULT_MISSION_TIME))
+            points = min(max(int(data.get('points', Config.RBD_DEFAULT_POINTS)), 2), Config.RBD_MAX_POINTS)
+            times = [mission_time * i / (points - 1) for i in range(points)]
         else:
-            pi_t = get_exact_or_calculate_factor(temperature, temp_data, 'temperature', 'column_2', 'temperature', pi_t_column)
+            times = [float(t) for t in times[:Config.RBD_MAX_POINTS]]
         
-        # Calculate π_C (Capacitance Factor)
-        cap_data = conn.execute('''
-            SELECT capacitance, column_1, column_2 
-            FROM capacitance_factors 
-            ORDER BY capacitance
-        ''').fetchall()
+        block_diagram = rbd.BlockDiagram(diagram)
+        return jsonify({
+            'times': times,
+            'reliability': block_diagram.reliability(times),
+            'mtbf_hours': block_diagram.mtbf(),
+            'system_lambda_p': block_diagram.system_lambda_p,
+            'block_count': block_diagram.block_count,
+            'unique_blocks': block_diagram.unique_blocks,
+            'dataset_version': factor_catalog.version
+        })
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        if pi_c_column == 1:
-            pi_c = get_exact_or_calculate_factor(capacitance, cap_data, 'capacitance', 'column_1', 'capacitance', pi_c_column)
-        else:
-            pi_c = get_exact_or_calculate_factor(capacitance, cap_data, 'capacitance', 'column_2', 'capacitance', pi_c_column)
+def calculate_live_components(components, factor_overrides=None):
+    """Recalculate a burst of live edits; errors are reported per component"""
+    results, errors = [], {}
+    factor_catalog = get_factor_catalog()
+    for position, component in enumerate(components):
+        try:
+            component_type = get_component_type(component)
+            row_overrides = factor_overrides.resolve(component, component_type) if factor_overrides else None
+            # Live events are queued and serialized outside the request, so keep plain dicts
+            results.append(calculate_single_component(factor_catalog, component, component_type, row_overrides).to_dict())
+        except Exception as e:
+            results.append(None)
+            errors[position] = str(e)
+    return results, errors
+
+def get_live_session(session_id):
+    session = live_sessions.get(session_id)
+    if session is None:
+        raise LookupError(f"Live session '{session_id}' not found")
+    return session
+
+@app.route('/api/live', methods=['POST'])
+def create_live_session():
+    """Calculate a project once and open a live session for incremental edits"""
+    try:
+        data = request.get_json()
+        components = data.get('components', [])
+        if not components:
+            return jsonify({'error': 'No components provided'}), 400
         
-        # Calculate π_V (Voltage Stress Factor)
-        voltage_data = conn.execute('''
-            SELECT voltage_stress, column_1, column_2, column_3, column_4, column_5
-            FROM voltage_stress_factors 
-            ORDER BY voltage_stress
-        ''').fetchall()
-
-        column_name = f'column_{pi_v_column}'
-        pi_v = get_exact_or_calculate_factor(voltage_stress, voltage_data, 'voltage_stress', column_name, 'voltage_stress', pi_v_column)
+        factor_overrides = get_factor_overrides(data.get('factor_overrides'))
+        factor_catalog = get_factor_catalog()
+        results, total_lambda_p, _ = evaluate_components(factor_catalog, components, factor_overrides=factor_overrides)
         
-        # Get π_Q (Quality Factor)
-        quality_data = conn.execute('''
-            SELECT pi_q FROM quality_factors WHERE quality_level = ?
-        ''', (quality_level,)).fetchone()
+        by_id = {}
+        for index, (component, result) in enumerate(zip(components, results)):
+            result['id'] = get_component_id(component, index)
+            by_id[result['id']] = (component, result)
         
-        if quality_data:
-            pi_q = quality_data['pi_q']
-        else:
-            pi_q = 3.0  # Default for non-established reliability
+        session = live_sessions.create(
+            {component_id: component for component_id, (component, _) in by_id.items()},
+            {component_id: result for component_id, (_, result) in by_id.items()},
+            lambda updated: calculate_live_components(updated, factor_overrides))
         
-        # Get π_E (Environment Factor)
-        env_data = conn.execute('''
-            SELECT pi_e FROM environment_factors WHERE environment = ?
-        ''', (environment,)).fetchone()
+        return jsonify({
+            'session_id': session.id,
+            'components': results,
+            'total_lambda_p': round(total_lambda_p, 10),
+            'dataset_version': factor_catalog.version
+        })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/live/<session_id>/patches', methods=['POST'])
+def patch_live_session(session_id):
+    """Queue parameter patches; results arrive on the event stream"""
+    try:
+        data = request.get_json()
+        patches = data.get('patches') or [data]
+        if any(not isinstance(patch, dict) or patch.get('id') in (None, '') for patch in patches):
+            return jsonify({'error': 'Each patch needs a component id'}), 400
+        
+        pending = get_live_session(session_id).patch(patches)
+        return jsonify({'pending': pending}), 202
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/live/<session_id>/events')
+def live_session_events(session_id):
+    """Server-sent events with the recalculated components after each burst of edits"""
+    try:
+        session = get_live_session(session_id)
+        # Reconnecting EventSources resume after the last update they received
+        last_sequence = int(request.headers.get('Last-Event-ID') or request.args.get('last_event_id') or 0)
+        return Response(
+            session.stream(last_sequence, Config.LIVE_KEEPALIVE),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/live/<session_id>', methods=['DELETE'])
+def close_live_session(session_id):
+    try:
+        get_live_session(session_id).close()
+        return jsonify({'closed': session_id})
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/assemblies', methods=['POST'])
+def create_assembly_tree():
+    """Calculate a project and roll its λ_P up an assembly hierarchy"""
+    try:
+        data = request.get_json()
+        project_data = data.get('project') or data
+        components = project_data.get('components', [])
+        factor_overrides = get_factor_overrides(project_data.get('factor_overrides'))
+        
+        factor_catalog = get_factor_catalog()
+        results, _, unique_evaluations = evaluate_components(
+            factor_catalog, components, factor_overrides=factor_overrides)
+        
+        placements = []
+        for index, (component, result) in enumerate(zip(components, results)):
+            result['id'] = get_component_id(component, index)
+            placements.append((result['id'], result['lambda_p'], component.get('assembly_id')))
+        
+        # The tree is validated and filled before it is stored, so a bad project leaves nothing behind
+        tree = assembly_store.create(project_data.get('assemblies', []), placements)
+        with tree.lock:
+            tree.factor_overrides = factor_overrides
+            for result in results:
+                result['assembly_id'] = tree.component_nodes[result['id']].id
+            response = tree.to_dict()
+        
+        response['components'] = results
+        response['unique_evaluations'] = unique_evaluations
+        response['dataset_version'] = factor_catalog.version
+        return jsonify(response)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/assemblies/<tree_id>')
+def get_assembly(tree_id):
+    """Current subtotals of an assembly tree"""
+    try:
+        tree = get_assembly_tree(tree_id)
+        with tree.lock:
+            return jsonify(tree.to_dict())
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/assemblies/<tree_id>/nodes', methods=['POST'])
+def add_assembly_node(tree_id):
+    """Add a module or board to an assembly tree"""
+    try:
+        data = request.get_json()
+        tree = get_assembly_tree(tree_id)
+        if not data.get('id'):
+            return jsonify({'error': 'Assembly id is required'}), 400
+        
+        with tree.lock:
+            node = tree.add_node(str(data['id']), data.get('name', data['id']),
+                                 data.get('kind', 'assembly'), data.get('parent_id'))
+            return jsonify(node.to_dict())
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/assemblies/<tree_id>/components/<component_id>', methods=['PUT', 'DELETE'])
+def update_assembly_component(tree_id, component_id):
+    """Add, change or remove one component; only its ancestors are re-summed"""
+    try:
+        tree = get_assembly_tree(tree_id)
+        result = None
         
-        if env_data:
-            pi_e = env_data['pi_e']
+        if request.method == 'PUT':
+            data = request.get_json()
+            component = data.get('component') or data
+            component_type = get_component_type(component)
+            
+            # Calculated with the overrides of the project the tree was built from
+            row_overrides = tree.factor_overrides.resolve(
+                dict(component, id=component_id), component_type) if tree.factor_overrides else None
+            result = calculate_single_component(get_factor_catalog(), component, component_type, row_overrides)
+            result['id'] = component_id
+            
+            with tree.lock:
+                changed = tree.set_component(component_id, result['lambda_p'], component.get('assembly_id'))
+                result['assembly_id'] = tree.component_nodes[component_id].id
+                updated = [{'id': node.id, 'subtotal_lambda_p': node.subtotal} for node in changed]
+                total = tree.total
         else:
-            pi_e = 1.0  # Default ground benign
-        
-        # Calculate π_SR (Series Resistance Factor) for tantalum capacitors
-        pi_sr = default_pi_sr
-        
-        # Check if this is a tantalum capacitor that needs series resistance calculation
-        tantalum_styles = ['CSR', 'CWR', 'CL', 'CLR', 'CRL']
-        if any(ts in style.upper() for ts in tantalum_styles):
-            # Determine resistance range based on series_resistance value
-            if series_resistance > 0.8:
-                pi_sr = 0.66
-            elif series_resistance > 0.6:
-                pi_sr = 1.0
-            elif series_resistance > 0.4:
-                pi_sr = 1.3
-            elif series_resistance > 0.2:
-                pi_sr = 2.0
-            elif series_resistance > 0.1:
-                pi_sr = 2.7
-            else:
-                pi_sr = 3.3
-        
-        # Calculate λ_P (Predicted Failure Rate)
-        # λ_P = λ_b × π_T × π_C × π_V × π_Q × π_E × π_SR
-        lambda_p = lambda_b * pi_t * pi_c * pi_v * pi_q * pi_e * pi_sr
-        
-        return {
-            'project_name':project_name,
-            'name': component_name,
-            'style': style,
-            'lambda_b': round(lambda_b, 8),
-            'pi_t': round(pi_t, 6),
-            'pi_c': round(pi_c, 6),
-            'pi_v': round(pi_v, 6),
-            'pi_q': round(pi_q, 6),
-            'pi_e': round(pi_e, 6),
-            'pi_sr': round(pi_sr, 6),
-            'lambda_p': round(lambda_p, 10),
-            'parameters': {
-                'description': description,
-                'manufacturer': manufacturer,
-                'part_number': part_number,
-                'temperature': temperature,
-                'capacitance': capacitance,
-                'voltage_stress': voltage_stress,
-                'quality_level': quality_level,
-                'environment': environment,
-                'series_resistance': series_resistance
-            }
-        }
+            with tree.lock:
+                if component_id not in tree.component_nodes:
+                    return jsonify({'error': f"Component '{component_id}' not found"}), 404
+                changed = tree.remove_component(component_id)
+                updated = [{'id': node.id, 'subtotal_lambda_p': node.subtotal} for node in changed]
+                total = tree.total
         
+        return jsonify({
+            'component': result,
+            'updated_assemblies': updated,
+            'total_lambda_p': total
+        })
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
-        raise Exception(f"Error calculating component {component.get('name', 'Unknown')}: {str(e)}")
+        return jsonify({'error': str(e)}), 500
 
 @app.route('/api/export/<format>')
 def export_data(format):
@@ -956,6 +1052,11 @@ def export_data(format):
 
 def create_excel_export(project_data):
     """Create single-sheet Excel export with all information"""
+    # openpyxl is only loaded by the Excel endpoints, keeping it off the startup path
+    import openpyxl
+    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+    from openpyxl.utils import get_column_letter
+    
     wb = openpyxl.Workbook()
     ws = wb.active
     ws.title = "Reliability Report"
@@ -1281,6 +1382,7 @@ def parse_excel_import(file_stream):
             print(f"Error reading cell at row {row}, col {col_key}: {e}")
             return default
         
+    import openpyxl
     wb = openpyxl.load_workbook(file_stream)
     ws = wb.active  # Ambil sheet pertama/aktif
     
@@ -1369,9 +1471,6 @@ def parse_excel_import(file_stream):
             elif col_indices.get('series_resistance') is None and ('series' in header_str and 'r' in header_str):
                 col_indices['series_resistance'] = col
 
-        # Debug: Print found indices
-        print("Found column indices:", col_indices)
-        
         # Read component data rows
         data_start = header_row + 1
         
@@ -1499,18 +1598,22 @@ def internal_error(error):
 def export_excel():
     """Export project to Excel format"""
     try:
-        data = request.get_json()
+        with timing.phase('parse'):
+            data = request.get_json()
         project_data = data.get('project')
         
         if not project_data:
             return jsonify({'error': 'No project data provided'}), 400
         
-        wb = create_excel_export(project_data)
+        with timing.phase('build'):
+            wb = create_excel_export(project_data)
         
         # Save to BytesIO
-        excel_file = io.BytesIO()
-        wb.save(excel_file)
-        excel_file.seek(0)
+        with timing.phase('serialize'):
+            excel_file = io.BytesIO()
+            wb.save(excel_file)
+            excel_file.seek(0)
+        metrics.EXPORT_BYTES.inc(excel_file.getbuffer().nbytes)
         
         # Generate filename with WIB timezone
         wib_tz = timezone(timedelta(hours=7))
@@ -1535,7 +1638,10 @@ def export_excel():
 def import_excel():
     """Import project from Excel format"""
     try:
-        if 'file' not in request.files:
+        # Multipart parsing happens on first access to request.files
+        with timing.phase('parse'):
+            has_file = 'file' in request.files
+        if not has_file:
             return jsonify({'error': 'No file uploaded'}), 400
         
         file = request.files['file']
@@ -1546,7 +1652,10 @@ def import_excel():
         if not file.filename.endswith(('.xlsx', '.xls')):
             return jsonify({'error': 'Invalid file format. Please upload an Excel file'}), 400
         
-        project_data = parse_excel_import(file)
+        metrics.IMPORT_BYTES.inc(request.content_length or 0)
+        
+        with timing.phase('load'):
+            project_data = parse_excel_import(file)
         
         # Add metadata with WIB timezone
         wib_tz = timezone(timedelta(hours=7))
@@ -1557,24 +1666,86 @@ def import_excel():
         project_data['modifiedAt'] = now_wib.isoformat()
         project_data['selectedComponentType'] = 'capacitor'
         
-        return jsonify(project_data)
+        # Imported projects feed the part library used by /api/search
+        try:
+            conn = get_search_connection()
+            try:
+                search.upsert_library_parts(conn, project_data['components'], project_data.get('name'))
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"Part library update skipped: {str(e)}")
+        
+        with timing.phase('serialize'):
+            response = jsonify(project_data)
+        return response
         
     except Exception as e:
         print(f"Excel Import Error: {str(e)}")
         return jsonify({'error': f'Excel import failed: {str(e)}'}), 500
 
+def warm_up_database():
+    """Migrate the database, then follow it for dataset changes"""
+    get_db_connection().close()
+    factor_catalogs.follow_database()
+
+def warm_up_search_index():
+    """Build the search schema and index the handbook styles"""
+    get_search_connection().close()
+
+def warm_up_factor_caches():
+    """Calculate every style at its reference stresses to fill the memoized factors"""
+    factor_catalog = get_factor_catalog()
+    for component_type, style_table in (('capacitor', factor_catalog.capacitor_styles),
+                                        ('resistor', factor_catalog.resistor_styles),
+                                        ('inductor', factor_catalog.inductor_styles)):
+        for style in set(row[parts_count.STYLE_FIELDS[component_type]] for row in style_table.values()):
+            component = get_reference_component(
+                component_type, style, DEFAULT_QUALITY_LEVELS[component_type], Config.DEFAULT_ENVIRONMENT)
+            calculate_single_component(factor_catalog, component, component_type)
+
+def warm_up_reference_data():
+    for name in REFERENCE_LISTS:
+        render_reference_data(name)
+
+# The database comes last: a packaged build serves the compiled snapshot until then
+WARMUP_TASKS = (
+    ('factor_caches', warm_up_factor_caches),
+    ('reference_data', warm_up_reference_data),
+    ('database', warm_up_database),
+)
+# Calculation works without search (a SQLite build without FTS5), so the index doesn't gate readiness
+OPTIONAL_WARMUP_TASKS = (
+    ('search_index', warm_up_search_index),
+)
+
 if __name__ == '__main__':
-    # Initialize database
-    init_database()
+    # Initialize database; a packaged build starts from the compiled snapshot and leaves it to the warm-up
+    if factor_catalogs.snapshot is None:
+        init_database()
+        startup.report.mark('database')
+    health.readiness.warm_up(WARMUP_TASKS, OPTIONAL_WARMUP_TASKS)
     
     print(f"Starting Enhanced {Config.APP_NAME} v{Config.VERSION}")
-    print(f"Database: {Config.get_database_path()}")
+    if factor_catalogs.snapshot is None:
+        print(f"Database: {Config.get_database_path()}")
+    else:
+        print(f"Factor dataset: compiled snapshot {get_factor_catalog().version}")
     print(f"Server: http://{Config.HOST}:{Config.PORT}")
     print(f"Features: Project-based workflow, Enhanced component parameters")
     
-    app.run(
-        host=Config.HOST,
-        port=Config.PORT,
-        debug=Config.DEBUG,
-        threaded=True
-    )
\ No newline at end of file
+    if Config.DEBUG:
+        app.run(
+            host=Config.HOST,
+            port=Config.PORT,
+            debug=Config.DEBUG,
+            threaded=True
+        )
+    else:
+        # Bind first so time-to-listening is measured when the socket accepts connections
+        server = make_server(Config.HOST, Config.PORT, app, threaded=True)
+        startup.report.listening()
+        print(f"Listening after {startup.report.listening_ms:.0f} ms (budget {Config.STARTUP_BUDGET_MS:.0f} ms)")
+        if Config.STARTUP_REPORT_PATH:
+            startup.report.write(Config.STARTUP_REPORT_PATH)
+        server.serve_forever()
\ No newline at end of file
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Hierarchical assemblies (system -> module -> board) with cached λ subtotals
+Updating a component only touches the subtotals of its ancestors.
+"""
+
+import math
+import threading
+import uuid
+from collections import OrderedDict
+
+class ExactSum:
+    """
+    Running sum kept as non-overlapping partials (Shewchuk's algorithm)
+
+    Adding and removing values is exact, so a subtotal can be updated in place
+    by adding the new value and subtracting the old one; value() rounds the
+    partials once with math.fsum.
+    """
+
+    __slots__ = ('partials',)
+
+    def __init__(self):
+        self.partials = []
+
+    def add(self, x):
+        partials = self.partials
+        i = 0
+        for y in partials:
+            if abs(x) < abs(y):
+                x, y = y, x
+            hi = x + y
+            lo = y - (hi - x)
+            if lo:
+                partials[i] = lo
+                i += 1
+            x = hi
+        partials[i:] = [x]
+
+    def value(self):
+        return math.fsum(self.partials)
+
+class AssemblyNode:
+    """One level of the hierarchy: its own components plus child assemblies"""
+
+    __slots__ = ('id', 'name', 'kind', 'parent', 'children', 'components', 'sum', 'subtotal')
+
+    def __init__(self, node_id, name, kind, parent=None):
+        self.id = node_id
+        self.name = name
+        self.kind = kind
+        self.parent = parent
+        self.children = []
+        self.components = {}  # component id -> λ_P
+        self.sum = ExactSum()
+        self.subtotal = 0.0
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'kind': self.kind,
+            'parent_id': self.parent.id if self.parent else None,
+            'children': [child.id for child in self.children],
+            'component_count': len(self.components),
+            'subtotal_lambda_p': self.subtotal
+        }
+
+class AssemblyTree:
+    """Assembly hierarchy with incrementally maintained λ_P subtotals"""
+
+    def __init__(self, tree_id, root_id='system', root_name='System'):
+        self.id = tree_id
+        self.root = AssemblyNode(root_id, root_name, 'system')
+        self.nodes = {root_id: self.root}
+        self.component_nodes = {}  # component id -> AssemblyNode
+        self.factor_overrides = None  # the project's FactorOverrides, for component updates
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_project(cls, tree_id, assemblies, components=()):
+        """
+        Build the node hierarchy from a project's `assemblies` list
+
+        `components` are (component id, λ_P, assembly id) placements; every
+        parent and assembly id is checked, so an invalid project raises
+        ValueError before a tree exists anywhere.
+        """
+        tree = cls(tree_id)
+        pending = list(assemblies or [])
+        missing_ids = [index + 1 for index, assembly in enumerate(pending) if not assembly.get('id')]
+        if missing_ids:
+            raise ValueError(f"Assemblies without an id: {', '.join(map(str, missing_ids))}")
+        while pending:
+            remaining = []
+            for assembly in pending:
+                parent_id = assembly.get('parent_id') or tree.root.id
+                if parent_id in tree.nodes:
+                    tree.add_node(assembly['id'], assembly.get('name', assembly['id']),
+                                  assembly.get('kind', 'assembly'), parent_id)
+                else:
+                    remaining.append(assembly)
+            if len(remaining) == len(pending):
+                missing = ', '.join(str(a.get('id')) for a in remaining)
+                raise ValueError(f"Assemblies with unknown or circular parents: {missing}")
+            pending = remaining
+
+        unknown = sorted({str(node_id) for _, _, node_id in components if node_id and node_id not in tree.nodes})
+        if unknown:
+            raise ValueError(f"Components assigned to unknown assemblies: {', '.join(unknown)}")
+        for component_id, lambda_p, node_id in components:
+            tree.set_component(component_id, lambda_p, node_id)
+        return tree
+
+    def add_node(self, node_id, name, kind, parent_id=None):
+        if node_id in self.nodes:
+            raise ValueError(f"Assembly '{node_id}' already exists")
+        parent = self.nodes.get(parent_id or self.root.id)
+        if parent is None:
+            raise ValueError(f"Parent assembly '{parent_id}' not found")
+        node = AssemblyNode(node_id, name, kind, parent)
+        parent.children.append(node)
+        self.nodes[node_id] = node
+        return node
+
+    def set_component(self, component_id, lambda_p, node_id=None):
+        """Add or update a component's λ_P; returns the nodes whose subtotal changed"""
+        node = self.nodes.get(node_id) if node_id else self.component_nodes.get(component_id, self.root)
+        if node is None:
+            raise ValueError(f"Assembly '{node_id}' not found")
+
+        changed = []
+        current = self.component_nodes.get(component_id)
+        if current is not None and current is not node:
+            changed.extend(self.remove_component(component_id))
+
+        old = node.components.get(component_id)
+        node.components[component_id] = lambda_p
+        self.component_nodes[component_id] = node
+        if old is not None:
+            node.sum.add(-old)
+        node.sum.add(lambda_p)
+        changed.extend(self._propagate(node))
+        return list(dict.fromkeys(changed))
+
+    def remove_component(self, component_id):
+        node = self.component_nodes.pop(component_id, None)
+        if node is None:
+            raise KeyError(component_id)
+        node.sum.add(-node.components.pop(component_id))
+        return self._propagate(node)
+
+    def _propagate(self, node):
+        """Refresh subtotals from `node` up to the root, one exact update per level"""
+        changed = []
+        while node is not None:
+            new_subtotal = node.sum.value()
+            parent = node.parent
+            if parent is not None and new_subtotal != node.subtotal:
+                parent.sum.add(-node.subtotal)
+                parent.sum.add(new_subtotal)
+            node.subtotal = new_subtotal
+            changed.append(node)
+            node = parent
+        return changed
+
+    @property
+    def total(self):
+        return self.root.subtotal
+
+    def to_dict(self):
+        return {
+            'tree_id': self.id,
+            'total_lambda_p': self.total,
+            'nodes': [node.to_dict() for node in self.nodes.values()]
+        }
+
+class AssemblyStore:
+    """Bounded in-memory store of assembly trees (least recently used evicted)"""
+
+    def __init__(self, max_trees):
+        self.max_trees = max_trees
+        self._trees = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, assemblies, components=()):
+        """Build and place a whole tree first; only a valid tree is stored"""
+        tree = AssemblyTree.from_project(uuid.uuid4().hex, assemblies, components)
+        with self._lock:
+            self._trees[tree.id] = tree
+            while len(self._trees) > self.max_trees:
+                self._trees.popitem(last=False)
+        return tree
+
+    def get(self, tree_id):
+        with self._lock:
+            tree = self._trees.get(tree_id)
+            if tree is not None:
+                self._trees.move_to_end(tree_id)
+            return tree
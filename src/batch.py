@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Headless batch calculator for BOM files
+Usage (from src/): python -m batch [options] BOM [BOM ...]
+Reads XLSX (the Excel export layout), CSV or JSON BOMs, calculates them with
+the same code as /api/calculate and writes results and totals as JSON or CSV.
+Files are processed in parallel worker processes.
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
+from config import Config
+import engine
+import app
+
+# Columns of the CSV result output
+RESULT_COLUMNS = ('file', 'index', 'name', 'component_type', 'style', 'part_number', 'lambda_p')
+
+def read_bom(path):
+    """Project dict with a components list from an XLSX, CSV or JSON file"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.xlsx', '.xlsm'):
+        with open(path, 'rb') as f:
+            return app.parse_excel_import(f)
+    if extension == '.csv':
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            # Empty cells fall back to the calculator defaults
+            components = [{field: value for field, value in row.items() if field and value not in (None, '')}
+                          for row in csv.DictReader(f)]
+        return {'components': components}
+    if extension == '.json':
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return {'components': data} if isinstance(data, list) else data
+    raise ValueError(f"Unsupported BOM format '{extension}' (use .xlsx, .csv or .json)")
+
+def calculate_file(path, include_components=True):
+    """Calculate one BOM file; failures are reported in the result instead of raised"""
+    # Keep stdout clean for the report; the app's progress messages go to stderr
+    with redirect_stdout(sys.stderr):
+        try:
+            project = read_bom(path)
+            components = project.get('components') or []
+            if not components:
+                raise ValueError('No components found')
+            # Saved projects keep temperature and environment as project-wide settings
+            global_parameters = project.get('globalParameters') or {}
+            components = [
+                {**{field: global_parameters[field] for field in ('temperature', 'environment')
+                    if field in global_parameters}, **component}
+                for component in components
+            ]
+            factor_catalog = app.get_factor_catalog()
+            # Every bad cell of the file is reported, not just the first
+            violations = engine.validate_components(factor_catalog, components)
+            errors = [violation for violation in violations if violation['severity'] == 'error']
+            if errors:
+                raise ValueError(engine.describe_violations(errors, limit=len(errors)))
+            results, total_lambda_p, unique_evaluations = app.evaluate_components(
+                factor_catalog, components, factor_overrides=app.get_factor_overrides(project.get('factor_overrides')))
+        except Exception as e:
+            return {'file': path, 'error': str(e)}
+
+    report = {
+        'file': path,
+        'component_count': len(results),
+        'unique_evaluations': unique_evaluations,
+        'total_lambda_p': round(total_lambda_p, 10),
+        'dataset_version': factor_catalog.version
+    }
+    if violations:
+        report['warnings'] = violations
+    if include_components:
+        report['components'] = [result.to_dict() for result in results]
+    return report
+
+def write_csv(reports, stream):
+    writer = csv.writer(stream, lineterminator='\n')
+    writer.writerow(RESULT_COLUMNS)
+    for report in reports:
+        if 'error' in report:
+            writer.writerow([report['file'], '', 'ERROR', '', '', '', report['error']])
+            continue
+        for index, result in enumerate(report.get('components', [])):
+            writer.writerow([
+                report['file'], index, result.get('name'), result.get('component_type', 'capacitor'),
+                result.get('style'), result.get('parameters', {}).get('part_number', ''), result['lambda_p']
+            ])
+        writer.writerow([report['file'], '', 'TOTAL', '', '', '', report['total_lambda_p']])
+
+def summarize(reports):
+    calculated = [report for report in reports if 'error' not in report]
+    return {
+        'file_count': len(reports),
+        'failed': sum(1 for report in reports if 'error' in report),
+        'total_lambda_p': round(math.fsum(report['total_lambda_p'] for report in calculated), 10),
+        'files': reports
+    }
+
+def _init_worker(database_path):
+    if database_path:
+        Config.DATABASE_PATH = database_path
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog='python -m batch', description='Calculate MIL-HDBK-217F λ_P for BOM files without the web server')
+    parser.add_argument('files', nargs='+', help='BOM files (.xlsx, .csv or .json)')
+    parser.add_argument('--format', choices=('json', 'csv'), default='json', help='result format (default json)')
+    parser.add_argument('--output-dir', help='write one result file per BOM here; stdout then gets the totals')
+    parser.add_argument('--summary-only', action='store_true', help='report totals without per-component results')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='parallel worker processes')
+    parser.add_argument('--database', help='handbook database to use instead of the configured one')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    _init_worker(args.database)
+    include_components = not args.summary_only or bool(args.output_dir)
+
+    # Open the database once up front so migrations never race between workers
+    with redirect_stdout(sys.stderr):
+        app.get_db_connection().close()
+
+    jobs = max(1, min(args.jobs, len(args.files)))
+    if jobs == 1:
+        reports = [calculate_file(path, include_components) for path in args.files]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(args.database,)) as pool:
+            reports = list(pool.map(calculate_file, args.files, [include_components] * len(args.files)))
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        for report in reports:
+            if 'error' in report:
+                continue
+            stem = os.path.splitext(os.path.basename(report['file']))[0]
+            output_path = os.path.join(args.output_dir, f'{stem}.results.{args.format}')
+            with open(output_path, 'w', newline='', encoding='utf-8') as f:
+                if args.format == 'csv':
+                    write_csv([report], f)
+                else:
+                    json.dump(report, f, indent=2)
+            report['output'] = output_path
+            del report['components']
+        json.dump(summarize(reports), sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    elif args.format == 'csv':
+        write_csv(reports, sys.stdout)
+    else:
+        json.dump(summarize(reports), sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+    for report in reports:
+        if 'error' in report:
+            print(f"{report['file']}: {report['error']}", file=sys.stderr)
+    return 1 if any('error' in report for report in reports) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
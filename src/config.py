@@ -6,6 +6,8 @@ Project-based application with enhanced features
 
 import os
 import sys
+import tempfile
+from engine import constants as handbook
 
 class Config:
     # Database configuration with proper path resolution
@@ -45,20 +47,117 @@ class Config:
         'splash_screen': True
     }
     
-    # Calculation settings
-    DEFAULT_TEMPERATURE = 25  # Celsius
-    DEFAULT_QUALITY = 'M'     # Military
-    DEFAULT_ENVIRONMENT = 'GB'  # Ground Benign
+    # Calculation settings (defined by the engine so notebooks calculate the same way)
+    DEFAULT_TEMPERATURE = handbook.DEFAULT_TEMPERATURE
+    DEFAULT_QUALITY = handbook.DEFAULT_QUALITY
+    DEFAULT_ENVIRONMENT = handbook.DEFAULT_ENVIRONMENT
     
     # Temperature factor equation constants
-    TEMP_FACTOR_EA_COLUMN1 = 0.15
-    TEMP_FACTOR_EA_COLUMN2 = 0.35
-    BOLTZMANN_CONSTANT = 8.617e-5  # eV/K
-    REFERENCE_TEMP = 298  # 25°C in Kelvin (25 + 273)
+    TEMP_FACTOR_EA_COLUMN1 = handbook.TEMP_FACTOR_EA_COLUMN1
+    TEMP_FACTOR_EA_COLUMN2 = handbook.TEMP_FACTOR_EA_COLUMN2
+    BOLTZMANN_CONSTANT = handbook.BOLTZMANN_CONSTANT
+    REFERENCE_TEMP = handbook.REFERENCE_TEMP
     
     # Capacitance factor equation exponents
-    CAP_FACTOR_EXP_COLUMN1 = 0.09
-    CAP_FACTOR_EXP_COLUMN2 = 0.23
+    CAP_FACTOR_EXP_COLUMN1 = handbook.CAP_FACTOR_EXP_COLUMN1
+    CAP_FACTOR_EXP_COLUMN2 = handbook.CAP_FACTOR_EXP_COLUMN2
+    
+    # Search settings
+    SEARCH_MAX_RESULTS = 100
+    SEARCH_RANK_CANDIDATES = 64  # matches collected before ranking a part query
+    
+    # Assembly trees kept in memory for incremental updates
+    ASSEMBLY_MAX_TREES = 32
+    
+    # Derating limits per family, with 'default' applying to every style of the
+    # family unless the style overrides it. Stress limits are ratios of the
+    # rated value, temperatures are maximum ambient °C, watts is dissipation.
+    DERATING_RULES = {
+        'capacitor': {
+            'default': {'voltage_stress': 0.6, 'temperature': 85},
+            'CSR': {'voltage_stress': 0.5},
+            'CWR': {'voltage_stress': 0.5},
+            'CL': {'voltage_stress': 0.5},
+            'CLR': {'voltage_stress': 0.5},
+            'CRL': {'voltage_stress': 0.5},
+            'CU, CUR': {'voltage_stress': 0.5, 'temperature': 70},
+            'CE': {'voltage_stress': 0.5, 'temperature': 70},
+        },
+        'resistor': {
+            'default': {'power_stress': 0.5, 'temperature': 100},
+            'RC': {'temperature': 70},
+            'RCR': {'temperature': 70},
+            'RTH': {'power_stress': 0.25},
+        },
+        'inductor': {
+            'default': {'temperature': 105},
+        },
+    }
+    DERATING_WARNING_MARGIN = 0.1  # flag parts within 10% of their derated limit
+    
+    # Contributor summaries returned by /api/calculate
+    TOP_N_MAX = 1000
+    PARETO_PCT = 80.0
+    
+    # Result sets kept for paging through /api/results/<id>
+    RESULT_STORE_MAX_SETS = 16
+    RESULT_STORE_MAX_ROWS = 1000000  # rows across all stored sets
+    RESULT_STORE_TTL = 1800.0  # seconds a set is kept after its last read
+    RESULT_WINDOW_MAX = 5000  # rows per window
+    
+    # Cache of /api/calculate responses keyed by request content and dataset version
+    RESULT_CACHE_ENABLED = True
+    RESULT_CACHE_MAX_ENTRIES = 32
+    RESULT_CACHE_MAX_ROWS = 1000000  # components across all cached responses
+    RESULT_CACHE_TTL = 3600.0  # seconds a response is kept after its last read
+    # SQLite file that keeps cached responses across restarts; unset keeps them in memory only
+    RESULT_CACHE_PATH = os.environ.get('RELIABILITY_RESULT_CACHE')
+    RESULT_CACHE_DISK_MAX_ENTRIES = 256
+    
+    # Live recalculation sessions (/api/live)
+    LIVE_DEBOUNCE = 0.15  # seconds without edits before a burst is recalculated
+    LIVE_MAX_DELAY = 1.0  # longest a burst of edits is held back
+    LIVE_EVENT_HISTORY = 100  # updates kept for reconnecting clients
+    LIVE_KEEPALIVE = 15.0
+    LIVE_IDLE_TIMEOUT = 600.0  # sessions without edits or listeners are closed
+    LIVE_MAX_SESSIONS = 16
+    
+    # Factor dataset snapshots (reloaded when the database file changes)
+    CATALOG_CHECK_INTERVAL = 1.0  # seconds between database mtime checks
+    FACTOR_CACHE_SIZE = 65536  # memoized π factors per dataset version
+    # Code tables whose single codes resolve to their composite keys: style codes
+    # ('CZR' for 'CZ, CZR') always, quality codes ('B' for 'S,B') only when enabled,
+    # since such a code fell back to the default π_Q before and now gets a different one
+    FACTOR_CODE_ALIASES = (('style_codes', 'quality_codes') if os.environ.get('RELIABILITY_CODE_ALIASES', '0') == '1'
+                           else ('style_codes',))
+    # Packaged builds start from the snapshot compiled by database/compile_snapshot.py
+    FACTOR_SNAPSHOT_ENABLED = (hasattr(sys, '_MEIPASS')
+                               or os.environ.get('RELIABILITY_FACTOR_SNAPSHOT', '0') == '1')
+    
+    # Reliability block diagram time grids
+    RBD_DEFAULT_MISSION_TIME = 87600  # hours (10 years)
+    RBD_DEFAULT_POINTS = 50
+    RBD_MAX_POINTS = 5000
+    
+    # Instrumentation settings (off by default, enable with environment variables)
+    SERVER_TIMING_ENABLED = os.environ.get('RELIABILITY_SERVER_TIMING', '0') == '1'
+    TIMING_LOG_ENABLED = os.environ.get('RELIABILITY_TIMING_LOG', '0') == '1'
+    
+    # Startup report (/api/admin/startup); the budget applies to time-to-listening
+    STARTUP_BUDGET_MS = float(os.environ.get('RELIABILITY_STARTUP_BUDGET_MS', '1500'))
+    STARTUP_PROFILE_IMPORTS = os.environ.get('RELIABILITY_STARTUP_PROFILE', '0') == '1'
+    STARTUP_REPORT_PATH = os.environ.get('RELIABILITY_STARTUP_REPORT')  # JSON written once listening
+    
+    # Admin endpoints only answer requests from the local machine
+    ADMIN_ALLOWED_ADDRESSES = ('127.0.0.1', '::1')
+    
+    # On-demand profiling (armed through /api/admin/profile)
+    PROFILE_ROUTES = ('/api/calculate', '/api/export/excel', '/api/import/excel')
+    PROFILE_OUTPUT_DIR = os.environ.get(
+        'RELIABILITY_PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'reliability-profiles'))
+    PROFILE_SAMPLE_INTERVAL = 0.001  # seconds between stack samples
+    PROFILE_MAX_REQUESTS = 100
+    PROFILE_HISTORY = 50
     
     @classmethod
     def get_database_path(cls):
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Compile the handbook factor tables into database/factor_snapshot.py
+Run by build.js before PyInstaller; the packaged app builds its factor
+catalog from the generated module instead of probing for and opening SQLite.
+"""
+
+import os
+import sqlite3
+import sys
+
+DATABASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(DATABASE_DIR))
+
+from engine import catalog
+from database import migrations
+
+def compile_snapshot(database_path, output_path):
+    conn = sqlite3.connect(database_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        # Ship the current schema, including the style and quality code tables
+        migrations.migrate(conn)
+        source = catalog.snapshot_source(conn)
+    finally:
+        conn.close()
+
+    temp_path = output_path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(source)
+    os.replace(temp_path, output_path)
+    print(f"Factor snapshot written to: {output_path}")
+
+if __name__ == '__main__':
+    compile_snapshot(
+        sys.argv[1] if len(sys.argv) > 1 else os.path.join(DATABASE_DIR, 'mil_hdbk_217.db'),
+        sys.argv[2] if len(sys.argv) > 2 else os.path.join(DATABASE_DIR, 'factor_snapshot.py')
+    )
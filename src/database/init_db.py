@@ -8,8 +8,8 @@ import sqlite3
 import os
 import math
 
-def create_database():
-    db_path = os.path.join(os.path.dirname(__file__), 'mil_hdbk_217.db')
+def create_database(db_path=None):
+    db_path = db_path or os.path.join(os.path.dirname(__file__), 'mil_hdbk_217.db')
     
     # Remove existing database
     if os.path.exists(db_path):
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+In-place schema migrations for mil_hdbk_217.db
+Each migration runs once, inside its own transaction, and is recorded in the
+schema_version table, so existing databases are upgraded on startup instead
+of being deleted and rebuilt.
+"""
+
+import threading
+from engine.catalog import STYLE_TABLES, QUALITY_TABLES, split_codes
+
+# Lookup keys that must be unique: (table, column)
+LOOKUP_KEYS = (
+    ('capacitor_styles', 'style'),
+    ('resistor_styles', 'style'),
+    ('inductor_styles', 'inductor_type'),
+    ('quality_factors', 'quality_level'),
+    ('resistor_quality_factors', 'quality_level'),
+    ('inductor_quality_factors', 'quality_level'),
+    ('environment_factors', 'environment'),
+    ('resistor_environment_factors', 'environment'),
+    ('inductor_environment_factors', 'environment'),
+    ('temperature_factors', 'temperature'),
+    ('capacitance_factors', 'capacitance'),
+    ('voltage_stress_factors', 'voltage_stress'),
+    ('resistor_temperature_factors', 'temperature'),
+    ('resistor_power_factors', 'power_dissipation'),
+    ('resistor_stress_factors', 'power_stress'),
+    ('series_resistance_factors', 'resistance_range'),
+)
+
+def _v1_baseline(conn):
+    """Tables created by init_db.py; nothing to change, recorded as the starting point"""
+
+def _v2_lookup_keys(conn):
+    """Unique indexes on every lookup key and one-row-per-code alias tables"""
+    for table, column in LOOKUP_KEYS:
+        conn.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column})')
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS style_codes (
+            family TEXT NOT NULL,
+            code TEXT NOT NULL,
+            style TEXT NOT NULL,
+            PRIMARY KEY (family, code)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS quality_codes (
+            family TEXT NOT NULL,
+            code TEXT NOT NULL,
+            quality_level TEXT NOT NULL,
+            PRIMARY KEY (family, code)
+        ) WITHOUT ROWID
+    ''')
+    refresh_codes(conn)
+
+def refresh_codes(conn):
+    """Rebuild style_codes and quality_codes from the handbook tables"""
+    for codes_table, tables in (('style_codes', STYLE_TABLES), ('quality_codes', QUALITY_TABLES)):
+        conn.execute(f'DELETE FROM {codes_table}')
+        for family, (table, column) in tables.items():
+            names = [row[0] for row in conn.execute(f'SELECT {column} FROM {table} ORDER BY id')]
+            # Every key is its own code first, so a real key always wins over an alias
+            rows = [(family, name, name) for name in names]
+            rows += [(family, code, name) for name in names for code in split_codes(name)]
+            conn.executemany(f'INSERT OR IGNORE INTO {codes_table} VALUES (?, ?, ?)', rows)
+
+MIGRATIONS = (
+    (1, 'baseline handbook tables', _v1_baseline),
+    (2, 'unique lookup indexes and style/quality code tables', _v2_lookup_keys),
+)
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def current_version(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP DEFAULT (datetime('now', '+7 hours'))
+        )
+    ''')
+    row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    return row[0] or 0
+
+def migrate(conn):
+    """Apply pending migrations in order; returns the versions applied"""
+    applied = []
+    version = current_version(conn)
+    conn.commit()
+    for target, description, upgrade in MIGRATIONS:
+        if target <= version:
+            continue
+        try:
+            conn.execute('BEGIN')
+            upgrade(conn)
+            conn.execute('INSERT INTO schema_version (version, description) VALUES (?, ?)', (target, description))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        print(f"Database migrated to schema version {target}: {description}")
+        applied.append(target)
+    return applied
+
+_migration_lock = threading.Lock()
+_migrated = set()
+
+def ensure_migrated(conn, database_path):
+    """Run the migrations once per database file and process"""
+    if database_path in _migrated:
+        return
+    with _migration_lock:
+        if database_path in _migrated:
+            return
+        try:
+            migrate(conn)
+        except Exception as e:
+            # A read-only or inconsistent database still serves the schema it has
+            print(f"Database migration failed, continuing on the current schema: {str(e)}")
+        _migrated.add(database_path)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Derating and overstress analysis
+Applied stresses are gathered column by column while a BOM is calculated and
+compared against per-family and per-style derating limits in one sweep.
+"""
+
+from engine import CALCULATION_FIELDS, STYLE_FIELDS
+from engine.catalog import split_codes
+
+# Fields checked against derating limits; each limit is a maximum
+DERATED_FIELDS = ('voltage_stress', 'power_stress', 'watts', 'temperature')
+
+# Stress a calculator assumes when a row leaves the field out, per family
+DEFAULT_STRESSES = {
+    component_type: {field: default for field, default, _ in fields if field in DERATED_FIELDS}
+    for component_type, fields in CALCULATION_FIELDS.items()
+}
+
+def merge_rules(base, overrides):
+    """Per-family and per-style rule overrides on top of the configured rules"""
+    rules = {family: {style: dict(limits) for style, limits in styles.items()} for family, styles in base.items()}
+    for family, styles in (overrides or {}).items():
+        family_rules = rules.setdefault(family, {})
+        for style, limits in styles.items():
+            family_rules.setdefault(style, {}).update(limits)
+    return rules
+
+class DeratingColumns:
+    """
+    Applied stress and limit columns, one per derated field
+
+    add() is called once per BOM row, inside the calculation loop, so the
+    analysis needs no pass of its own over the components. A stress the row
+    leaves out is checked at the value its calculator assumes.
+
+    A composite rule key such as 'CU, CUR' applies to each of its codes, the
+    way the style code tables split composite styles; a rule for the single
+    code itself takes precedence.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self._code_rules = {}  # family -> {code: limits of the composite keys listing it}
+        for family, styles in rules.items():
+            for style, limits in styles.items():
+                for code in split_codes(style):
+                    self._code_rules.setdefault(family, {}).setdefault(code, {}).update(limits)
+        self._resolved = {}  # (family, style) -> limits
+        self.rows = []  # (name, component_type, style, part_number) per row
+        self.columns = {field: ([], [], []) for field in DERATED_FIELDS}  # rows, values, limits
+        self.defaulted = set()  # (row, field) checked at the calculator's default
+
+    def limits_for(self, component_type, style):
+        key = (component_type, style)
+        limits = self._resolved.get(key)
+        if limits is None:
+            family_rules = self.rules.get(component_type, {})
+            limits = dict(family_rules.get('default', {}))
+            limits.update(self._code_rules.get(component_type, {}).get(style, {}))
+            limits.update(family_rules.get(style, {}))
+            for field, limit in limits.items():
+                if not isinstance(limit, (int, float)) or limit <= 0:
+                    raise ValueError(f"Derating limit for {component_type} {field} must be a positive number")
+            self._resolved[key] = limits
+        return limits
+
+    def add(self, component_type, component, name):
+        style = component.get(STYLE_FIELDS.get(component_type, 'style'))
+        row = len(self.rows)
+        self.rows.append((name, component_type, style, component.get('part_number', '')))
+        defaults = DEFAULT_STRESSES.get(component_type, {})
+        for field, limit in self.limits_for(component_type, style).items():
+            if field not in self.columns:
+                continue
+            value = component.get(field)
+            if value is None:
+                value = defaults.get(field)
+                if value is None:
+                    continue
+                self.defaulted.add((row, field))
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+            rows, values, limits = self.columns[field]
+            rows.append(row)
+            values.append(value)
+            limits.append(limit)
+
+    def analyze(self, warning_margin=0.1, limit=None):
+        """
+        Flag rows whose stress reaches the warning margin, worst margin first
+
+        Margin is 1 - value / limit: negative means overstressed, and below
+        `warning_margin` means close to the derated limit.
+        """
+        violations = {}
+        checked = 0
+        for field, (rows, values, limits) in self.columns.items():
+            checked += len(rows)
+            margins = [1.0 - value / lim for value, lim in zip(values, limits)]
+            for row, value, lim, margin in zip(rows, values, limits, margins):
+                if margin < warning_margin:
+                    violations.setdefault(row, []).append({
+                        'field': field,
+                        'value': value,
+                        'limit': lim,
+                        'margin': round(margin, 6),
+                        'defaulted': (row, field) in self.defaulted
+                    })
+
+        flagged = []
+        for row, row_violations in violations.items():
+            row_violations.sort(key=lambda violation: violation['margin'])
+            name, component_type, style, part_number = self.rows[row]
+            worst = row_violations[0]['margin']
+            flagged.append({
+                'index': row,
+                'name': name,
+                'component_type': component_type,
+                'style': style,
+                'part_number': part_number,
+                'status': 'overstress' if worst < 0 else 'warning',
+                'margin': worst,
+                'violations': row_violations
+            })
+        flagged.sort(key=lambda item: (item['margin'], item['index']))
+
+        return {
+            'component_count': len(self.rows),
+            'checks': checked,
+            'overstressed': sum(1 for item in flagged if item['status'] == 'overstress'),
+            'warnings': sum(1 for item in flagged if item['status'] == 'warning'),
+            'flagged': flagged[:limit] if limit else flagged
+        }
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Component matching between two revisions of a project
+Components are paired by id, then part number, then identical content, each
+stage a hash-map lookup over what the previous stages left unmatched.
+"""
+
+import json
+from collections import defaultdict, deque
+
+# Fields that identify the project or row rather than the part itself
+IGNORED_FIELDS = ('id', 'project_name')
+
+def content_key(component):
+    """Hashable key of everything about a component except its id"""
+    items = tuple(sorted((field, value) for field, value in component.items() if field not in IGNORED_FIELDS))
+    try:
+        hash(items)
+    except TypeError:
+        return json.dumps(items, sort_keys=True, default=str)
+    return items
+
+def changed_fields(base, revision):
+    if base == revision:
+        return []
+    fields = (set(base) | set(revision)).difference(IGNORED_FIELDS)
+    return sorted(field for field in fields if base.get(field) != revision.get(field))
+
+def _id_key(component):
+    component_id = component.get('id')
+    return None if component_id == '' else component_id
+
+def _part_key(component):
+    part_number = str(component.get('part_number') or '').strip()
+    if not part_number:
+        return None
+    return (component.get('component_type', 'capacitor'), part_number)
+
+def match_components(base, revision):
+    """
+    Pair revision components with base components
+
+    Returns (pairs, added, removed): pairs is a list of
+    (base index, revision index, matched by), added and removed are the
+    unpaired revision and base indexes. Duplicate keys pair up in order.
+    """
+    pairs = []
+    base_left = set(range(len(base)))
+    revision_left = list(range(len(revision)))
+
+    stages = (
+        ('id', _id_key),
+        ('part_number', _part_key),
+        ('content', content_key),
+    )
+    for matched_by, key_func in stages:
+        if not base_left or not revision_left:
+            break
+        index = defaultdict(deque)
+        for i in sorted(base_left):
+            key = key_func(base[i])
+            if key is not None:
+                index[key].append(i)
+
+        unmatched = []
+        for j in revision_left:
+            key = key_func(revision[j])
+            candidates = index.get(key) if key is not None else None
+            if candidates:
+                i = candidates.popleft()
+                base_left.discard(i)
+                pairs.append((i, j, matched_by))
+            else:
+                unmatched.append(j)
+        revision_left = unmatched
+
+    return pairs, revision_left, sorted(base_left)
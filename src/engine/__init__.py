@@ -0,0 +1,41 @@
+"""
+MIL-HDBK-217F part stress calculation engine
+Depends only on the standard library: no Flask, no application config, and
+handbook databases are opened read-only.
+
+    import engine
+    engine.use_database('path/to/mil_hdbk_217.db')  # default: src/database/
+    report = engine.calculate([{'style': 'CK', 'capacitance': 0.1}])
+    columns = engine.calculate_columns({'style': ['RC', 'RN'], 'component_type': ['resistor'] * 2})
+    violations = engine.validate_components(engine.load_catalog(), components)
+
+The web app and the batch CLI calculate through the same functions.
+"""
+
+from .factors import (
+    calculate_temperature_factor, calculate_capacitance_factor, get_exact_or_calculate_factor,
+    calculate_resistor_temperature_factor, calculate_resistor_power_factor, calculate_resistor_stress_factor,
+    calculate_inductor_temperature_factor)
+from .models import (
+    CalculationError, CALCULATION_FIELDS, STYLE_FIELDS, DEFAULT_QUALITY_LEVELS, get_component_type, get_component_name,
+    get_calculation_key, get_reference_component, calculate_component_reliability,
+    calculate_resistor_reliability, calculate_inductor_reliability, calculate_single_component)
+from .evaluate import (
+    RESULT_COLUMNS, DEFAULT_DATABASE_PATH, get_factor_overrides, evaluate_components, connect, load_catalog,
+    use_database, default_catalogs, calculate, calculate_columns)
+from . import catalog, constants, overrides
+from .records import Evaluation, ComponentResult
+from .validation import ValidationError, validate_components, describe_violations
+
+__all__ = [
+    'calculate_temperature_factor', 'calculate_capacitance_factor', 'get_exact_or_calculate_factor',
+    'calculate_resistor_temperature_factor', 'calculate_resistor_power_factor', 'calculate_resistor_stress_factor',
+    'calculate_inductor_temperature_factor',
+    'CalculationError', 'CALCULATION_FIELDS', 'STYLE_FIELDS', 'DEFAULT_QUALITY_LEVELS', 'get_component_type', 'get_component_name',
+    'get_calculation_key', 'get_reference_component', 'calculate_component_reliability',
+    'calculate_resistor_reliability', 'calculate_inductor_reliability', 'calculate_single_component',
+    'RESULT_COLUMNS', 'DEFAULT_DATABASE_PATH', 'get_factor_overrides', 'evaluate_components', 'connect',
+    'load_catalog', 'use_database', 'default_catalogs', 'calculate', 'calculate_columns',
+    'catalog', 'constants', 'overrides',
+    'Evaluation', 'ComponentResult', 'ValidationError', 'validate_components', 'describe_violations',
+]
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Versioned, immutable snapshots of the MIL-HDBK-217F factor tables
+A request takes the current snapshot once and calculates against it, so a
+reload swapping in a new dataset never changes a calculation half way.
+Packaged builds load the first snapshot from a module compiled at build time
+(database/compile_snapshot.py) instead of opening SQLite; the caller passes
+that module to CatalogManager.
+"""
+
+import hashlib
+import os
+import pprint
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from types import MappingProxyType
+
+# Keyed table and key column of each family's styles and quality levels
+STYLE_TABLES = {
+    'capacitor': ('capacitor_styles', 'style'),
+    'resistor': ('resistor_styles', 'style'),
+    'inductor': ('inductor_styles', 'inductor_type'),
+}
+QUALITY_TABLES = {
+    'capacitor': ('quality_factors', 'quality_level'),
+    'resistor': ('resistor_quality_factors', 'quality_level'),
+    'inductor': ('inductor_quality_factors', 'quality_level'),
+}
+
+# Ordered factor tables: (table, ORDER BY column)
+FACTOR_TABLES = (
+    ('temperature_factors', 'temperature'),
+    ('capacitance_factors', 'capacitance'),
+    ('voltage_stress_factors', 'voltage_stress'),
+    ('resistor_temperature_factors', 'temperature'),
+    ('resistor_power_factors', 'power_dissipation'),
+    ('resistor_stress_factors', 'power_stress'),
+)
+
+# Code tables added by schema version 2: (table, column the code resolves to, family tables)
+CODE_TABLES = (
+    ('style_codes', 'style', STYLE_TABLES),
+    ('quality_codes', 'quality_level', QUALITY_TABLES),
+)
+
+# Code tables resolved unless a caller opts out. A style code is either a key
+# or a hard error, so resolving 'CZR' to 'CZ, CZR' never changes a result; a
+# quality code such as 'B' got the default π_Q before it resolved to 'S,B'
+DEFAULT_CODE_ALIASES = ('style_codes',)
+
+# Handbook tables not used by the calculators, kept so a database can be restored
+RESTORE_ONLY_TABLES = ('series_resistance_factors',)
+
+# Keyed tables: (table, key column)
+KEYED_TABLES = (
+    ('capacitor_styles', 'style'),
+    ('resistor_styles', 'style'),
+    ('inductor_styles', 'inductor_type'),
+    ('quality_factors', 'quality_level'),
+    ('resistor_quality_factors', 'quality_level'),
+    ('inductor_quality_factors', 'quality_level'),
+    ('environment_factors', 'environment'),
+    ('resistor_environment_factors', 'environment'),
+    ('inductor_environment_factors', 'environment'),
+)
+
+# A composite key such as 'CZ, CZR' or 'S,B' lists several short codes
+_CODE_PATTERN = re.compile(r'[A-Z]{1,4}')
+
+_MISSING = object()
+
+def split_codes(name):
+    """Individual codes of a composite key; other names map only to themselves"""
+    parts = [part.strip() for part in name.split(',')]
+    if len(parts) > 1 and all(_CODE_PATTERN.fullmatch(part) for part in parts):
+        return parts
+    return []
+
+def code_rows(tables, target_column, family_tables):
+    """
+    Rows of a code table derived from the keyed tables, as migration 2 writes them
+
+    Every key is its own code first, so a real key always wins over an alias;
+    between aliases the earlier row (by id) wins.
+    """
+    rows = {}
+    for family, (table, column) in family_tables.items():
+        names = [row[column] for row in sorted(tables[table], key=lambda row: row.get('id') or 0)]
+        for name in names:
+            rows.setdefault((family, name), name)
+        for name in names:
+            for code in split_codes(name):
+                rows.setdefault((family, code), name)
+    return [{'family': family, 'code': code, target_column: name} for (family, code), name in sorted(rows.items())]
+
+class FactorCatalog:
+    """
+    Read-only factor tables of one dataset version
+
+    Rows are read-only mappings, keyed tables are read-only dicts and ordered
+    tables are tuples. Derived factors are memoized per snapshot, so the memo
+    can never mix values from two versions.
+    """
+
+    def __init__(self, tables, source_path, mtime, label=None, factor_cache_size=65536, digest=None,
+                 code_aliases=DEFAULT_CODE_ALIASES):
+        self.digest = digest or table_digest(tables)
+        changing = sorted(set(code_aliases).difference(DEFAULT_CODE_ALIASES))
+        if changing:
+            # These aliases change results, so they must not share a version or cache key
+            self.digest = hashlib.sha256(f'{self.digest}:code-aliases:{",".join(changing)}'.encode()).hexdigest()
+        self.version = label or self.digest[:12]
+        self.source_path = source_path
+        self.mtime = mtime
+        self.loaded_at = datetime.now().isoformat()
+
+        keyed = {
+            name: {row[key_column]: MappingProxyType(row) for row in tables[name]}
+            for name, key_column in KEYED_TABLES
+        }
+        # Single codes of composite keys ('CZR' for 'CZ, CZR', 'B' for 'S,B') from
+        # the code tables named in code_aliases
+        self.code_aliases = {}  # table -> {code: composite key it resolves to}
+        for codes_table, target_column, family_tables in CODE_TABLES:
+            if codes_table not in code_aliases:
+                continue
+            for row in tables.get(codes_table, ()):
+                family_table = family_tables.get(row['family'])
+                if family_table is None:
+                    continue
+                by_key = keyed[family_table[0]]
+                if row['code'] not in by_key and row[target_column] in by_key:
+                    by_key[row['code']] = by_key[row[target_column]]
+                    self.code_aliases.setdefault(family_table[0], {})[row['code']] = row[target_column]
+        for name, rows in keyed.items():
+            setattr(self, name, MappingProxyType(rows))
+        for name, _ in FACTOR_TABLES:
+            setattr(self, name, tuple(MappingProxyType(row) for row in tables[name]))
+
+        self._factor_cache = {}
+        self._factor_cache_size = factor_cache_size
+        self.hits = 0
+        self.misses = 0
+
+    def cached_factor(self, key, compute):
+        """Memoized derived factor; compute() runs only for unseen keys"""
+        value = self._factor_cache.get(key, _MISSING)
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = compute()
+        if len(self._factor_cache) >= self._factor_cache_size:
+            self._factor_cache.clear()
+        self._factor_cache[key] = value
+        return value
+
+    def info(self):
+        return {
+            'version': self.version,
+            'digest': self.digest,
+            'source_path': self.source_path,
+            'loaded_at': self.loaded_at,
+            'factor_cache_entries': len(self._factor_cache)
+        }
+
+def table_digest(tables):
+    digest = hashlib.sha256()
+    for name in sorted(tables):
+        digest.update(name.encode())
+        digest.update(repr(tables[name]).encode())
+    return digest.hexdigest()
+
+def read_tables(conn):
+    """Factor table rows as plain dicts, in a stable order"""
+    tables = {}
+    for name, order_column in FACTOR_TABLES:
+        tables[name] = [dict(row) for row in conn.execute(f'SELECT * FROM {name} ORDER BY {order_column}')]
+    for name, key_column in KEYED_TABLES:
+        tables[name] = [dict(row) for row in conn.execute(f'SELECT * FROM {name} ORDER BY {key_column}')]
+    for name, target_column, family_tables in CODE_TABLES:
+        try:
+            tables[name] = [dict(row) for row in conn.execute(f'SELECT * FROM {name} ORDER BY family, code')]
+        except sqlite3.OperationalError:
+            # Database not yet migrated to schema version 2 (or opened read-only)
+            tables[name] = code_rows(tables, target_column, family_tables)
+    return tables
+
+def read_label(conn):
+    """Optional human-readable version from a dataset_metadata table"""
+    try:
+        row = conn.execute("SELECT value FROM dataset_metadata WHERE key = 'version'").fetchone()
+    except Exception:
+        return None
+    return row[0] if row else None
+
+def snapshot_source(conn):
+    """Source of a module holding the factor tables, their digest and their schema"""
+    tables = read_tables(conn)
+    extra_tables = {
+        name: [dict(row) for row in conn.execute(f'SELECT * FROM {name} ORDER BY id')]
+        for name in RESTORE_ONLY_TABLES
+    }
+    handbook_tables = [name for name, _ in FACTOR_TABLES + KEYED_TABLES] + list(RESTORE_ONLY_TABLES)
+    schema = {
+        name: conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone()[0]
+        for name in handbook_tables
+    }
+    return '\n'.join([
+        '# Generated by database/compile_snapshot.py from the handbook database. Do not edit.',
+        f'DIGEST = {table_digest(tables)!r}',
+        f'LABEL = {read_label(conn)!r}',
+        f'TABLES = {pprint.pformat(tables, width=120, sort_dicts=False)}',
+        f'EXTRA_TABLES = {pprint.pformat(extra_tables, width=120, sort_dicts=False)}',
+        f'SCHEMA = {pprint.pformat(schema, width=120, sort_dicts=False)}',
+        ''
+    ])
+
+def restore_database(path, snapshot):
+    """Create the handbook tables of a new database from a compiled snapshot"""
+    conn = sqlite3.connect(path)
+    try:
+        for name, create_sql in snapshot.SCHEMA.items():
+            conn.execute(create_sql)
+            rows = snapshot.TABLES.get(name) or snapshot.EXTRA_TABLES.get(name) or []
+            if rows:
+                columns = list(rows[0])
+                conn.executemany(
+                    f'INSERT INTO {name} ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))})',
+                    [tuple(row[column] for column in columns) for row in rows])
+        conn.commit()
+    finally:
+        conn.close()
+
+class CatalogManager:
+    """
+    Holds the current snapshot and swaps it atomically on reload
+
+    current() re-checks the database file's mtime at most every
+    `check_interval` seconds. A changed file is loaded into a new snapshot
+    outside the request path's fast case; if its tables are unchanged (for
+    example only the part library was written) the existing snapshot, and
+    its memoized factors, are kept.
+
+    Given a compiled `snapshot` module, the first snapshot is built from it
+    without touching the database and is served without mtime checks until
+    follow_database() or reload(). From then on the database file is followed
+    like any other source: if its tables match the snapshot, the snapshot
+    (and its memoized factors) is kept; edited tables replace it.
+    """
+
+    def __init__(self, path_func, connect, check_interval=1.0, factor_cache_size=65536, snapshot=None,
+                 code_aliases=DEFAULT_CODE_ALIASES):
+        self.path_func = path_func
+        self.connect = connect
+        self.check_interval = check_interval
+        self.factor_cache_size = factor_cache_size
+        self.code_aliases = code_aliases
+        self.snapshot = snapshot
+        self.frozen = False
+        self._catalog = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._retired_stats = (0, 0)
+        self.reloads = 0
+
+    def current(self):
+        catalog = self._catalog
+        if catalog is not None and (self.frozen or time.monotonic() - self._checked_at < self.check_interval):
+            return catalog
+        if catalog is None and self.snapshot is not None:
+            return self._load_snapshot()
+        return self._refresh(force=False)
+
+    def reload(self):
+        self.frozen = False
+        return self._refresh(force=True)
+
+    def follow_database(self):
+        """Start checking the database file after serving the compiled snapshot"""
+        self.frozen = False
+        return self._refresh(force=False)
+
+    def _load_snapshot(self):
+        with self._lock:
+            if self._catalog is None:
+                snapshot = self.snapshot
+                self._catalog = FactorCatalog(snapshot.TABLES, 'compiled snapshot', None, snapshot.LABEL,
+                                              self.factor_cache_size, snapshot.DIGEST, self.code_aliases)
+                self.frozen = True
+                self.reloads += 1
+            return self._catalog
+
+    def _refresh(self, force):
+        with self._lock:
+            catalog = self._catalog
+            path = self.path_func()
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                mtime = None
+            self._checked_at = time.monotonic()
+            if not force and catalog is not None and catalog.source_path == path and catalog.mtime == mtime:
+                return catalog
+            if catalog is not None and mtime is None:
+                return catalog  # no database file (yet) to follow
+
+            try:
+                conn = self.connect()
+                try:
+                    new_catalog = FactorCatalog(read_tables(conn), path, mtime, read_label(conn),
+                                                self.factor_cache_size, code_aliases=self.code_aliases)
+                finally:
+                    conn.close()
+            except Exception as e:
+                if catalog is None:
+                    raise
+                # A half-written file must not take the running dataset down
+                print(f"Dataset reload failed, keeping version {catalog.version}: {str(e)}")
+                return catalog
+
+            if catalog is not None and catalog.digest == new_catalog.digest:
+                # Bookkeeping only, the tables are unchanged (a snapshot now follows the file)
+                catalog.source_path = path
+                catalog.mtime = mtime
+                return catalog
+
+            if catalog is not None:
+                if catalog.version != new_catalog.version:
+                    print(f"Factor dataset {catalog.version} replaced by {new_catalog.version}")
+                hits, misses = self._retired_stats
+                self._retired_stats = (hits + catalog.hits, misses + catalog.misses)
+            self._catalog = new_catalog
+            self.reloads += 1
+            return new_catalog
+
+    def cache_stats(self):
+        """Memoized factor (hits, misses) across every snapshot served so far"""
+        catalog = self._catalog
+        hits, misses = self._retired_stats
+        if catalog is not None:
+            hits, misses = hits + catalog.hits, misses + catalog.misses
+        return hits, misses
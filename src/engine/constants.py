@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+MIL-HDBK-217F equation constants and the calculators' default stresses
+The application's Config takes its values from here, so the web app, the
+batch CLI and notebooks all calculate with the same constants.
+"""
+
+# Calculation defaults for fields a component leaves out
+DEFAULT_TEMPERATURE = 25  # Celsius
+DEFAULT_QUALITY = 'M'     # Military
+DEFAULT_ENVIRONMENT = 'GB'  # Ground Benign
+
+# Temperature factor equation constants
+TEMP_FACTOR_EA_COLUMN1 = 0.15
+TEMP_FACTOR_EA_COLUMN2 = 0.35
+BOLTZMANN_CONSTANT = 8.617e-5  # eV/K
+REFERENCE_TEMP = 298  # 25°C in Kelvin (25 + 273)
+
+# Capacitance factor equation exponents
+CAP_FACTOR_EXP_COLUMN1 = 0.09
+CAP_FACTOR_EXP_COLUMN2 = 0.23
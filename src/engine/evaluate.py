@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Batch evaluation of component records against a factor catalog
+calculate() takes a list of component dicts and calculate_columns() a dict
+of equal-length columns; both return plain data and need no web server.
+"""
+
+import os
+import sqlite3
+from urllib.parse import quote
+from .catalog import DEFAULT_CODE_ALIASES, FactorCatalog, CatalogManager, read_tables, read_label
+from .models import (
+    CALCULATION_FIELDS, get_calculation_key, get_component_type, calculate_single_component,
+    component_result)
+from .overrides import FactorOverrides
+
+# The handbook database shipped next to the package (src/database/mil_hdbk_217.db)
+DEFAULT_DATABASE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'database', 'mil_hdbk_217.db')
+
+# Columns returned by calculate_columns(); factors a family doesn't use are None
+RESULT_COLUMNS = (
+    'name', 'component_type', 'style', 'lambda_b',
+    'pi_t', 'pi_c', 'pi_v', 'pi_sr', 'pi_p', 'pi_s', 'pi_q', 'pi_e', 'lambda_p'
+)
+
+def get_factor_overrides(spec):
+    """Project factor overrides from a request, or None when there are none"""
+    layers = FactorOverrides(spec) if spec else None
+    return layers or None
+
+def evaluate_components(catalog, components, derating_columns=None, factor_overrides=None, type_counts=None):
+    """
+    Calculate all components, evaluating each distinct parameter set once
+    
+    Rows that share a calculation key share the first row's evaluation, with
+    their own name, description, manufacturer and part number. Returns result
+    records (engine.records.ComponentResult) in input order, the summed λ_P and the number of unique evaluations.
+    When derating_columns is given, each row's stresses are collected into it
+    in the same loop. factor_overrides (a FactorOverrides) is resolved per
+    row and is part of the dedup key, so overridden rows never share a result
+    with handbook rows. type_counts, if given, receives the rows per family.
+    """
+    results = []
+    total_lambda_p = 0.0
+    evaluated = {}
+    unique_evaluations = 0
+    if type_counts is None:
+        type_counts = {}
+    
+    for component in components:
+        # Determine component type
+        component_type = component.get('component_type', 'capacitor')
+        if component_type not in CALCULATION_FIELDS:
+            component_type = 'capacitor'
+        
+        key = get_calculation_key(component, component_type)
+        row_overrides = factor_overrides.resolve(component, component_type) if factor_overrides else None
+        if row_overrides and key is not None:
+            key += (FactorOverrides.key(row_overrides),)
+        shared = evaluated.get(key) if key is not None else None
+        
+        if shared is None:
+            result = calculate_single_component(catalog, component, component_type, row_overrides)
+            unique_evaluations += 1
+            if key is not None:
+                evaluated[key] = result.evaluation
+        else:
+            result = component_result(shared, component)
+        
+        results.append(result)
+        total_lambda_p += result.evaluation.lambda_p
+        type_counts[component_type] = type_counts.get(component_type, 0) + 1
+        if derating_columns is not None:
+            derating_columns.add(component_type, component, result['name'])
+    
+    return results, total_lambda_p, unique_evaluations
+
+def connect(database_path=None):
+    """
+    Read-only connection to a handbook database
+
+    The file is never written: a database the app hasn't migrated yet is
+    read as it is (without the style and quality code tables).
+    """
+    database_path = database_path or default_database_path
+    if not os.path.exists(database_path):
+        raise FileNotFoundError(f"Handbook database not found at {database_path}")
+    conn = sqlite3.connect(f'file:{quote(os.path.abspath(database_path))}?mode=ro', uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def load_catalog(database_path=None, factor_cache_size=65536, code_aliases=DEFAULT_CODE_ALIASES):
+    """Factor catalog read from a handbook database (default: the one use_database() set)"""
+    database_path = database_path or default_database_path
+    conn = connect(database_path)
+    try:
+        return FactorCatalog(read_tables(conn), database_path, os.path.getmtime(database_path),
+                             read_label(conn), factor_cache_size, code_aliases=code_aliases)
+    finally:
+        conn.close()
+
+default_database_path = DEFAULT_DATABASE_PATH
+
+def use_database(database_path):
+    """Calculate against another handbook database when no catalog is passed"""
+    global default_database_path
+    default_database_path = database_path
+    default_catalogs.reload()
+
+# Catalog used when the caller doesn't pass one; follows changes to the database file
+default_catalogs = CatalogManager(lambda: default_database_path, lambda: connect(default_database_path))
+
+def _prepare(factor_catalog, factor_overrides):
+    if factor_catalog is None:
+        factor_catalog = default_catalogs.current()
+    if factor_overrides is not None and not isinstance(factor_overrides, FactorOverrides):
+        factor_overrides = get_factor_overrides(factor_overrides)
+    return factor_catalog, factor_overrides or None
+
+def calculate(records, factor_catalog=None, factor_overrides=None):
+    """
+    Calculate a list of component records
+
+    factor_overrides may be a FactorOverrides or its plain spec
+    ({'styles': ..., 'part_numbers': ..., 'components': ...}). Returns the
+    /api/calculate response without its timestamp; the components are result
+    records, read like dicts (record.to_dict() gives a plain one).
+    """
+    factor_catalog, factor_overrides = _prepare(factor_catalog, factor_overrides)
+    results, total_lambda_p, unique_evaluations = evaluate_components(
+        factor_catalog, records, factor_overrides=factor_overrides)
+    return {
+        'components': results,
+        'total_lambda_p': round(total_lambda_p, 10),
+        'component_count': len(results),
+        'unique_evaluations': unique_evaluations,
+        'dataset_version': factor_catalog.version
+    }
+
+def calculate_columns(columns, factor_catalog=None, factor_overrides=None):
+    """
+    Calculate components given as columns, e.g. {'style': [...], 'temperature': [...]}
+
+    None entries take the calculator defaults. Returns a dict of RESULT_COLUMNS
+    lists in input order.
+    """
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"Columns must have equal lengths, got {sorted(lengths)}")
+    names = list(columns)
+    rows = zip(*(list(columns[name]) for name in names))
+    records = [{name: value for name, value in zip(names, row) if value is not None} for row in rows]
+
+    factor_catalog, factor_overrides = _prepare(factor_catalog, factor_overrides)
+    results, _, _ = evaluate_components(factor_catalog, records, factor_overrides=factor_overrides)
+    output = {column: [result.get(column) for result in results] for column in RESULT_COLUMNS}
+    output['component_type'] = [get_component_type(record) for record in records]
+    return output
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+MIL-HDBK-217F π-factor equations
+Used when a stress value falls between the rows of a handbook factor table.
+"""
+
+import math
+from . import constants
+
+def calculate_temperature_factor(temperature, column):
+    """Calculate temperature factor using MIL-HDBK-217F equation"""
+    if temperature < -55 or temperature > 150:
+        raise ValueError(f"Temperature {temperature}°C out of range (-55°C to 150°C)")
+    
+    if column == 1:
+        ea = constants.TEMP_FACTOR_EA_COLUMN1
+    else:
+        ea = constants.TEMP_FACTOR_EA_COLUMN2
+    
+    temp_kelvin = temperature + 273
+    if temp_kelvin <= 0:
+        raise ValueError(f"Temperature must be above -273°C")
+    
+    factor = math.exp(-ea / constants.BOLTZMANN_CONSTANT * 
+                     (1/temp_kelvin - 1/constants.REFERENCE_TEMP))
+    return round(factor, 6)
+
+def calculate_capacitance_factor(capacitance, column):
+    """Calculate capacitance factor using MIL-HDBK-217F equation"""
+    if capacitance <= 0:
+        return 1.0
+    
+    if column == 1:
+        exponent = constants.CAP_FACTOR_EXP_COLUMN1
+    else:
+        exponent = constants.CAP_FACTOR_EXP_COLUMN2
+    
+    # π_C = C^exponent
+    factor = capacitance ** exponent
+    return round(factor, 6)
+
+def get_exact_or_calculate_factor(value, data_points, value_column, factor_column, calculation_type, column_number=None):
+    """Get exact value from table or calculate using equation"""
+    
+    # First, check if exact value exists in table
+    for row in data_points:
+        if abs(row[value_column] - value) < 1e-10:
+            return row[factor_column]
+    
+    # If not found in table, use appropriate calculation
+    if calculation_type == 'temperature':
+        return calculate_temperature_factor(value, column_number)
+    elif calculation_type == 'capacitance':
+        return calculate_capacitance_factor(value, column_number)
+    elif calculation_type == 'voltage_stress':
+        if column_number == 1:
+            return (value / 0.6) ** 5 + 1 
+        elif column_number == 2:
+            return (value / 0.6) ** 10 + 1 
+        elif column_number == 3:
+            return (value / 0.6) ** 3 + 1 
+        elif column_number == 4:
+            return (value / 0.6) ** 17 + 1 
+        elif column_number == 5:
+            return (value / 0.5) ** 3 + 1 
+        else:
+            return 1.0
+    elif calculation_type == 'resistor_temperature':
+        return calculate_resistor_temperature_factor(value, column_number)
+    elif calculation_type == 'resistor_power':
+        return calculate_resistor_power_factor(value)
+    elif calculation_type == 'resistor_stress':
+        return calculate_resistor_stress_factor(value, column_number)
+    else:
+        return 1.0
+
+def calculate_resistor_temperature_factor(temperature, column):
+    """Calculate resistor temperature factor using MIL-HDBK-217F equation"""
+    if temperature < -55 or temperature > 150:
+        raise ValueError(f"Temperature {temperature}°C out of range (-55°C to 150°C)")
+    
+    if column == 1:
+        ea = 0.2
+    else:
+        ea = 0.08
+    
+    temp_kelvin = temperature + 273
+    if temp_kelvin <= 0:
+        raise ValueError(f"Temperature must be above -273°C")
+    
+    factor = math.exp(-ea / constants.BOLTZMANN_CONSTANT * 
+                     (1/temp_kelvin - 1/constants.REFERENCE_TEMP))
+    return round(factor, 6)
+
+def calculate_resistor_power_factor(power_dissipation):
+    """Calculate resistor power factor using equation"""
+    if power_dissipation <= 0:
+        return 0.068
+    
+    # π_P = (Power Dissipation)^0.39
+    factor = power_dissipation ** 0.39
+    return round(factor, 7)
+
+def calculate_resistor_stress_factor(power_stress, column):
+    """Calculate resistor power stress factor"""
+    if power_stress <= 0:
+        return 0.66 if column == 2 else 0.79
+    
+    if column == 1:
+        # Column 1: π_S = .71e^1.1(S)
+        factor = 0.71 * math.exp(1.1 * power_stress)
+    else:
+        # Column 2: π_S = .54e^2.04(S)
+        factor = 0.54 * math.exp(2.04 * power_stress)
+    
+    return round(factor, 6)
+
+def calculate_inductor_temperature_factor(temperature):
+    """Calculate inductor temperature factor using MIL-HDBK-217F equation"""
+    if temperature < -55 or temperature > 190:
+        raise ValueError(f"Temperature {temperature}°C out of range (-55°C to 190°C)")
+    
+    ea = 0.11
+    temp_kelvin = temperature + 273
+    
+    if temp_kelvin <= 0:
+        raise ValueError(f"Temperature must be above -273°C")
+    
+    factor = math.exp(-ea / constants.BOLTZMANN_CONSTANT * 
+                     (1/temp_kelvin - 1/constants.REFERENCE_TEMP))
+    return round(factor, 6)
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Part stress models for capacitors, resistors and inductors
+Each calculator takes a factor catalog snapshot and one component record
+and returns its result record; nothing here depends on Flask or SQLite.
+"""
+
+from . import constants
+from .factors import get_exact_or_calculate_factor, calculate_inductor_temperature_factor
+from .records import Evaluation, ComponentResult
+
+# Field holding each family's style code
+STYLE_FIELDS = {
+    'capacitor': 'style',
+    'resistor': 'style',
+    'inductor': 'inductor_type',
+}
+
+class CalculationError(Exception):
+    """A component could not be calculated; the message names the component"""
+
+# Fields that determine λ_P, with the defaults each calculator applies.
+# Name, description, manufacturer and part number never affect the result.
+CALCULATION_FIELDS = {
+    'capacitor': (
+        ('style', None, str),
+        ('temperature', constants.DEFAULT_TEMPERATURE, float),
+        ('capacitance', 1.0, float),
+        ('voltage_stress', 0.5, float),
+        ('quality_level', constants.DEFAULT_QUALITY, str),
+        ('environment', constants.DEFAULT_ENVIRONMENT, str),
+        ('series_resistance', 1, float),
+    ),
+    'resistor': (
+        ('style', None, str),
+        ('temperature', constants.DEFAULT_TEMPERATURE, float),
+        ('watts', 0.125, float),
+        ('power_stress', 0.5, float),
+        ('quality_level', constants.DEFAULT_QUALITY, str),
+        ('environment', constants.DEFAULT_ENVIRONMENT, str),
+    ),
+    'inductor': (
+        ('inductor_type', None, str),
+        ('temperature', constants.DEFAULT_TEMPERATURE, float),
+        ('quality_level', 'MIL-SPEC', str),
+        ('environment', constants.DEFAULT_ENVIRONMENT, str),
+    ),
+}
+
+DEFAULT_QUALITY_LEVELS = {
+    component_type: dict((field, default) for field, default, _ in fields)['quality_level']
+    for component_type, fields in CALCULATION_FIELDS.items()
+}
+
+def get_component_type(component):
+    """Calculator family of a component (unknown types are treated as capacitors)"""
+    component_type = component.get('component_type', 'capacitor')
+    return component_type if component_type in CALCULATION_FIELDS else 'capacitor'
+
+def get_component_name(component, component_type):
+    """Display name of a component, as reported in its result"""
+    if component_type == 'inductor':
+        return component.get('name', 'Inductor_Component')
+    
+    style = component.get('style')
+    component_name = component.get('name', f'{style}_Component')
+    if component_type == 'capacitor' and (not component_name or component_name == f'{style}_Component'):
+        component_name = f'Capacitor_{component.get("id", "Unknown")}'
+    return component_name
+
+def get_calculation_key(component, component_type):
+    """Canonical tuple of the fields that determine λ_P, or None if they don't normalize"""
+    key = [component_type]
+    try:
+        for field, default, convert in CALCULATION_FIELDS[component_type]:
+            value = component.get(field, default)
+            if convert is float:
+                value = float(value)
+            elif not isinstance(value, str) and value is not None:
+                return None
+            key.append(value)
+    except (TypeError, ValueError):
+        # Let the calculator raise its usual error for this component
+        return None
+    return tuple(key)
+
+def get_reference_component(component_type, style, quality, environment):
+    """Component at the calculator defaults, used as the parts-count stress point"""
+    component = {field: default for field, default, _ in CALCULATION_FIELDS[component_type]}
+    component[STYLE_FIELDS[component_type]] = style
+    component['quality_level'] = quality
+    component['environment'] = environment
+    return component
+
+def component_result(evaluation, component):
+    """Result record of one row, sharing the evaluation of its parameter set"""
+    return ComponentResult(
+        evaluation, component.get('project_name'), get_component_name(component, evaluation.component_type),
+        component.get('description', ''), component.get('manufacturer', ''), component.get('part_number', ''))
+
+def calculate_inductor_reliability(catalog, component, factor_overrides=None):
+    """Calculate reliability for a single inductor component"""
+    try:
+        # Get component parameters
+        inductor_type = component.get('inductor_type')
+        temperature = float(component.get('temperature', constants.DEFAULT_TEMPERATURE))
+        quality_level = component.get('quality_level', 'MIL-SPEC')
+        environment = component.get('environment', constants.DEFAULT_ENVIRONMENT)
+        
+        # Get inductor style data
+        style_data = catalog.inductor_styles.get(inductor_type)
+        
+        if not style_data:
+            raise ValueError(f"Inductor type '{inductor_type}' not found")
+        
+        lambda_b = style_data['lambda_b']
+
+        # Calculate π_T (Temperature Factor)
+        pi_t = catalog.cached_factor(
+            ('inductor_temperature', temperature),
+            lambda: calculate_inductor_temperature_factor(temperature))
+        
+        # Get π_Q (Quality Factor)
+        quality_data = catalog.inductor_quality_factors.get(quality_level)
+        
+        if quality_data:
+            pi_q = quality_data['pi_q']
+        else:
+            pi_q = 1.0
+        
+        # Get π_E (Environment Factor)
+        env_data = catalog.inductor_environment_factors.get(environment)
+        
+        if env_data:
+            pi_e = env_data['pi_e']
+        else:
+            pi_e = 1.0
+        
+        # Project-level overrides replace handbook factors
+        if factor_overrides:
+            lambda_b = factor_overrides.get('lambda_b', lambda_b)
+            pi_t = factor_overrides.get('pi_t', pi_t)
+            pi_q = factor_overrides.get('pi_q', pi_q)
+            pi_e = factor_overrides.get('pi_e', pi_e)
+        
+        # Calculate λ_P: λ_P = λ_b × π_T × π_Q × π_E
+        lambda_p = lambda_b * pi_t * pi_q * pi_e
+        
+        evaluation = Evaluation(
+            'inductor', inductor_type, (lambda_b, pi_t, pi_q, pi_e), round(lambda_p, 12),
+            (temperature, quality_level, environment), catalog.version)
+        return component_result(evaluation, component)
+        
+    except Exception as e:
+        raise CalculationError(f"Error calculating inductor {component.get('name', 'Unknown')}: {str(e)}")
+
+def calculate_resistor_reliability(catalog, component, factor_overrides=None):
+    """Calculate reliability for a single resistor component"""
+    try:
+        # Get component parameters
+        style = component.get('style')
+        temperature = float(component.get('temperature', constants.DEFAULT_TEMPERATURE))
+        watts = float(component.get('watts', 0.125))  # Power dissipation in Watts
+        power_stress = float(component.get('power_stress', 0.5))  # S value
+        quality_level = component.get('quality_level', constants.DEFAULT_QUALITY)
+        environment = component.get('environment', constants.DEFAULT_ENVIRONMENT)
+        
+        # Get resistor style data
+        style_data = catalog.resistor_styles.get(style)
+        
+        if not style_data:
+            raise ValueError(f"Resistor style '{style}' not found")
+        
+        lambda_b = style_data['lambda_b']
+        pi_t_column = style_data['pi_t_column']
+        pi_s_column = style_data['pi_s_column']
+        
+        # Calculate π_T (Temperature Factor)
+        temp_data = catalog.resistor_temperature_factors
+        temp_column = 'column_1' if pi_t_column == 1 else 'column_2'
+        pi_t = catalog.cached_factor(
+            ('resistor_temperature', pi_t_column, temperature),
+            lambda: get_exact_or_calculate_factor(temperature, temp_data, 'temperature', temp_column, 'resistor_temperature', pi_t_column))
+        
+        # Calculate π_P (Power Factor) using Watts
+        power_data = catalog.resistor_power_factors
+        pi_p = catalog.cached_factor(
+            ('resistor_power', watts),
+            lambda: get_exact_or_calculate_factor(watts, power_data, 'power_dissipation', 'pi_p', 'resistor_power', None))
+        
+        # Calculate π_S (Power Stress Factor) using S
+        stress_data = catalog.resistor_stress_factors
+        column_name = f'column_{pi_s_column}'
+        pi_s = catalog.cached_factor(
+            ('resistor_stress', pi_s_column, power_stress),
+            lambda: get_exact_or_calculate_factor(power_stress, stress_data, 'power_stress', column_name, 'resistor_stress', pi_s_column))
+        
+        # Get π_Q (Quality Factor)
+        quality_data = catalog.resistor_quality_factors.get(quality_level)
+        
+        if quality_data:
+            pi_q = quality_data['pi_q']
+        else:
+            pi_q = 3.0
+        
+        # Get π_E (Environment Factor)
+        env_data = catalog.resistor_environment_factors.get(environment)
+        
+        if env_data:
+            pi_e = env_data['pi_e']
+        else:
+            pi_e = 1.0
+        
+        # Project-level overrides replace handbook factors
+        if factor_overrides:
+            lambda_b = factor_overrides.get('lambda_b', lambda_b)
+            pi_t = factor_overrides.get('pi_t', pi_t)
+            pi_p = factor_overrides.get('pi_p', pi_p)
+            pi_s = factor_overrides.get('pi_s', pi_s)
+            pi_q = factor_overrides.get('pi_q', pi_q)
+            pi_e = factor_overrides.get('pi_e', pi_e)
+        
+        # Calculate λ_P: λ_P = λ_b × π_T × π_P × π_S × π_Q × π_E
+        lambda_p = lambda_b * pi_t * pi_p * pi_s * pi_q * pi_e
+        
+        evaluation = Evaluation(
+            'resistor', style, (lambda_b, pi_t, pi_p, pi_s, pi_q, pi_e), round(lambda_p, 10),
+            (temperature, watts, power_stress, quality_level, environment), catalog.version)
+        return component_result(evaluation, component)
+        
+    except Exception as e:
+        raise CalculationError(f"Error calculating resistor {component.get('name', 'Unknown')}: {str(e)}")
+
+def calculate_component_reliability(catalog, component, factor_overrides=None):
+    """Calculate reliability for a single component with enhanced parameters"""
+    try:
+        # Get component parameters
+        style = component.get('style')
+        temperature = float(component.get('temperature', constants.DEFAULT_TEMPERATURE))
+        capacitance = float(component.get('capacitance', 1.0))
+        voltage_stress = float(component.get('voltage_stress', 0.5))
+        quality_level = component.get('quality_level', constants.DEFAULT_QUALITY)
+        environment = component.get('environment', constants.DEFAULT_ENVIRONMENT)
+        series_resistance = float(component.get('series_resistance', 1))
+        
+        # Get capacitor style data
+        style_data = catalog.capacitor_styles.get(style)
+        
+        if not style_data:
+            raise ValueError(f"Capacitor style '{style}' not found")
+        
+        lambda_b = style_data['lambda_b']
+        pi_t_column = style_data['pi_t_column']
+        pi_c_column = style_data['pi_c_column']
+        pi_v_column = style_data['pi_v_column']
+        default_pi_sr = style_data['pi_sr']
+        
+        # Calculate π_T (Temperature Factor)
+        temp_data = catalog.temperature_factors
+        temp_column = 'column_1' if pi_t_column == 1 else 'column_2'
+        pi_t = catalog.cached_factor(
+            ('temperature', pi_t_column, temperature),
+            lambda: get_exact_or_calculate_factor(temperature, temp_data, 'temperature', temp_column, 'temperature', pi_t_column))
+        
+        # Calculate π_C (Capacitance Factor)
+        cap_data = catalog.capacitance_factors
+        cap_column = 'column_1' if pi_c_column == 1 else 'column_2'
+        pi_c = catalog.cached_factor(
+            ('capacitance', pi_c_column, capacitance),
+            lambda: get_exact_or_calculate_factor(capacitance, cap_data, 'capacitance', cap_column, 'capacitance', pi_c_column))
+        
+        # Calculate π_V (Voltage Stress Factor)
+        voltage_data = catalog.voltage_stress_factors
+        column_name = f'column_{pi_v_column}'
+        pi_v = catalog.cached_factor(
+            ('voltage_stress', pi_v_column, voltage_stress),
+            lambda: get_exact_or_calculate_factor(voltage_stress, voltage_data, 'voltage_stress', column_name, 'voltage_stress', pi_v_column))
+        
+        # Get π_Q (Quality Factor)
+        quality_data = catalog.quality_factors.get(quality_level)
+        
+        if quality_data:
+            pi_q = quality_data['pi_q']
+        else:
+            pi_q = 3.0  # Default for non-established reliability
+        
+        # Get π_E (Environment Factor)
+        env_data = catalog.environment_factors.get(environment)
+        
+        if env_data:
+            pi_e = env_data['pi_e']
+        else:
+            pi_e = 1.0  # Default ground benign
+        
+        # Calculate π_SR (Series Resistance Factor) for tantalum capacitors
+        pi_sr = default_pi_sr
+        
+        # Check if this is a tantalum capacitor that needs series resistance calculation
+        tantalum_styles = ['CSR', 'CWR', 'CL', 'CLR', 'CRL']
+        if any(ts in style.upper() for ts in tantalum_styles):
+            # Determine resistance range based on series_resistance value
+            if series_resistance > 0.8:
+                pi_sr = 0.66
+            elif series_resistance > 0.6:
+                pi_sr = 1.0
+            elif series_resistance > 0.4:
+                pi_sr = 1.3
+            elif series_resistance > 0.2:
+                pi_sr = 2.0
+            elif series_resistance > 0.1:
+                pi_sr = 2.7
+            else:
+                pi_sr = 3.3
+        
+        # Project-level overrides replace handbook factors
+        if factor_overrides:
+            lambda_b = factor_overrides.get('lambda_b', lambda_b)
+            pi_t = factor_overrides.get('pi_t', pi_t)
+            pi_c = factor_overrides.get('pi_c', pi_c)
+            pi_v = factor_overrides.get('pi_v', pi_v)
+            pi_q = factor_overrides.get('pi_q', pi_q)
+            pi_e = factor_overrides.get('pi_e', pi_e)
+            pi_sr = factor_overrides.get('pi_sr', pi_sr)
+        
+        # Calculate λ_P (Predicted Failure Rate)
+        # λ_P = λ_b × π_T × π_C × π_V × π_Q × π_E × π_SR
+        lambda_p = lambda_b * pi_t * pi_c * pi_v * pi_q * pi_e * pi_sr
+        
+        evaluation = Evaluation(
+            'capacitor', style, (lambda_b, pi_t, pi_c, pi_v, pi_q, pi_e, pi_sr), round(lambda_p, 10),
+            (temperature, capacitance, voltage_stress, quality_level, environment, series_resistance), catalog.version)
+        return component_result(evaluation, component)
+        
+    except Exception as e:
+        raise CalculationError(f"Error calculating component {component.get('name', 'Unknown')}: {str(e)}")
+
+def calculate_single_component(catalog, component, component_type, factor_overrides=None):
+    """Dispatch one component to its calculator"""
+    if component_type == 'resistor':
+        result = calculate_resistor_reliability(catalog, component, factor_overrides)
+    elif component_type == 'inductor':
+        result = calculate_inductor_reliability(catalog, component, factor_overrides)
+    else:
+        result = calculate_component_reliability(catalog, component, factor_overrides)
+    if factor_overrides:
+        result.evaluation.overridden_factors = sorted(factor_overrides)
+    return result
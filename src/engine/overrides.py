@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Project-level factor overrides layered over the handbook tables
+Vendor-measured λ_b or π values are given per style, per part number or per
+component and resolved with at most three dict lookups per component;
+nothing is written to the database.
+"""
+
+import hashlib
+import json
+from .models import STYLE_FIELDS
+
+# Factors each calculator multiplies into λ_P
+OVERRIDABLE_FACTORS = {
+    'capacitor': ('lambda_b', 'pi_t', 'pi_c', 'pi_v', 'pi_q', 'pi_e', 'pi_sr'),
+    'resistor': ('lambda_b', 'pi_t', 'pi_p', 'pi_s', 'pi_q', 'pi_e'),
+    'inductor': ('lambda_b', 'pi_t', 'pi_q', 'pi_e'),
+}
+ALL_FACTORS = frozenset(factor for factors in OVERRIDABLE_FACTORS.values() for factor in factors)
+
+def _checked(factors, where):
+    if not isinstance(factors, dict):
+        raise ValueError(f"Overrides for {where} must be an object of factor values")
+    checked = {}
+    for factor, value in factors.items():
+        if factor not in ALL_FACTORS:
+            raise ValueError(f"Unknown factor '{factor}' in overrides for {where}")
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+            raise ValueError(f"Override {factor} for {where} must be a positive number")
+        checked[factor] = float(value)
+    return checked
+
+class FactorOverrides:
+    """
+    Override layers, most specific first: component id, part number, style
+
+    The spec is a project's factor_overrides object:
+    {'styles': {family: {style: factors}}, 'part_numbers': {part_number: factors},
+     'components': {component_id: factors}}. Each factor set maps factor names
+    (lambda_b, pi_q, ...) to values; factors that do not apply to a
+    component's family are ignored for that component.
+    """
+
+    def __init__(self, spec):
+        spec = spec or {}
+        self.styles = {}
+        for family, styles in (spec.get('styles') or {}).items():
+            if family not in OVERRIDABLE_FACTORS:
+                raise ValueError(f"Unknown component family '{family}' in style overrides")
+            for style, factors in styles.items():
+                self.styles[(family, style)] = _checked(factors, f'{family} style {style}')
+        self.part_numbers = {
+            str(part_number).strip(): _checked(factors, f'part number {part_number}')
+            for part_number, factors in (spec.get('part_numbers') or {}).items()
+        }
+        self.components = {
+            str(component_id): _checked(factors, f'component {component_id}')
+            for component_id, factors in (spec.get('components') or {}).items()
+        }
+
+    def __bool__(self):
+        return bool(self.styles or self.part_numbers or self.components)
+
+    def digest(self):
+        """
+        Hex digest of the normalized layers
+
+        Recorded with calculated results, so saved λ are only reused for a
+        project whose overrides are still the same.
+        """
+        canonical = json.dumps([
+            sorted([family, style, factors] for (family, style), factors in self.styles.items()),
+            self.part_numbers, self.components
+        ], sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def resolve(self, component, component_type):
+        """Merged factor overrides for one component, or None if no layer matches"""
+        layers = []
+        if self.styles:
+            layers.append(self.styles.get((component_type, component.get(STYLE_FIELDS.get(component_type, 'style')))))
+        part_number = str(component.get('part_number') or '').strip()
+        if self.part_numbers and part_number:
+            layers.append(self.part_numbers.get(part_number))
+        component_id = component.get('id')
+        if self.components and component_id not in (None, ''):
+            layers.append(self.components.get(str(component_id)))
+        layers = [layer for layer in layers if layer]
+        if not layers:
+            return None
+
+        allowed = OVERRIDABLE_FACTORS[component_type]
+        merged = {}
+        for layer in layers:  # least specific first, so later layers win
+            merged.update(layer)
+        merged = {factor: value for factor, value in merged.items() if factor in allowed}
+        return merged or None
+
+    @staticmethod
+    def key(resolved):
+        """Hashable form of resolved overrides, for the evaluation dedup key"""
+        return tuple(sorted(resolved.items())) if resolved else ()
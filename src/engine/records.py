@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Compact result records for the calculation hot path
+An Evaluation holds the full-precision factors of one distinct parameter
+set; every row sharing it gets a small ComponentResult with its own name and
+identity fields. Factors are rounded only when a record is read or
+serialized, so a large BOM never holds a dict per row.
+"""
+
+from collections.abc import MutableMapping
+
+# Factors reported per family, in result order, with their display precision
+FACTOR_FIELDS = {
+    'capacitor': (('lambda_b', 8), ('pi_t', 6), ('pi_c', 6), ('pi_v', 6), ('pi_q', 6), ('pi_e', 6), ('pi_sr', 6)),
+    'resistor': (('lambda_b', 8), ('pi_t', 6), ('pi_p', 7), ('pi_s', 6), ('pi_q', 6), ('pi_e', 6)),
+    'inductor': (('lambda_b', 8), ('pi_t', 6), ('pi_q', 6), ('pi_e', 6)),
+}
+
+# Stress parameters reported per family, after description, manufacturer and part number
+PARAMETER_FIELDS = {
+    'capacitor': ('temperature', 'capacitance', 'voltage_stress', 'quality_level', 'environment', 'series_resistance'),
+    'resistor': ('temperature', 'watts', 'power_stress', 'quality_level', 'environment'),
+    'inductor': ('temperature', 'quality_level', 'environment'),
+}
+
+# Capacitor results have never carried a component_type key
+TYPED_FAMILIES = ('resistor', 'inductor')
+
+_FACTOR_INDEX = {
+    component_type: {name: (index, digits) for index, (name, digits) in enumerate(fields)}
+    for component_type, fields in FACTOR_FIELDS.items()
+}
+
+_KEYS = {
+    component_type: (
+        ('project_name', 'name')
+        + (('component_type',) if component_type in TYPED_FAMILIES else ())
+        + ('style',)
+        + tuple(name for name, _ in fields)
+        + ('lambda_p', 'dataset_version', 'parameters')
+    )
+    for component_type, fields in FACTOR_FIELDS.items()
+}
+
+class Evaluation:
+    """Unrounded factors, rounded λ_P and stresses of one distinct parameter set"""
+
+    __slots__ = ('component_type', 'style', 'factors', 'lambda_p', 'parameters', 'dataset_version',
+                 'overridden_factors')
+
+    def __init__(self, component_type, style, factors, lambda_p, parameters, dataset_version):
+        self.component_type = component_type
+        self.style = style
+        self.factors = factors  # tuple in FACTOR_FIELDS order
+        self.lambda_p = lambda_p
+        self.parameters = parameters  # tuple in PARAMETER_FIELDS order
+        self.dataset_version = dataset_version
+        self.overridden_factors = None
+
+class ComponentResult(MutableMapping):
+    """
+    One row's result, read like the result dict the calculators used to build
+
+    Keys set by callers (an assembly or live-session id) are kept alongside
+    the computed ones and serialized after them.
+    """
+
+    __slots__ = ('evaluation', 'project_name', 'name', 'description', 'manufacturer', 'part_number', 'extra')
+
+    def __init__(self, evaluation, project_name, name, description, manufacturer, part_number):
+        self.evaluation = evaluation
+        self.project_name = project_name
+        self.name = name
+        self.description = description
+        self.manufacturer = manufacturer
+        self.part_number = part_number
+        self.extra = None
+
+    def _parameters(self):
+        parameters = {
+            'description': self.description,
+            'manufacturer': self.manufacturer,
+            'part_number': self.part_number
+        }
+        evaluation = self.evaluation
+        parameters.update(zip(PARAMETER_FIELDS[evaluation.component_type], evaluation.parameters))
+        return parameters
+
+    def _computed(self, key):
+        evaluation = self.evaluation
+        if key == 'lambda_p':
+            return evaluation.lambda_p
+        if key == 'name':
+            return self.name
+        factor = _FACTOR_INDEX[evaluation.component_type].get(key)
+        if factor is not None:
+            index, digits = factor
+            return round(evaluation.factors[index], digits)
+        if key == 'style':
+            return evaluation.style
+        if key == 'project_name':
+            return self.project_name
+        if key == 'parameters':
+            return self._parameters()
+        if key == 'dataset_version':
+            return evaluation.dataset_version
+        if key == 'component_type' and evaluation.component_type in TYPED_FAMILIES:
+            return evaluation.component_type
+        if key == 'overridden_factors' and evaluation.overridden_factors is not None:
+            return evaluation.overridden_factors
+        raise KeyError(key)
+
+    def __getitem__(self, key):
+        extra = self.extra
+        if extra is not None and key in extra:
+            return extra[key]
+        return self._computed(key)
+
+    def __setitem__(self, key, value):
+        if key in ('project_name', 'name'):
+            setattr(self, key, value)
+            return
+        if self.extra is None:
+            self.extra = {}
+        self.extra[key] = value
+
+    def __delitem__(self, key):
+        if self.extra is None or key not in self.extra:
+            raise KeyError(key)
+        del self.extra[key]
+
+    def _computed_keys(self):
+        keys = _KEYS[self.evaluation.component_type]
+        if self.evaluation.overridden_factors is not None:
+            keys += ('overridden_factors',)
+        return keys
+
+    def __iter__(self):
+        keys = self._computed_keys()
+        yield from keys
+        if self.extra:
+            yield from (key for key in self.extra if key not in keys)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def to_dict(self):
+        """Plain result dict with the reported precision, as serialized"""
+        evaluation = self.evaluation
+        result = _SERIALIZERS[evaluation.component_type](self, evaluation)
+        if evaluation.overridden_factors is not None:
+            result['overridden_factors'] = evaluation.overridden_factors
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+    def __repr__(self):
+        return f'ComponentResult({self.to_dict()!r})'
+
+def _capacitor_dict(record, evaluation):
+    lambda_b, pi_t, pi_c, pi_v, pi_q, pi_e, pi_sr = evaluation.factors
+    temperature, capacitance, voltage_stress, quality_level, environment, series_resistance = evaluation.parameters
+    return {
+        'project_name': record.project_name,
+        'name': record.name,
+        'style': evaluation.style,
+        'lambda_b': round(lambda_b, 8),
+        'pi_t': round(pi_t, 6),
+        'pi_c': round(pi_c, 6),
+        'pi_v': round(pi_v, 6),
+        'pi_q': round(pi_q, 6),
+        'pi_e': round(pi_e, 6),
+        'pi_sr': round(pi_sr, 6),
+        'lambda_p': evaluation.lambda_p,
+        'dataset_version': evaluation.dataset_version,
+        'parameters': {
+            'description': record.description,
+            'manufacturer': record.manufacturer,
+            'part_number': record.part_number,
+            'temperature': temperature,
+            'capacitance': capacitance,
+            'voltage_stress': voltage_stress,
+            'quality_level': quality_level,
+            'environment': environment,
+            'series_resistance': series_resistance
+        }
+    }
+
+def _resistor_dict(record, evaluation):
+    lambda_b, pi_t, pi_p, pi_s, pi_q, pi_e = evaluation.factors
+    temperature, watts, power_stress, quality_level, environment = evaluation.parameters
+    return {
+        'project_name': record.project_name,
+        'name': record.name,
+        'component_type': 'resistor',
+        'style': evaluation.style,
+        'lambda_b': round(lambda_b, 8),
+        'pi_t': round(pi_t, 6),
+        'pi_p': round(pi_p, 7),
+        'pi_s': round(pi_s, 6),
+        'pi_q': round(pi_q, 6),
+        'pi_e': round(pi_e, 6),
+        'lambda_p': evaluation.lambda_p,
+        'dataset_version': evaluation.dataset_version,
+        'parameters': {
+            'description': record.description,
+            'manufacturer': record.manufacturer,
+            'part_number': record.part_number,
+            'temperature': temperature,
+            'watts': watts,
+            'power_stress': power_stress,
+            'quality_level': quality_level,
+            'environment': environment
+        }
+    }
+
+def _inductor_dict(record, evaluation):
+    lambda_b, pi_t, pi_q, pi_e = evaluation.factors
+    temperature, quality_level, environment = evaluation.parameters
+    return {
+        'project_name': record.project_name,
+        'name': record.name,
+        'component_type': 'inductor',
+        'style': evaluation.style,
+        'lambda_b': round(lambda_b, 8),
+        'pi_t': round(pi_t, 6),
+        'pi_q': round(pi_q, 6),
+        'pi_e': round(pi_e, 6),
+        'lambda_p': evaluation.lambda_p,
+        'dataset_version': evaluation.dataset_version,
+        'parameters': {
+            'description': record.description,
+            'manufacturer': record.manufacturer,
+            'part_number': record.part_number,
+            'temperature': temperature,
+            'quality_level': quality_level,
+            'environment': environment
+        }
+    }
+
+# Result dict builders per family; the layout matches FACTOR_FIELDS and PARAMETER_FIELDS
+_SERIALIZERS = {
+    'capacitor': _capacitor_dict,
+    'resistor': _resistor_dict,
+    'inductor': _inductor_dict,
+}
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Up-front validation of a whole component batch
+The schema comes from CALCULATION_FIELDS: numeric fields get type and range
+checks, coded fields are looked up in the factor catalog. Each distinct
+(family, field, value) is checked once, so a large BOM costs one dict lookup
+per cell. Errors would make the calculators fail; warnings flag inputs the
+calculators accept with a default factor or outside the handbook's range.
+"""
+
+import math
+from .models import CALCULATION_FIELDS
+
+# Numeric limits: (family, field) -> (minimum, maximum, severity); None is unbounded
+NUMBER_LIMITS = {
+    ('capacitor', 'temperature'): (-55, 150, 'error'),
+    ('resistor', 'temperature'): (-55, 150, 'error'),
+    ('inductor', 'temperature'): (-55, 190, 'error'),
+    ('capacitor', 'capacitance'): (0, None, 'warning'),
+    ('capacitor', 'voltage_stress'): (0, 1, 'warning'),
+    ('capacitor', 'series_resistance'): (0, None, 'warning'),
+    ('resistor', 'watts'): (0, None, 'warning'),
+    ('resistor', 'power_stress'): (0, 1, 'warning'),
+}
+
+UNITS = {'temperature': '°C'}
+
+# Coded fields: (family, field) -> (catalog table, severity, message)
+CODE_TABLES = {
+    ('capacitor', 'style'): ('capacitor_styles', 'error', "Capacitor style '{value}' not found"),
+    ('resistor', 'style'): ('resistor_styles', 'error', "Resistor style '{value}' not found"),
+    ('inductor', 'inductor_type'): ('inductor_styles', 'error', "Inductor type '{value}' not found"),
+    ('capacitor', 'quality_level'): ('quality_factors', 'warning', "Unknown quality level '{value}', π_Q = 3.0 is used"),
+    ('resistor', 'quality_level'): (
+        'resistor_quality_factors', 'warning', "Unknown quality level '{value}', π_Q = 3.0 is used"),
+    ('inductor', 'quality_level'): (
+        'inductor_quality_factors', 'warning', "Unknown quality level '{value}', π_Q = 1.0 is used"),
+    ('capacitor', 'environment'): ('environment_factors', 'warning', "Unknown environment '{value}', π_E = 1.0 is used"),
+    ('resistor', 'environment'): (
+        'resistor_environment_factors', 'warning', "Unknown environment '{value}', π_E = 1.0 is used"),
+    ('inductor', 'environment'): (
+        'inductor_environment_factors', 'warning', "Unknown environment '{value}', π_E = 1.0 is used"),
+}
+
+_MISSING = object()
+
+class ValidationError(ValueError):
+    """A component batch with invalid inputs; `violations` lists all of them"""
+
+    def __init__(self, message, violations):
+        super().__init__(message)
+        self.violations = violations
+
+def check_number(component_type, field, value):
+    """(severity, message) for a bad numeric value, or None"""
+    label = field.replace('_', ' ').capitalize()
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return 'error', f"{label} must be a number, got {value!r}"
+    if not math.isfinite(number):
+        return 'error', f"{label} must be finite, got {value!r}"
+
+    limits = NUMBER_LIMITS.get((component_type, field))
+    if limits is None:
+        return None
+    minimum, maximum, severity = limits
+    unit = UNITS.get(field, '')
+    if maximum is None:
+        if number < minimum:
+            return severity, f"{label} {number}{unit} must be at least {minimum}{unit}"
+    elif number < minimum or number > maximum:
+        return severity, f"{label} {number}{unit} out of range ({minimum}{unit} to {maximum}{unit})"
+    return None
+
+def check_code(catalog, component_type, field, value):
+    """(severity, message) for an unknown code, or None"""
+    table, severity, message = CODE_TABLES[(component_type, field)]
+    if isinstance(value, str):
+        if value not in getattr(catalog, table):
+            return severity, message.format(value=value)
+        # An alias that takes the place of a default factor changes λ_P, so it is reported
+        alias = catalog.code_aliases.get(table, {}).get(value)
+        if alias is not None and severity == 'warning':
+            return 'warning', f"{field.replace('_', ' ').capitalize()} '{value}' uses the factors of '{alias}'"
+        return None
+    try:
+        hash(value)
+    except TypeError:
+        return 'error', f"{field.replace('_', ' ').capitalize()} must be a string, got {value!r}"
+    return severity, message.format(value=value)
+
+def validate_components(catalog, components):
+    """
+    Every violation in a component batch, in input order
+
+    Each violation is a dict with the row index, component name, family,
+    field, offending value, severity ('error' or 'warning') and message.
+    Missing fields take the calculator defaults, so only a missing style
+    or inductor type is reported.
+    """
+    violations = []
+    checked = {}
+
+    for index, component in enumerate(components):
+        if not isinstance(component, dict):
+            violations.append({
+                'index': index, 'name': None, 'component_type': None, 'field': None, 'value': None,
+                'severity': 'error', 'message': 'Component must be an object'
+            })
+            continue
+
+        component_type = component.get('component_type', 'capacitor')
+        if component_type not in CALCULATION_FIELDS:
+            violations.append({
+                'index': index, 'name': component.get('name'), 'component_type': component_type,
+                'field': 'component_type', 'value': component_type, 'severity': 'warning',
+                'message': f"Unknown component type {component_type!r}, calculated as a capacitor"
+            })
+            component_type = 'capacitor'
+
+        for field, default, convert in CALCULATION_FIELDS[component_type]:
+            value = component.get(field, default)
+            try:
+                key = (component_type, field, type(value), value)
+                problem = checked.get(key, _MISSING)
+            except TypeError:
+                key, problem = None, _MISSING
+            if problem is _MISSING:
+                if convert is float:
+                    problem = check_number(component_type, field, value)
+                else:
+                    problem = check_code(catalog, component_type, field, value)
+                if key is not None:
+                    checked[key] = problem
+            if problem is not None:
+                severity, message = problem
+                violations.append({
+                    'index': index, 'name': component.get('name'), 'component_type': component_type,
+                    'field': field, 'value': value, 'severity': severity, 'message': message
+                })
+
+    return violations
+
+def describe_violations(violations, limit=5):
+    """One-line summary of violations for an error message"""
+    parts = [
+        f"component {violation['index'] + 1}"
+        + (f" ({violation['name']})" if violation['name'] else '')
+        + f": {violation['message']}"
+        for violation in violations[:limit]
+    ]
+    if len(violations) > limit:
+        parts.append(f"and {len(violations) - limit} more")
+    return f"{len(violations)} invalid input(s): " + '; '.join(parts)
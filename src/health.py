@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Liveness and readiness of the MIL-HDBK-217F Reliability Prediction backend
+The server answers (is live) as soon as it listens; it is ready once the
+background warm-up has opened the database, built the factor caches and
+rendered the reference data. Optional tasks (the search index) run after
+that and only report a warning when they fail.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+class Readiness:
+    """Runs warm-up tasks in a background thread and reports their progress"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.tasks = []  # {'name', 'status', 'ms'} in run order
+        self.ready = False
+        self.error = None
+        self.warnings = []  # failures of optional tasks
+        self.ready_at = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def warm_up(self, tasks, optional=()):
+        """
+        Start running (name, func) tasks in order; readiness flips when all succeed
+
+        `optional` tasks run after readiness has flipped; a failure there is
+        added to warnings and leaves the server ready.
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self.tasks = [{'name': name, 'status': 'pending', 'ms': None, 'required': required}
+                          for required, group in ((True, tasks), (False, optional)) for name, _ in group]
+            self._thread = threading.Thread(target=self._run, args=(tasks, optional), name='warm-up',
+                                            daemon=True)
+            self._thread.start()
+
+    def _run(self, tasks, optional):
+        for (name, func), entry in zip(tasks, self.tasks):
+            error = self._run_task(entry, func)
+            if error is not None:
+                self.error = f"{name}: {error}"
+                print(f"Warm-up failed at {name}: {error}")
+                return
+        self.ready_at = datetime.now().isoformat()
+        self.ready = True
+        print(f"Ready after {time.monotonic() - self.started:.2f} s")
+
+        for (name, func), entry in zip(optional, self.tasks[len(tasks):]):
+            error = self._run_task(entry, func)
+            if error is not None:
+                self.warnings.append(f"{name}: {error}")
+                print(f"Optional warm-up task {name} failed: {error}")
+
+    @staticmethod
+    def _run_task(entry, func):
+        """Run one task and record its status; returns the error message, if any"""
+        entry['status'] = 'running'
+        start = time.perf_counter()
+        try:
+            func()
+        except Exception as e:
+            entry['status'] = 'failed'
+            return str(e)
+        finally:
+            entry['ms'] = round((time.perf_counter() - start) * 1000.0, 3)
+        entry['status'] = 'done'
+        return None
+
+    def wait(self, timeout=None):
+        """Block until the warm-up thread finishes; returns readiness"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.ready
+
+    def status(self):
+        return {
+            'live': True,
+            'ready': self.ready,
+            'ready_at': self.ready_at,
+            'uptime_s': round(time.monotonic() - self.started, 3),
+            'warmup': [dict(task) for task in self.tasks],
+            'error': self.error,
+            'warnings': list(self.warnings)
+        }
+
+readiness = Readiness()
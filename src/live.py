@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Live recalculation sessions pushed over server-sent events
+Clients send small parameter patches; bursts of edits are coalesced and only
+the recalculated components and the new total are pushed back.
+"""
+
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from assembly import ExactSum
+
+class LiveSession:
+    """
+    One open project: its components, their λ_P and an exact running total
+
+    A worker thread waits for patches, lets a burst settle for `debounce`
+    seconds (at most `max_delay` after the first patch), recalculates the
+    touched components in one batch and appends an update event.
+    """
+
+    def __init__(self, session_id, components, results, calculate, debounce, max_delay, history,
+                 idle_timeout, on_close=None):
+        self.id = session_id
+        self.calculate = calculate  # components -> (results, errors by position)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.idle_timeout = idle_timeout
+        self.on_close = on_close
+        self.components = dict(components)
+        self.lambdas = {component_id: result['lambda_p'] for component_id, result in results.items()}
+        self.total = ExactSum()
+        for lambda_p in self.lambdas.values():
+            self.total.add(lambda_p)
+
+        self.pending = {}  # component id -> merged field patch, or None to remove
+        self.first_patch = None
+        self.last_patch = None
+        self.events = deque(maxlen=history)
+        self.sequence = 0
+        self.subscribers = 0
+        self.touched = time.monotonic()
+        self.closed = False
+        self.condition = threading.Condition()
+        self.worker = threading.Thread(target=self._run, name=f'live-{session_id[:8]}', daemon=True)
+        self.worker.start()
+
+    def patch(self, patches):
+        """Queue patches: {'id', 'fields'} updates or adds, {'id', 'remove': true} removes"""
+        with self.condition:
+            if self.closed:
+                raise LookupError(f"Live session '{self.id}' is closed")
+            for patch in patches:
+                component_id = str(patch['id'])
+                if patch.get('remove'):
+                    self.pending[component_id] = None
+                else:
+                    merged = self.pending.get(component_id) or {}
+                    merged.update(patch.get('fields') or {})
+                    self.pending[component_id] = merged
+            now = time.monotonic()
+            if self.first_patch is None:
+                self.first_patch = now
+            self.last_patch = self.touched = now
+            self.condition.notify_all()
+            return len(self.pending)
+
+    def close(self):
+        with self.condition:
+            if self.closed:
+                return
+            self.closed = True
+            self.condition.notify_all()
+        if self.on_close:
+            self.on_close(self.id)
+
+    def _take_burst(self):
+        """Block until a settled burst of patches is ready; None once closed or idle"""
+        with self.condition:
+            while not self.pending:
+                if self.closed:
+                    return None
+                if not self.subscribers and time.monotonic() - self.touched > self.idle_timeout:
+                    break
+                self.condition.wait(timeout=min(self.idle_timeout, 5.0))
+            else:
+                while not self.closed:
+                    deadline = min(self.last_patch + self.debounce, self.first_patch + self.max_delay)
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(timeout=remaining)
+                burst, self.pending = self.pending, {}
+                self.first_patch = self.last_patch = None
+                return burst
+        self.close()
+        return None
+
+    def _run(self):
+        while True:
+            burst = self._take_burst()
+            if burst is None:
+                return
+            self._apply(burst)
+
+    def _apply(self, burst):
+        removed = []
+        updated_ids = []
+        updated = []
+        for component_id, fields in burst.items():
+            if fields is None:
+                if component_id in self.components:
+                    del self.components[component_id]
+                    self.total.add(-self.lambdas.pop(component_id, 0.0))
+                    removed.append(component_id)
+                continue
+            component = dict(self.components.get(component_id, {}))
+            component.update(fields)
+            self.components[component_id] = component
+            updated_ids.append(component_id)
+            updated.append(component)
+
+        results, errors = self.calculate(updated) if updated else ([], {})
+        changed = []
+        error_list = []
+        for position, (component_id, result) in enumerate(zip(updated_ids, results)):
+            if position in errors:
+                error_list.append({'id': component_id, 'error': errors[position]})
+                continue
+            result['id'] = component_id
+            old = self.lambdas.get(component_id)
+            if old is not None:
+                self.total.add(-old)
+            self.lambdas[component_id] = result['lambda_p']
+            self.total.add(result['lambda_p'])
+            changed.append(result)
+
+        with self.condition:
+            self.sequence += 1
+            self.events.append({
+                'sequence': self.sequence,
+                'changed': changed,
+                'removed': removed,
+                'errors': error_list,
+                'total_lambda_p': round(self.total.value(), 10),
+                'component_count': len(self.components)
+            })
+            self.condition.notify_all()
+
+    def stream(self, last_sequence=0, keepalive=15.0):
+        """Yield SSE messages for every update after last_sequence"""
+        with self.condition:
+            self.subscribers += 1
+        try:
+            yield 'retry: 2000\n\n'
+            while True:
+                with self.condition:
+                    self.condition.wait_for(lambda: self.sequence > last_sequence or self.closed, timeout=keepalive)
+                    events = [event for event in self.events if event['sequence'] > last_sequence]
+                    closed = self.closed
+                for event in events:
+                    last_sequence = event['sequence']
+                    yield f"id: {last_sequence}\nevent: update\ndata: {json.dumps(event)}\n\n"
+                if closed:
+                    yield 'event: closed\ndata: {}\n\n'
+                    return
+                if not events:
+                    yield ': keep-alive\n\n'
+        finally:
+            with self.condition:
+                self.subscribers -= 1
+                self.touched = time.monotonic()
+
+class LiveSessionStore:
+    """Open live sessions, bounded in number (oldest closed first)"""
+
+    def __init__(self, max_sessions, debounce, max_delay, history, idle_timeout):
+        self.max_sessions = max_sessions
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.history = history
+        self.idle_timeout = idle_timeout
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def create(self, components, results, calculate):
+        session = LiveSession(uuid.uuid4().hex, components, results, calculate, self.debounce,
+                              self.max_delay, self.history, self.idle_timeout, on_close=self._forget)
+        with self._lock:
+            self._sessions[session.id] = session
+            evicted = list(self._sessions.values())[:-self.max_sessions]
+        for old in evicted:
+            old.close()
+        return session
+
+    def get(self, session_id):
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def _forget(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+In-process metrics for the MIL-HDBK-217F Reliability Prediction backend
+Thread-safe counters, gauges and histograms rendered in Prometheus text format
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from flask import g, request
+
+# Request latency buckets in seconds
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(labelnames, labelvalues, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Monotonic counter, optionally split by label values"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, labels=()):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels=()):
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def total(self):
+        with self._lock:
+            return sum(self._values.values())
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in sorted(items):
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+
+    kind = 'gauge'
+
+    def dec(self, amount=1, labels=()):
+        self.inc(-amount, labels)
+
+    def set(self, value, labels=()):
+        with self._lock:
+            self._values[labels] = value
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by label values"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, labels=()):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def samples(self):
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        for labels, series in sorted(items):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                yield f'{self.name}_bucket', _format_labels(self.labelnames, labels, le), cumulative
+            yield f'{self.name}_sum', _format_labels(self.labelnames, labels), series[-1]
+            yield f'{self.name}_count', _format_labels(self.labelnames, labels), cumulative
+
+class MetricsRegistry:
+    """Collection of metrics plus cache statistics providers"""
+
+    def __init__(self):
+        self._metrics = []
+        self._caches = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self.register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def register_cache(self, name, stats_func):
+        """Expose a cache's hit ratio; stats_func() returns (hits, misses)"""
+        with self._lock:
+            self._caches[name] = stats_func
+
+    def render(self):
+        """Render all metrics in Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics)
+            caches = sorted(self._caches.items())
+
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.help_text}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {_format_value(value)}')
+
+        if caches:
+            stats = [(name, func()) for name, func in caches]
+            cache_metrics = (
+                ('reliability_cache_hits_total', 'counter',
+                 'Lookups answered by the cache; for result_cache, memory, disk and coalesced responses', 0),
+                ('reliability_cache_misses_total', 'counter',
+                 'Lookups the cache could not answer: computed values, or unknown and expired result ids', 1),
+            )
+            for metric_name, kind, help_text, position in cache_metrics:
+                lines.append(f'# HELP {metric_name} {help_text}')
+                lines.append(f'# TYPE {metric_name} {kind}')
+                for name, values in stats:
+                    lines.append(f'{metric_name}{{cache="{_escape(name)}"}} {values[position]}')
+
+            lines.append('# HELP reliability_cache_hit_ratio Share of cache lookups that were hits')
+            lines.append('# TYPE reliability_cache_hit_ratio gauge')
+            for name, (hits, misses) in stats:
+                ratio = hits / (hits + misses) if hits + misses else 0.0
+                lines.append(f'reliability_cache_hit_ratio{{cache="{_escape(name)}"}} {_format_value(round(ratio, 6))}')
+
+        return '\n'.join(lines) + '\n'
+
+registry = MetricsRegistry()
+
+REQUESTS = registry.counter(
+    'reliability_http_requests_total', 'HTTP requests by route, method and status',
+    ('route', 'method', 'status'))
+REQUEST_LATENCY = registry.histogram(
+    'reliability_http_request_duration_seconds', 'HTTP request latency by route',
+    ('route', 'method'))
+IN_FLIGHT = registry.gauge(
+    'reliability_http_requests_in_flight', 'HTTP requests currently being processed')
+COMPONENTS_CALCULATED = registry.counter(
+    'reliability_components_calculated_total',
+    'Components evaluated by the engine (responses served from the result cache are not counted)',
+    ('component_type',))
+UNIQUE_EVALUATIONS = registry.counter(
+    'reliability_unique_evaluations_total', 'Distinct component parameter sets evaluated by the engine')
+RESULT_CACHE_LOOKUPS = registry.counter(
+    'reliability_result_cache_lookups_total',
+    '/api/calculate responses by result cache source: memory, disk, coalesced or calculated', ('source',))
+IMPORT_BYTES = registry.counter(
+    'reliability_import_bytes_total', 'Bytes of Excel workbooks received by /api/import/excel')
+EXPORT_BYTES = registry.counter(
+    'reliability_export_bytes_total', 'Bytes of Excel workbooks produced by /api/export/excel')
+
+# Rows answered from an identical parameter set count as hits
+registry.register_cache('component_dedup', lambda: (
+    COMPONENTS_CALCULATED.total() - UNIQUE_EVALUATIONS.total(), UNIQUE_EVALUATIONS.total()))
+
+def init_app(app):
+    """Register the request hooks that feed the request metrics"""
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_start = time.perf_counter()
+        IN_FLIGHT.inc()
+
+    @app.after_request
+    def record_request_metrics(response):
+        start = g.get('metrics_start')
+        if start is not None:
+            # Label by URL rule, not raw path, to keep the series count bounded
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            REQUESTS.inc(labels=(route, request.method, str(response.status_code)))
+            REQUEST_LATENCY.observe(time.perf_counter() - start, labels=(route, request.method))
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(exc):
+        if g.pop('metrics_start', None) is not None:
+            IN_FLIGHT.dec()
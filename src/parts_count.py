@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Parts-count quick estimate for early-stage BOMs
+λ = Σ N × λ_g × π_Q per (family, style, quality, environment) group, in the
+spirit of MIL-HDBK-217F Appendix A.
+"""
+
+import math
+from engine import STYLE_FIELDS
+
+def group_key(component, default_quality, default_environment):
+    """(family, style, quality, environment) of a BOM line"""
+    component_type = component.get('component_type', 'capacitor')
+    if component_type not in STYLE_FIELDS:
+        component_type = 'capacitor'
+    return (
+        component_type,
+        component.get(STYLE_FIELDS[component_type]),
+        component.get('quality_level') or default_quality[component_type],
+        component.get('environment') or default_environment,
+    )
+
+def line_quantity(component):
+    quantity = component.get('quantity')
+    return 1 if quantity is None else int(quantity)
+
+def aggregate_parts(components, default_quality, default_environment):
+    """
+    Count parts per group in a single pass
+
+    `default_quality` maps each family to the quality used when a line has
+    none. A line's `quantity` (default 1) is added to its group.
+    Returns {group key: quantity} in first-seen order.
+    """
+    # Count the raw field combinations first and normalize each distinct one
+    # afterwards, which keeps the per-line work to a few dict lookups
+    raw_counts = {}
+    for component in components:
+        get = component.get
+        raw = (get('component_type', 'capacitor'), get('style'), get('inductor_type'),
+               get('quality_level'), get('environment'))
+        quantity = get('quantity')
+        raw_counts[raw] = raw_counts.get(raw, 0) + (1 if quantity is None else int(quantity))
+
+    groups = {}
+    for (component_type, style, inductor_type, quality, environment), quantity in raw_counts.items():
+        key = group_key({
+            'component_type': component_type,
+            'style': style,
+            'inductor_type': inductor_type,
+            'quality_level': quality,
+            'environment': environment,
+        }, default_quality, default_environment)
+        groups[key] = groups.get(key, 0) + quantity
+    return groups
+
+def estimate(groups, generic_rate):
+    """
+    Parts-count λ for aggregated groups
+
+    generic_rate(component_type, style, quality, environment) returns
+    (λ_g, π_Q) for one part of the group and is called once per group.
+    Returns (lines, total λ).
+    """
+    lines = []
+    for (component_type, style, quality, environment), quantity in groups.items():
+        lambda_g, pi_q = generic_rate(component_type, style, quality, environment)
+        lines.append({
+            'component_type': component_type,
+            'style': style,
+            'quality_level': quality,
+            'environment': environment,
+            'quantity': quantity,
+            'lambda_g': lambda_g,
+            'pi_q': pi_q,
+            'lambda_p': round(quantity * lambda_g * pi_q, 10)
+        })
+    return lines, math.fsum(line['lambda_p'] for line in lines)
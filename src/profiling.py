@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+On-demand request profiling for the MIL-HDBK-217F Reliability Prediction backend
+Once armed, profiles the next N matching requests with cProfile plus a stack
+sampler and writes pstats and collapsed-stack (flamegraph-ready) files.
+"""
+
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter as StackCounter
+from datetime import datetime
+from flask import g, request
+from config import Config
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval"""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name='profile-sampler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = StackCounter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+class ProfileSession:
+    """cProfile plus stack sampling for a single request"""
+
+    def __init__(self, route, sample_interval):
+        self.route = route
+        self.started = time.perf_counter()
+        self.profiler = cProfile.Profile()
+        self.sampler = StackSampler(threading.get_ident(), sample_interval)
+        self.sampler.start()
+        self.profiler.enable()
+
+    def finish(self, output_dir, sequence):
+        self.profiler.disable()
+        self.sampler.stop()
+        elapsed = time.perf_counter() - self.started
+
+        os.makedirs(output_dir, exist_ok=True)
+        route_slug = self.route.strip('/').replace('/', '_') or 'root'
+        prefix = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{route_slug}_{sequence}"
+        pstats_path = os.path.join(output_dir, f'{prefix}.prof')
+        collapsed_path = os.path.join(output_dir, f'{prefix}.collapsed')
+
+        self.profiler.dump_stats(pstats_path)
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.sampler.stacks.items()):
+                f.write(f'{stack} {count}\n')
+
+        return {
+            'route': self.route,
+            'duration_ms': round(elapsed * 1000, 3),
+            'samples': sum(self.sampler.stacks.values()),
+            'pstats': pstats_path,
+            'collapsed': collapsed_path
+        }
+
+class ProfileController:
+    """Arms profiling for the next N requests to the profiled routes"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.remaining = 0
+        self.routes = tuple(Config.PROFILE_ROUTES)
+        self.sequence = 0
+        self.captures = []
+
+    def arm(self, count, routes=None):
+        unknown = [route for route in routes or () if route not in Config.PROFILE_ROUTES]
+        if unknown:
+            raise ValueError(f"Routes cannot be profiled: {', '.join(unknown)}")
+        with self._lock:
+            self.remaining = max(0, int(count))
+            self.routes = tuple(routes or Config.PROFILE_ROUTES)
+        return self.status()
+
+    def disarm(self):
+        with self._lock:
+            self.remaining = 0
+        return self.status()
+
+    def claim(self, route):
+        """Reserve one profile slot for this request, if armed for its route"""
+        with self._lock:
+            if self.remaining <= 0 or route not in self.routes:
+                return None
+            self.remaining -= 1
+            self.sequence += 1
+            return self.sequence
+
+    def record(self, capture):
+        with self._lock:
+            self.captures.append(capture)
+            del self.captures[:-Config.PROFILE_HISTORY]
+
+    def status(self):
+        with self._lock:
+            return {
+                'armed': self.remaining > 0,
+                'remaining': self.remaining,
+                'routes': list(self.routes),
+                'output_dir': Config.PROFILE_OUTPUT_DIR,
+                'captures': list(self.captures)
+            }
+
+controller = ProfileController()
+
+def init_app(app):
+    """Register the request hooks that start and finish armed profiles"""
+
+    @app.before_request
+    def start_profile():
+        # Unlocked read keeps the disarmed path to a single attribute check
+        if not controller.remaining:
+            return
+        route = request.url_rule.rule if request.url_rule else None
+        sequence = controller.claim(route)
+        if sequence is not None:
+            g.profile_sequence = sequence
+            g.profile_session = ProfileSession(route, Config.PROFILE_SAMPLE_INTERVAL)
+
+    @app.teardown_request
+    def finish_profile(exc):
+        session = g.pop('profile_session', None)
+        if session is None:
+            return
+        try:
+            controller.record(session.finish(Config.PROFILE_OUTPUT_DIR, g.pop('profile_sequence', 0)))
+        except OSError as e:
+            print(f"Profile Error: {str(e)}")
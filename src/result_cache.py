@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of calculated responses
+A response is keyed by a hash of the canonical request, the digest of the
+factor tables it was calculated against and the application version, so a
+repeated Calculate or a second user opening the same project gets the
+stored result, and an upgrade never serves λ from older calculation code. Identical requests arriving while one is being
+calculated wait for it instead of calculating it again. An optional SQLite
+file keeps responses across restarts.
+"""
+
+import hashlib
+import json
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future
+
+def request_key(payload, dataset_digest, version=''):
+    """
+    Hex digest of a JSON request, the factor tables and the code it is calculated with
+
+    dataset_digest is the catalog's table digest, not its version label: a
+    label can stay the same while the tables are edited. version is the
+    application version, since responses on disk outlive an upgrade.
+    """
+    canonical = json.dumps([version, dataset_digest, payload], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def _plain(value):
+    # Result records serialize as their plain dicts
+    to_dict = getattr(value, 'to_dict', None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    return to_dict()
+
+class DiskTier:
+    """
+    Compressed responses in a SQLite file
+
+    Writes go through a background thread so storing a large response never
+    delays the request. Entries not read for `ttl` seconds are ignored and
+    the least recently read ones are pruned beyond `max_entries`.
+    """
+
+    def __init__(self, path, max_entries, ttl):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                dataset_version TEXT,
+                row_count INTEGER,
+                created REAL,
+                accessed REAL,
+                body BLOB
+            )
+        ''')
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._run, name='result-cache-writer', daemon=True)
+        self._writer.start()
+
+    def get(self, key):
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute('SELECT accessed, body FROM results WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[0] > self.ttl:
+                self._queue.put(('delete', key))
+                return None
+            self._queue.put(('touch', key, now))
+            return json.loads(zlib.decompress(row[1]))
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            print(f"Result cache read failed: {e}")
+            return None
+
+    def put(self, key, value):
+        self._queue.put(('put', key, value))
+
+    def flush(self):
+        """Wait until queued writes are in the file"""
+        self._queue.join()
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def _run(self):
+        while True:
+            task = self._queue.get()
+            try:
+                self._write(task)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                print(f"Result cache write failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, task):
+        if task[0] == 'put':
+            _, key, value = task
+            body = zlib.compress(json.dumps(value, default=_plain, separators=(',', ':')).encode('utf-8'), 1)
+            now = time.time()
+            with self._lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, value.get('dataset_version'), len(value['components']), now, now, body))
+                self._conn.execute('''
+                    DELETE FROM results WHERE key IN (
+                        SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)
+                ''', (self.max_entries,))
+                self._conn.commit()
+        elif task[0] == 'touch':
+            with self._lock:
+                self._conn.execute('UPDATE results SET accessed = ? WHERE key = ?', (task[2], task[1]))
+                self._conn.commit()
+        elif task[0] == 'delete':
+            with self._lock:
+                self._conn.execute('DELETE FROM results WHERE key = ?', (task[1],))
+                self._conn.commit()
+
+def open_disk_tier(path, max_entries, ttl):
+    """DiskTier at `path`, or None when no path is set or the file can't be opened"""
+    if not path:
+        return None
+    try:
+        return DiskTier(path, max_entries, ttl)
+    except sqlite3.Error as e:
+        print(f"Result cache file {path} unavailable, caching in memory only: {e}")
+        return None
+
+class ResultCache:
+    """
+    Calculated responses by request key, with single-flight calculation
+
+    The memory tier is an LRU bounded by `max_entries` responses and
+    `max_rows` components in total; responses not read for `ttl` seconds
+    expire. A memory miss falls back to `disk` (a DiskTier) when given, and
+    every newly calculated response is written to it. Every key includes
+    `version`, the application version. Cached responses are shared between
+    requests and must not be modified.
+    """
+
+    ALIAS_LIMIT = 256
+
+    def __init__(self, max_entries, max_rows, ttl, disk=None, version=''):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self.disk = disk
+        self.version = version
+        self._entries = OrderedDict()  # key -> (response, rows, last access)
+        self._aliases = OrderedDict()  # digest of a raw request body -> key
+        self._rows = 0
+        self._inflight = {}  # key -> Future of the response being calculated
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.disk_hits = 0
+
+    def key(self, body, payload, dataset_digest):
+        """
+        request_key() of a parsed request, remembered by its raw body
+
+        Encoding a large request canonically costs about as much as parsing
+        it, so a body seen before (a double click, a reopened project) is
+        looked up by a plain digest of its bytes instead.
+        """
+        digest = hashlib.sha256(f'{self.version}\n{dataset_digest}\n'.encode('utf-8') + body).hexdigest()
+        with self._lock:
+            key = self._aliases.get(digest)
+            if key is not None:
+                self._aliases.move_to_end(digest)
+                return key
+        key = request_key(payload, dataset_digest, self.version)
+        with self._lock:
+            self._aliases[digest] = key
+            while len(self._aliases) > self.ALIAS_LIMIT:
+                self._aliases.popitem(last=False)
+        return key
+
+    def get_or_calculate(self, key, calculate):
+        """
+        (response, source) for a request key
+
+        source is 'memory', 'disk', 'coalesced' (waited for an identical
+        request already calculating) or 'calculated'. An exception raised by
+        calculate() is raised in every request waiting on it.
+        """
+        with self._lock:
+            response = self._lookup(key)
+            if response is not None:
+                self.hits += 1
+                return response, 'memory'
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if not leader:
+            response = future.result()
+            with self._lock:
+                self.coalesced += 1
+            return response, 'coalesced'
+
+        try:
+            response = self.disk.get(key) if self.disk is not None else None
+            if response is not None:
+                source = 'disk'
+            else:
+                response = calculate()
+                source = 'calculated'
+                if self.disk is not None:
+                    self.disk.put(key, response)
+            with self._lock:
+                if source == 'disk':
+                    self.disk_hits += 1
+                else:
+                    self.misses += 1
+                self._store(key, response)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(response)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return response, source
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        now = time.monotonic()
+        if now - entry[2] > self.ttl:
+            self._remove(key)
+            return None
+        self._entries[key] = (entry[0], entry[1], now)
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _store(self, key, response):
+        if self.max_entries <= 0:
+            return
+        self._remove(key)
+        rows = len(response['components'])
+        self._entries[key] = (response, rows, time.monotonic())
+        self._rows += rows
+        now = time.monotonic()
+        for old_key, (_, _, last_access) in list(self._entries.items()):
+            if now - last_access > self.ttl:
+                self._remove(old_key)
+        # Always keep the newest response, even when it alone exceeds max_rows
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._rows > self.max_rows):
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._rows -= entry[1]
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._rows = 0
+
+    def cache_stats(self):
+        """(hits, misses): responses served without calculating, and calculations"""
+        return self.hits + self.disk_hits + self.coalesced, self.misses
+
+    def info(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries), 'rows': self._rows, 'max_entries': self.max_entries,
+                'max_rows': self.max_rows, 'ttl': self.ttl, 'hits': self.hits, 'disk_hits': self.disk_hits,
+                'coalesced': self.coalesced, 'misses': self.misses,
+                'disk_path': self.disk.path if self.disk is not None else None
+            }
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Server-side result sets for paging large calculations
+/api/calculate keeps each finished result set under a result id; the results
+table then pulls sorted and filtered windows of it instead of every row.
+"""
+
+import bisect
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+# Orders a window can be sorted by
+SORT_KEYS = ('index', 'lambda_p', 'name', 'style')
+
+class ResultSet:
+    """
+    One finished calculation with its sort orders
+
+    The λ_P order is built up front; style and type columns and the name and
+    style orders are built on first use. Recently used filtered orders are kept, so scrolling through the
+    same view only slices a list.
+    """
+
+    FILTER_CACHE_SIZE = 8
+
+    def __init__(self, results, total_lambda_p, dataset_version):
+        self.results = results
+        self.total_lambda_p = total_lambda_p
+        self.dataset_version = dataset_version
+        self.key = None  # content key the set is shared under, if any
+        self.refs = 0  # result ids the store holds it under
+        self.lambdas = [result['lambda_p'] for result in results]
+        self._styles = None
+        self._types = None
+        self._orders = {'lambda_p': sorted(range(len(results)), key=self.lambdas.__getitem__)}
+        self._sorted_lambdas = [self.lambdas[i] for i in self._orders['lambda_p']]
+        self._filtered = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.results)
+
+    @property
+    def styles(self):
+        if self._styles is None:
+            self._styles = [result.get('style') for result in self.results]
+        return self._styles
+
+    @property
+    def types(self):
+        if self._types is None:
+            self._types = [result.get('component_type', 'capacitor') for result in self.results]
+        return self._types
+
+    def order(self, sort):
+        """Row indexes in ascending `sort` order (ties keep input order)"""
+        if sort == 'index':
+            return range(len(self.results))
+        order = self._orders.get(sort)
+        if order is None:
+            if sort == 'name':
+                names = [str(result.get('name') or '') for result in self.results]
+                order = sorted(range(len(names)), key=names.__getitem__)
+            elif sort == 'style':
+                styles = [style or '' for style in self.styles]
+                order = sorted(range(len(styles)), key=styles.__getitem__)
+            else:
+                raise ValueError(f"Unknown sort key '{sort}' (use {', '.join(SORT_KEYS)})")
+            self._orders[sort] = order
+        return order
+
+    def _matching(self, sort, descending, style, component_type, min_lambda, max_lambda):
+        key = (sort, descending, style, component_type, min_lambda, max_lambda)
+        with self._lock:
+            rows = self._filtered.get(key)
+            if rows is not None:
+                self._filtered.move_to_end(key)
+                return rows
+
+        if sort == 'lambda_p':
+            # The λ range is a slice of the λ order
+            order = self._orders['lambda_p']
+            start = 0 if min_lambda is None else bisect.bisect_left(self._sorted_lambdas, min_lambda)
+            stop = len(order) if max_lambda is None else bisect.bisect_right(self._sorted_lambdas, max_lambda)
+            rows = order[start:stop]
+        else:
+            rows = self.order(sort)
+            if min_lambda is not None or max_lambda is not None:
+                low = float('-inf') if min_lambda is None else min_lambda
+                high = float('inf') if max_lambda is None else max_lambda
+                lambdas = self.lambdas
+                rows = [i for i in rows if low <= lambdas[i] <= high]
+        if style is not None:
+            styles = self.styles
+            rows = [i for i in rows if styles[i] == style]
+        if component_type is not None:
+            types = self.types
+            rows = [i for i in rows if types[i] == component_type]
+        if descending:
+            rows = rows[::-1]
+
+        with self._lock:
+            self._filtered[key] = rows
+            while len(self._filtered) > self.FILTER_CACHE_SIZE:
+                self._filtered.popitem(last=False)
+        return rows
+
+    def window(self, result_id, offset=0, limit=100, sort='index', descending=False, style=None,
+               component_type=None, min_lambda=None, max_lambda=None):
+        """Rows offset..offset+limit of the sorted, filtered view, for the set stored as result_id"""
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{sort}' (use {', '.join(SORT_KEYS)})")
+        rows = self._matching(sort, descending, style, component_type, min_lambda, max_lambda)
+        indexes = rows[offset:offset + limit]
+        return {
+            'result_id': result_id,
+            'row_count': len(self.results),
+            'matching_count': len(rows),
+            'offset': offset,
+            'limit': limit,
+            'indexes': list(indexes),
+            'components': [self.results[i] for i in indexes],
+            'total_lambda_p': self.total_lambda_p,
+            'dataset_version': self.dataset_version
+        }
+
+class ResultStore:
+    """
+    Bounded in-memory store of result sets
+
+    Every stored response gets its own result id. Least recently used ids
+    are evicted beyond `max_sets` ids or `max_rows` rows in total (a set
+    shared by several ids counts once); ids not read for `ttl` seconds
+    expire.
+    """
+
+    def __init__(self, max_sets, max_rows, ttl):
+        self.max_sets = max_sets
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self._sets = OrderedDict()  # id -> (ResultSet, last access)
+        self._keyed = {}  # content key -> ResultSet calculated for it
+        self._rows = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def put(self, results, total_lambda_p, dataset_version, key=None):
+        """
+        Store a result set under a new id; returns (result id, ResultSet)
+
+        With a content `key` (a result cache key), a set already stored for
+        the same key is shared instead of built again: the new id gets its
+        rows and sort orders, and deleting one id leaves the others intact.
+        """
+        result_set = None
+        if key is not None:
+            with self._lock:
+                result_set = self._keyed.get(key)
+        if result_set is None:
+            result_set = ResultSet(results, total_lambda_p, dataset_version)
+        result_id = uuid.uuid4().hex
+        with self._lock:
+            if key is not None:
+                # An identical request may have stored its set meanwhile
+                result_set = self._keyed.setdefault(key, result_set)
+                result_set.key = key
+            self._sets[result_id] = (result_set, time.monotonic())
+            if result_set.refs == 0:
+                self._rows += len(result_set)
+            result_set.refs += 1
+            self._evict()
+        return result_id, result_set
+
+    def get(self, result_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sets.get(result_id)
+            if entry is None or now - entry[1] > self.ttl:
+                if entry is not None:
+                    self._remove(result_id)
+                self.misses += 1
+                return None
+            self._sets[result_id] = (entry[0], now)
+            self._sets.move_to_end(result_id)
+            self.hits += 1
+            return entry[0]
+
+    def delete(self, result_id):
+        with self._lock:
+            return self._remove(result_id) is not None
+
+    def _remove(self, result_id):
+        entry = self._sets.pop(result_id, None)
+        if entry is not None:
+            result_set = entry[0]
+            result_set.refs -= 1
+            if result_set.refs == 0:
+                self._rows -= len(result_set)
+                if result_set.key is not None and self._keyed.get(result_set.key) is result_set:
+                    del self._keyed[result_set.key]
+        return entry
+
+    def _evict(self):
+        now = time.monotonic()
+        for result_id, (_, last_access) in list(self._sets.items()):
+            if now - last_access > self.ttl:
+                self._remove(result_id)
+        # Always keep the newest set, even when it alone exceeds max_rows
+        while len(self._sets) > 1 and (len(self._sets) > self.max_sets or self._rows > self.max_rows):
+            self._remove(next(iter(self._sets)))
+
+    def cache_stats(self):
+        """(hits, misses) of result id lookups"""
+        return self.hits, self.misses
+
+    def info(self):
+        with self._lock:
+            return {'sets': len(self._sets), 'rows': self._rows, 'max_sets': self.max_sets,
+                    'max_rows': self.max_rows, 'ttl': self.ttl}
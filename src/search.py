@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Full-text search over handbook styles and the part library
+Uses SQLite FTS5 indexes with prefix matching and bm25 ranking
+"""
+
+import json
+import re
+import threading
+from datetime import datetime
+
+# Default parameters remembered per part; temperature and environment are
+# project-wide settings, so they are not part of a part's defaults
+LIBRARY_PARAMETER_FIELDS = {
+    'capacitor': ('capacitance', 'voltage_stress', 'series_resistance', 'quality_level'),
+    'resistor': ('watts', 'power_stress', 'quality_level'),
+    'inductor': ('quality_level',),
+}
+
+SEARCH_SCHEMA = [
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS style_search USING fts5(
+        component_type UNINDEXED,
+        style,
+        spec_number,
+        description,
+        lambda_b UNINDEXED,
+        prefix = '2 3 4',
+        tokenize = 'unicode61'
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS part_library (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        component_type TEXT NOT NULL,
+        manufacturer TEXT NOT NULL DEFAULT '',
+        part_number TEXT NOT NULL,
+        style TEXT,
+        description TEXT,
+        parameters TEXT,
+        source_project TEXT,
+        usage_count INTEGER NOT NULL DEFAULT 1,
+        created_at TIMESTAMP DEFAULT (datetime('now', '+7 hours')),
+        updated_at TIMESTAMP DEFAULT (datetime('now', '+7 hours')),
+        UNIQUE (component_type, manufacturer, part_number)
+    )
+    ''',
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS part_library_search USING fts5(
+        component_type,
+        manufacturer,
+        part_number,
+        style,
+        description,
+        content = 'part_library',
+        content_rowid = 'id',
+        prefix = '1 2 3 4 5 6',
+        tokenize = 'unicode61'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS part_library_ai AFTER INSERT ON part_library BEGIN
+        INSERT INTO part_library_search (rowid, component_type, manufacturer, part_number, style, description)
+        VALUES (new.id, new.component_type, new.manufacturer, new.part_number, new.style, new.description);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS part_library_ad AFTER DELETE ON part_library BEGIN
+        INSERT INTO part_library_search (part_library_search, rowid, component_type, manufacturer, part_number, style, description)
+        VALUES ('delete', old.id, old.component_type, old.manufacturer, old.part_number, old.style, old.description);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS part_library_au AFTER UPDATE ON part_library BEGIN
+        INSERT INTO part_library_search (part_library_search, rowid, component_type, manufacturer, part_number, style, description)
+        VALUES ('delete', old.id, old.component_type, old.manufacturer, old.part_number, old.style, old.description);
+        INSERT INTO part_library_search (rowid, component_type, manufacturer, part_number, style, description)
+        VALUES (new.id, new.component_type, new.manufacturer, new.part_number, new.style, new.description);
+    END
+    ''',
+]
+
+_schema_lock = threading.Lock()
+_indexed_datasets = {}  # database path -> dataset digest its style index was built from
+_NOT_INDEXED = object()
+
+def ensure_search_schema(conn, database_path, dataset_digest=None):
+    """
+    Create the search tables once per database and index the handbook styles
+
+    The style index is rebuilt whenever dataset_digest (the factor catalog's
+    digest) differs from the one it was built from, so styles added or
+    edited by a dataset reload are searchable straight away.
+    """
+    if _indexed_datasets.get(database_path, _NOT_INDEXED) == dataset_digest:
+        return
+    with _schema_lock:
+        if _indexed_datasets.get(database_path, _NOT_INDEXED) == dataset_digest:
+            return
+        for statement in SEARCH_SCHEMA:
+            conn.execute(statement)
+        rebuild_style_index(conn)
+        conn.commit()
+        _indexed_datasets[database_path] = dataset_digest
+
+def rebuild_style_index(conn):
+    """Re-index capacitor, resistor and inductor styles from the handbook tables"""
+    conn.execute('DELETE FROM style_search')
+    conn.execute('''
+        INSERT INTO style_search (component_type, style, spec_number, description, lambda_b)
+        SELECT 'capacitor', style, spec_number, description, lambda_b FROM capacitor_styles
+    ''')
+    conn.execute('''
+        INSERT INTO style_search (component_type, style, spec_number, description, lambda_b)
+        SELECT 'resistor', style, spec_number, description, lambda_b FROM resistor_styles
+    ''')
+    conn.execute('''
+        INSERT INTO style_search (component_type, style, spec_number, description, lambda_b)
+        SELECT 'inductor', inductor_type, '', inductor_type, lambda_b FROM inductor_styles
+    ''')
+
+# Part library columns searched by free text, with the weights used to rank
+# candidates of queries too broad for bm25
+PART_SEARCH_WEIGHTS = (
+    ('part_number', 8),
+    ('manufacturer', 4),
+    ('style', 2),
+    ('description', 1),
+)
+
+_TERM_PATTERN = re.compile(r'\w+')
+
+def query_terms(text):
+    return [term.lower() for term in _TERM_PATTERN.findall(text or '')]
+
+def build_match_query(terms, columns=None):
+    """Turn query terms into an FTS5 query where every term is a prefix match"""
+    match = ' '.join(f'"{term}"*' for term in terms)
+    if match and columns:
+        match = '{' + ' '.join(columns) + '} : (' + match + ')'
+    return match
+
+def search_styles(conn, query, component_type=None, limit=20):
+    """Rank handbook styles by bm25 (the index only holds a few dozen rows)"""
+    match = build_match_query(query_terms(query))
+    if not match:
+        return []
+    sql = '''
+        SELECT component_type, style, spec_number, description, lambda_b
+        FROM style_search
+        WHERE style_search MATCH ?
+    '''
+    params = [match]
+    if component_type:
+        sql += ' AND component_type = ?'
+        params.append(component_type)
+    sql += ' ORDER BY rank LIMIT ?'
+    params.append(limit)
+    return [dict(row) for row in conn.execute(sql, params).fetchall()]
+
+def _weighted_score(part, terms):
+    columns = [(query_terms(part.get(column)), weight) for column, weight in PART_SEARCH_WEIGHTS]
+    score = 0
+    for term in terms:
+        best = 0
+        for tokens, weight in columns:
+            for token in tokens:
+                if token == term:
+                    best = max(best, weight * 2)
+                elif token.startswith(term):
+                    best = max(best, weight)
+        score += best
+    return score
+
+def search_parts(conn, query, component_type=None, limit=20, candidates=64):
+    """
+    Rank part library matches for a prefix query
+    
+    Matches are collected in index order, at most `candidates` of them. If the
+    query is selective enough to fit, they are ranked by bm25. Broader queries
+    (a letter or two against a large library) would make bm25 score every match,
+    so the collected candidates are ranked by a field-weighted score instead and
+    the result is flagged as truncated.
+    Returns (parts, truncated).
+    """
+    terms = query_terms(query)
+    match = build_match_query(terms, [column for column, _ in PART_SEARCH_WEIGHTS])
+    if not match:
+        return [], False
+    if component_type:
+        escaped_type = component_type.replace('"', '""')
+        match = f'component_type : "{escaped_type}" AND {match}'
+
+    columns = '''p.component_type, p.manufacturer, p.part_number, p.style,
+                  p.description, p.parameters, p.usage_count, p.updated_at'''
+    rows = conn.execute(f'''
+        SELECT {columns}
+        FROM part_library_search AS s
+        JOIN part_library AS p ON p.id = s.rowid
+        WHERE part_library_search MATCH ?
+        LIMIT ?
+    ''', (match, candidates + 1)).fetchall()
+
+    truncated = len(rows) > candidates
+    if truncated:
+        parts = [dict(row) for row in rows[:candidates]]
+        parts.sort(key=lambda part: (-_weighted_score(part, terms), -part['usage_count']))
+        parts = parts[:limit]
+    else:
+        rows = conn.execute(f'''
+            SELECT {columns}
+            FROM part_library_search AS s
+            JOIN part_library AS p ON p.id = s.rowid
+            WHERE part_library_search MATCH ?
+            ORDER BY s.rank LIMIT ?
+        ''', (match, limit)).fetchall()
+        parts = [dict(row) for row in rows]
+
+    for part in parts:
+        part['parameters'] = json.loads(part['parameters']) if part['parameters'] else {}
+    return parts, truncated
+
+def upsert_library_parts(conn, components, source_project=None):
+    """Remember the parts used in a project; returns the number of parts stored"""
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    rows = []
+    for component in components:
+        part_number = str(component.get('part_number') or '').strip()
+        if not part_number:
+            continue
+        component_type = component.get('component_type', 'capacitor')
+        if component_type not in LIBRARY_PARAMETER_FIELDS:
+            continue
+
+        style = component.get('inductor_type') if component_type == 'inductor' else component.get('style')
+        parameters = {
+            field: component[field]
+            for field in LIBRARY_PARAMETER_FIELDS[component_type]
+            if component.get(field) not in (None, '')
+        }
+        rows.append((
+            component_type,
+            str(component.get('manufacturer') or '').strip(),
+            part_number,
+            style,
+            component.get('description', ''),
+            json.dumps(parameters),
+            source_project,
+            now,
+        ))
+
+    conn.executemany('''
+        INSERT INTO part_library
+            (component_type, manufacturer, part_number, style, description, parameters, source_project, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (component_type, manufacturer, part_number) DO UPDATE SET
+            style = excluded.style,
+            description = excluded.description,
+            parameters = excluded.parameters,
+            source_project = excluded.source_project,
+            usage_count = part_library.usage_count + 1,
+            updated_at = excluded.updated_at
+    ''', rows)
+    conn.commit()
+    return len(rows)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Startup time report for the MIL-HDBK-217F Reliability Prediction backend
+Records how long imports, database preparation and binding the listening
+socket took, optionally with -X importtime style per-module import times,
+and compares time-to-listening against a budget.
+"""
+
+import time
+
+# Imported first by app.py, so this is as close to process start as Python code gets
+STARTED = time.perf_counter()
+
+import builtins
+import json
+import sys
+from datetime import datetime
+from config import Config
+
+# Modules that must not be loaded before the first request that needs them
+DEFERRED_MODULES = ('openpyxl',)
+
+class ImportTimer:
+    """Cumulative time of each first-time import, like -X importtime's cumulative column"""
+
+    def __init__(self):
+        self.times = {}
+        self._import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._import(name, globals, locals, fromlist, level)
+        start = time.perf_counter()
+        try:
+            return self._import(name, globals, locals, fromlist, level)
+        finally:
+            self.times.setdefault(name, time.perf_counter() - start)
+
+    def start(self):
+        self._import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def stop(self):
+        if self._import is not None:
+            builtins.__import__ = self._import
+            self._import = None
+
+    def slowest(self, n):
+        return [
+            {'module': name, 'ms': round(seconds * 1000.0, 3)}
+            for name, seconds in sorted(self.times.items(), key=lambda item: -item[1])[:n]
+        ]
+
+class StartupReport:
+    def __init__(self, budget_ms, profile_imports):
+        self.budget_ms = budget_ms
+        self.phases = []
+        self.listening_ms = None
+        self._last = STARTED
+        self.import_timer = ImportTimer() if profile_imports else None
+        if self.import_timer:
+            self.import_timer.start()
+
+    def mark(self, name):
+        """Close the phase that ran since the previous mark"""
+        now = time.perf_counter()
+        self.phases.append({'name': name, 'ms': round((now - self._last) * 1000.0, 3)})
+        self._last = now
+        if name == 'imports' and self.import_timer:
+            self.import_timer.stop()
+
+    def listening(self):
+        self.mark('listen')
+        self.listening_ms = round((time.perf_counter() - STARTED) * 1000.0, 3)
+
+    def to_dict(self):
+        report = {
+            'phases': self.phases,
+            'time_to_listening_ms': self.listening_ms,
+            'budget_ms': self.budget_ms,
+            'within_budget': None if self.listening_ms is None else self.listening_ms <= self.budget_ms,
+            'module_count': len(sys.modules),
+            'deferred_modules_loaded': {name: name in sys.modules for name in DEFERRED_MODULES},
+            'frozen': hasattr(sys, '_MEIPASS')
+        }
+        if self.import_timer:
+            report['slowest_imports'] = self.import_timer.slowest(20)
+        return report
+
+    def write(self, path):
+        report = self.to_dict()
+        report['written_at'] = datetime.now().isoformat()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+report = StartupReport(Config.STARTUP_BUDGET_MS, Config.STARTUP_PROFILE_IMPORTS)
@@ -3,6 +3,12 @@
  * Improved project-based application with better UX
  */
 
+// Larger result sets stay on the server and are paged into a scrolling table
+const RESULT_PAGE_THRESHOLD = 500;
+const RESULT_PAGE_SIZE = 200;
+const RESULT_ROW_HEIGHT = 41; // px, fixed by .results-viewport tr
+const RESULT_EXPORT_PAGE_SIZE = 5000;
+
 class EnhancedReliabilityCalculator {
   constructor() {
     this.currentProject = null;
@@ -31,7 +37,9 @@ class EnhancedReliabilityCalculator {
       inductor: 0,
     };
     this.currentResults = null;
+    this.resultView = null;
     this.collapsedComponents = new Set();
+    this.liveSession = null;
 
     this.init();
   }
@@ -144,15 +152,28 @@ class EnhancedReliabilityCalculator {
     // Global parameters change events
     const globalTempInput = document.getElementById("globalTemperature");
     if (globalTempInput) {
-      globalTempInput.addEventListener("change", () =>
-        this.updateGlobalParameters()
-      );
+      globalTempInput.addEventListener("change", () => {
+        this.updateGlobalParameters();
+        this.sendLivePatches();
+      });
     }
 
     const globalEnvSelect = document.getElementById("globalEnvironment");
     if (globalEnvSelect) {
-      globalEnvSelect.addEventListener("change", () =>
-        this.updateGlobalParameters()
+      globalEnvSelect.addEventListener("change", () => {
+        this.updateGlobalParameters();
+        this.sendLivePatches();
+      });
+    }
+
+    // Live recalculation: parameter edits are pushed once results are shown
+    const componentsContainer = document.getElementById("componentsContainer");
+    if (componentsContainer) {
+      componentsContainer.addEventListener("input", () =>
+        this.sendLivePatches()
+      );
+      componentsContainer.addEventListener("change", () =>
+        this.sendLivePatches()
       );
     }
 
@@ -409,11 +430,13 @@ class EnhancedReliabilityCalculator {
   }
 
   resetProject() {
+    this.stopLiveSession();
     this.currentProject = null;
     this.componentCounter = 0;
     this.selectedComponentType = null;
     this.globalParameters = { temperature: 25, environment: "GB" };
     this.currentResults = null;
+    this.resultView = null;
     this.collapsedComponents.clear();
 
     // Reset component counters
@@ -460,6 +483,8 @@ class EnhancedReliabilityCalculator {
   }
 
   clearWorkspace() {
+    this.stopLiveSession();
+
     // Clear components container
     const container = document.getElementById("componentsContainer");
     if (container) {
@@ -1072,6 +1097,8 @@ class EnhancedReliabilityCalculator {
       component.style.opacity = "0";
       component.style.transform = "translateY(-20px)";
 
+      this.stopLiveSession();
+
       setTimeout(() => {
         component.remove();
         this.collapsedComponents.delete(componentId);
@@ -1332,13 +1359,23 @@ class EnhancedReliabilityCalculator {
     this.showLoading(true);
     this.hideResults();
 
+    // Large BOMs get only the first window of rows; the rest is paged in on scroll
+    const paged = components.length > RESULT_PAGE_THRESHOLD;
+
     try {
       const response = await fetch("/api/calculate", {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
         },
-        body: JSON.stringify({ components }),
+        body: JSON.stringify({
+          components,
+          factor_overrides: this.currentProject?.factorOverrides,
+          ...(paged && {
+            summary_only: true,
+            window: { limit: RESULT_PAGE_SIZE },
+          }),
+        }),
       });
 
       if (!response.ok) {
@@ -1348,7 +1385,12 @@ class EnhancedReliabilityCalculator {
 
       const results = await response.json();
       this.currentResults = results;
-      this.displayResults(results);
+      if (paged) {
+        this.displayPagedResults(results);
+      } else {
+        this.displayResults(results);
+      }
+      this.startLiveSession(components);
 
       // Update project with results and components
       if (this.currentProject) {
@@ -1366,6 +1408,126 @@ class EnhancedReliabilityCalculator {
     }
   }
 
+  // Live recalculation
+  getComponentIds() {
+    return Array.from(document.querySelectorAll(".component-form")).map(
+      (form) => form.dataset.componentId
+    );
+  }
+
+  async startLiveSession(components) {
+    this.stopLiveSession();
+
+    const ids = this.getComponentIds();
+    try {
+      const response = await fetch("/api/live", {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+        },
+        body: JSON.stringify({
+          components: components.map((component, index) => ({
+            ...component,
+            id: ids[index],
+          })),
+          factor_overrides: this.currentProject?.factorOverrides,
+        }),
+      });
+      if (!response.ok) return;
+
+      const session = await response.json();
+      const snapshots = {};
+      const indexes = {};
+      ids.forEach((id, index) => {
+        snapshots[id] = { ...components[index] };
+        indexes[id] = index;
+      });
+
+      const source = new EventSource(`/api/live/${session.session_id}/events`);
+      source.addEventListener("update", (event) =>
+        this.applyLiveUpdate(JSON.parse(event.data))
+      );
+      source.addEventListener("closed", () => this.stopLiveSession());
+
+      this.liveSession = { id: session.session_id, source, snapshots, indexes };
+    } catch (error) {
+      console.warn("Live recalculation unavailable:", error);
+    }
+  }
+
+  stopLiveSession() {
+    if (!this.liveSession) return;
+
+    const { id, source } = this.liveSession;
+    this.liveSession = null;
+    source.close();
+    fetch(`/api/live/${id}`, { method: "DELETE" }).catch(() => {});
+  }
+
+  sendLivePatches() {
+    if (!this.liveSession) return;
+
+    // Send only the fields that changed since the last patch
+    const { id, snapshots } = this.liveSession;
+    const ids = this.getComponentIds();
+    const patches = [];
+    this.getComponentsData().forEach((component, index) => {
+      const snapshot = snapshots[ids[index]];
+      if (!snapshot) return;
+
+      const fields = {};
+      Object.keys(component).forEach((field) => {
+        if (component[field] !== snapshot[field]) {
+          fields[field] = component[field];
+        }
+      });
+      if (Object.keys(fields).length > 0) {
+        Object.assign(snapshot, fields);
+        patches.push({ id: ids[index], fields });
+      }
+    });
+    if (patches.length === 0) return;
+
+    fetch(`/api/live/${id}/patches`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({ patches }),
+    })
+      .then((response) => {
+        if (response.status === 404) this.stopLiveSession();
+      })
+      .catch((error) => console.warn("Live patch failed:", error));
+  }
+
+  applyLiveUpdate(update) {
+    if (!this.liveSession || !this.currentResults) return;
+
+    update.changed.forEach((result) => {
+      const index = this.liveSession.indexes[result.id];
+      if (index === undefined) return;
+
+      if (this.currentResults.components) {
+        this.currentResults.components[index] = result;
+      } else if (this.resultView) {
+        this.resultView.liveRows[index] = result;
+      }
+      const cell = document.querySelector(
+        `tr[data-result-index="${index}"] .result-lambda-p`
+      );
+      if (cell) cell.textContent = result.lambda_p;
+    });
+    update.errors.forEach((error) =>
+      console.warn(`Live recalculation of ${error.id} failed:`, error.error)
+    );
+
+    this.currentResults.total_lambda_p = update.total_lambda_p;
+    document
+      .querySelectorAll(".result-total-lambda-p")
+      .forEach((element) => (element.textContent = update.total_lambda_p));
+  }
+
   validateComponents(components) {
     const errors = [];
 
@@ -1441,20 +1603,17 @@ class EnhancedReliabilityCalculator {
     return errors;
   }
 
-  displayResults(results) {
-    const container = document.getElementById("resultsContainer");
-    if (!container) return;
-
-    const summaryHtml = `
+  renderResultsSummary(totalLambdaP, componentCount) {
+    return `
     <div class="results-summary">
       <div class="summary-grid">
         <div class="summary-item">
-          <div class="summary-value">${results.total_lambda_p}</div>
+          <div class="summary-value result-total-lambda-p">${totalLambdaP}</div>
           <div class="summary-label">Total λP (failures/10⁶ hrs)</div>
         </div>
         
         <div class="summary-item">
-          <div class="summary-value">${results.components.length}</div>
+          <div class="summary-value">${componentCount}</div>
           <div class="summary-label">Components Analyzed</div>
         </div>
         
@@ -1470,6 +1629,17 @@ class EnhancedReliabilityCalculator {
       </div>
     </div>
   `;
+  }
+
+  displayResults(results) {
+    const container = document.getElementById("resultsContainer");
+    if (!container) return;
+
+    this.resultView = null;
+    const summaryHtml = this.renderResultsSummary(
+      results.total_lambda_p,
+      results.components.length
+    );
 
     // Generate table header dynamically based on component types
     const hasCapacitors = results.components.some(
@@ -1508,7 +1678,7 @@ class EnhancedReliabilityCalculator {
         </thead>
         <tbody>
           ${results.components
-            .map((comp) => {
+            .map((comp, index) => {
               const componentType = comp.component_type || "capacitor";
               const typeIcon =
                 componentType === "inductor"
@@ -1517,7 +1687,7 @@ class EnhancedReliabilityCalculator {
                   ? "⚡"
                   : "🔋";
               let row = `
-              <tr>
+              <tr data-result-index="${index}">
                 <td><strong>${comp.name}</strong></td>
                 <td>${typeIcon} ${
                 componentType.charAt(0).toUpperCase() + componentType.slice(1)
@@ -1559,7 +1729,7 @@ class EnhancedReliabilityCalculator {
               }
 
               row += `
-              <td><strong>${comp.lambda_p}</strong></td>
+              <td><strong class="result-lambda-p">${comp.lambda_p}</strong></td>
               </tr>
             `;
 
@@ -1576,7 +1746,7 @@ class EnhancedReliabilityCalculator {
             }">
               <strong>TOTAL SYSTEM</strong>
             </td>
-            <td><strong>${results.total_lambda_p}</strong></td>
+            <td><strong class="result-total-lambda-p">${results.total_lambda_p}</strong></td>
           </tr>
         </tbody>
       </table>
@@ -1631,6 +1801,238 @@ class EnhancedReliabilityCalculator {
   `;
 
     container.innerHTML = summaryHtml + tableHtml + parametersHtml;
+    this.revealResults(container);
+  }
+
+  // Paged results: only the rows in view are in the DOM, fetched by window
+  displayPagedResults(results) {
+    const container = document.getElementById("resultsContainer");
+    if (!container) return;
+
+    this.resultView = {
+      resultId: results.result_id,
+      rowCount: results.component_count,
+      query: { sort: "index", order: "asc" },
+      matchingCount: results.window.matching_count,
+      pages: new Map([[0, results.window]]),
+      pending: new Set(),
+      liveRows: {},
+      frame: null,
+    };
+
+    container.innerHTML = `
+    ${this.renderResultsSummary(results.total_lambda_p, results.component_count)}
+    <div class="results-controls">
+      <select id="resultSort">
+        <option value="index">Input order</option>
+        <option value="lambda_p">λP</option>
+        <option value="name">Component</option>
+        <option value="style">Style</option>
+      </select>
+      <select id="resultOrder">
+        <option value="asc">Ascending</option>
+        <option value="desc">Descending</option>
+      </select>
+      <input type="text" id="resultStyleFilter" placeholder="Style">
+      <input type="number" id="resultMinLambda" step="any" min="0" placeholder="Min λP">
+      <input type="number" id="resultMaxLambda" step="any" min="0" placeholder="Max λP">
+      <span class="results-match-count" id="resultMatchCount"></span>
+    </div>
+    <div class="results-table results-viewport" id="resultViewport">
+      <table>
+        <thead>
+          <tr>
+            <th>Component</th><th>Type</th><th>Style</th><th>λb</th><th>πT</th>
+            <th>πQ</th><th>πE</th><th>Other Factors</th><th>λP</th>
+          </tr>
+        </thead>
+        <tbody id="resultRows"></tbody>
+      </table>
+    </div>
+    <div class="results-total">
+      TOTAL SYSTEM λP: <strong class="result-total-lambda-p">${results.total_lambda_p}</strong>
+    </div>
+  `;
+
+    container
+      .querySelectorAll(".results-controls select, .results-controls input")
+      .forEach((control) =>
+        control.addEventListener("change", () => this.updateResultQuery())
+      );
+    document
+      .getElementById("resultViewport")
+      .addEventListener("scroll", () => this.scheduleResultRender());
+
+    this.revealResults(container);
+    this.renderResultWindow();
+  }
+
+  updateResultQuery() {
+    if (!this.resultView) return;
+
+    const query = {
+      sort: document.getElementById("resultSort").value,
+      order: document.getElementById("resultOrder").value,
+    };
+    const style = document.getElementById("resultStyleFilter").value.trim();
+    const minLambda = document.getElementById("resultMinLambda").value;
+    const maxLambda = document.getElementById("resultMaxLambda").value;
+    if (style) query.style = style;
+    if (minLambda !== "") query.min_lambda = minLambda;
+    if (maxLambda !== "") query.max_lambda = maxLambda;
+
+    // A fresh view drops pages of the old query, including ones still in flight
+    this.resultView = {
+      ...this.resultView,
+      query,
+      pages: new Map(),
+      pending: new Set(),
+      frame: null,
+    };
+    document.getElementById("resultViewport").scrollTop = 0;
+    this.fetchResultPage(0);
+  }
+
+  scheduleResultRender() {
+    const view = this.resultView;
+    if (!view || view.frame) return;
+
+    view.frame = requestAnimationFrame(() => {
+      view.frame = null;
+      this.renderResultWindow();
+    });
+  }
+
+  renderResultWindow() {
+    const view = this.resultView;
+    const viewport = document.getElementById("resultViewport");
+    const tbody = document.getElementById("resultRows");
+    if (!view || !viewport || !tbody) return;
+
+    const visibleRows = Math.ceil(viewport.clientHeight / RESULT_ROW_HEIGHT) + 1;
+    const first = Math.min(
+      Math.floor(viewport.scrollTop / RESULT_ROW_HEIGHT),
+      Math.max(view.matchingCount - 1, 0)
+    );
+    const last = Math.min(first + visibleRows, view.matchingCount);
+
+    let rows = "";
+    for (let position = first; position < last; position++) {
+      const page = view.pages.get(Math.floor(position / RESULT_PAGE_SIZE));
+      if (!page) {
+        rows += '<tr><td colspan="9">Loading...</td></tr>';
+        continue;
+      }
+      const offset = position - page.offset;
+      const index = page.indexes[offset];
+      rows += this.renderPagedRow(
+        view.liveRows[index] || page.components[offset],
+        index
+      );
+    }
+
+    const spacer = (rowCount) =>
+      rowCount > 0
+        ? `<tr class="results-spacer" style="height: ${rowCount * RESULT_ROW_HEIGHT}px"><td colspan="9"></td></tr>`
+        : "";
+    tbody.innerHTML = spacer(first) + rows + spacer(view.matchingCount - last);
+    document.getElementById("resultMatchCount").textContent =
+      `${view.matchingCount} of ${view.rowCount} components`;
+
+    const lastPage = Math.floor(Math.max(last - 1, first) / RESULT_PAGE_SIZE);
+    for (let page = Math.floor(first / RESULT_PAGE_SIZE); page <= lastPage; page++) {
+      if (!view.pages.has(page)) this.fetchResultPage(page);
+    }
+  }
+
+  renderPagedRow(comp, index) {
+    const componentType = comp.component_type || "capacitor";
+    const typeIcon =
+      componentType === "inductor"
+        ? "🔗"
+        : componentType === "resistor"
+        ? "⚡"
+        : "🔋";
+    let otherFactors = "-";
+    if (componentType === "capacitor") {
+      otherFactors = `πC ${comp.pi_c}, πV ${comp.pi_v}, πSR ${comp.pi_sr}`;
+    } else if (componentType === "resistor") {
+      otherFactors = `πP ${comp.pi_p}, πS ${comp.pi_s}`;
+    }
+
+    return `
+      <tr data-result-index="${index}">
+        <td><strong>${comp.name}</strong></td>
+        <td>${typeIcon} ${
+      componentType.charAt(0).toUpperCase() + componentType.slice(1)
+    }</td>
+        <td>${comp.style}</td>
+        <td>${comp.lambda_b}</td>
+        <td>${comp.pi_t}</td>
+        <td>${comp.pi_q}</td>
+        <td>${comp.pi_e}</td>
+        <td>${otherFactors}</td>
+        <td><strong class="result-lambda-p">${comp.lambda_p}</strong></td>
+      </tr>
+    `;
+  }
+
+  async fetchResultPage(page) {
+    const view = this.resultView;
+    if (!view || view.pending.has(page)) return;
+
+    view.pending.add(page);
+    const params = new URLSearchParams({
+      ...view.query,
+      offset: page * RESULT_PAGE_SIZE,
+      limit: RESULT_PAGE_SIZE,
+    });
+    try {
+      const response = await fetch(`/api/results/${view.resultId}?${params}`);
+      const data = await response.json();
+      if (!response.ok) {
+        throw new Error(data.error || "Failed to load results");
+      }
+      if (this.resultView !== view) return;
+
+      view.pages.set(page, data);
+      view.matchingCount = data.matching_count;
+      this.renderResultWindow();
+    } catch (error) {
+      if (this.resultView === view) {
+        this.showError("Failed to load results: " + error.message);
+      }
+    } finally {
+      view.pending.delete(page);
+    }
+  }
+
+  // Paged results hold only the rows on screen; export needs all of them
+  async loadAllResults() {
+    const results = this.currentResults;
+    if (!results || results.components || !results.result_id) return;
+
+    const components = [];
+    while (components.length < results.component_count) {
+      const params = new URLSearchParams({
+        offset: components.length,
+        limit: RESULT_EXPORT_PAGE_SIZE,
+      });
+      const response = await fetch(`/api/results/${results.result_id}?${params}`);
+      const data = await response.json();
+      if (!response.ok) {
+        throw new Error(data.error || "Failed to load results");
+      }
+      if (data.components.length === 0) break;
+      components.push(...data.components);
+    }
+    Object.entries(this.resultView?.liveRows || {}).forEach(
+      ([index, result]) => (components[index] = result)
+    );
+    results.components = components;
+  }
+
+  revealResults(container) {
     container.style.display = "block";
 
     // Animate results appearance
@@ -1685,6 +2087,7 @@ class EnhancedReliabilityCalculator {
     }
 
     try {
+      await this.loadAllResults();
       let content, filename, contentType;
 
       switch (format) {
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Per-request phase timing for the MIL-HDBK-217F Reliability Prediction backend
+Emits Server-Timing response headers and optional structured timing log lines
+"""
+
+import json
+import time
+from contextlib import nullcontext
+from flask import g, request, has_request_context
+from config import Config
+
+# Shared no-op context returned while timing is switched off
+_NULL_PHASE = nullcontext()
+
+class PhaseTimer:
+    """Accumulates named phase durations for one request"""
+
+    __slots__ = ('start', 'phases')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = {}
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def total(self):
+        return time.perf_counter() - self.start
+
+    def header_value(self, total):
+        """Format phases as a Server-Timing header value (durations in ms)"""
+        entries = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.phases.items()]
+        entries.append(f"total;dur={total * 1000:.3f}")
+        return ', '.join(entries)
+
+class _Phase:
+    """Context manager timing one phase into a PhaseTimer"""
+
+    __slots__ = ('timer', 'name', 'start')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.timer.add(self.name, time.perf_counter() - self.start)
+        return False
+
+def timing_enabled():
+    return Config.SERVER_TIMING_ENABLED or Config.TIMING_LOG_ENABLED
+
+def phase(name):
+    """Time a block as phase `name` of the current request; no-op when timing is off"""
+    if not timing_enabled() or not has_request_context():
+        return _NULL_PHASE
+    timer = g.get('phase_timer')
+    if timer is None:
+        return _NULL_PHASE
+    return _Phase(timer, name)
+
+def init_app(app):
+    """Register the request hooks that create the timer and emit its results"""
+
+    @app.before_request
+    def start_phase_timer():
+        if timing_enabled():
+            g.phase_timer = PhaseTimer()
+
+    @app.after_request
+    def emit_phase_timing(response):
+        timer = g.get('phase_timer')
+        if timer is None:
+            return response
+
+        total = timer.total()
+        if Config.SERVER_TIMING_ENABLED:
+            response.headers['Server-Timing'] = timer.header_value(total)
+
+        if Config.TIMING_LOG_ENABLED:
+            record = {
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'total_ms': round(total * 1000, 3),
+                'phases_ms': {name: round(seconds * 1000, 3) for name, seconds in timer.phases.items()}
+            }
+            print(f"[timing] {json.dumps(record)}")
+
+        return response
@@ -0,0 +1,50 @@
+"""
+Shared fixtures: src/ on sys.path and a private copy of the handbook database
+Tests never open src/database/mil_hdbk_217.db itself; migrations, the part
+library and the search index only ever write to the copy.
+"""
+
+import os
+import shutil
+import sys
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+HANDBOOK_DATABASE = os.path.join(SRC_DIR, 'database', 'mil_hdbk_217.db')
+
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+@pytest.fixture(scope='session')
+def database_path(tmp_path_factory):
+    """Session-wide copy of the handbook database"""
+    path = tmp_path_factory.mktemp('database') / 'mil_hdbk_217.db'
+    shutil.copy(HANDBOOK_DATABASE, path)
+    return str(path)
+
+@pytest.fixture
+def fresh_database(tmp_path):
+    """Unmigrated copy of the handbook database for one test"""
+    path = tmp_path / 'mil_hdbk_217.db'
+    shutil.copy(HANDBOOK_DATABASE, path)
+    return str(path)
+
+@pytest.fixture(scope='session')
+def factor_catalog(database_path):
+    import engine
+    return engine.load_catalog(database_path)
+
+@pytest.fixture(scope='session')
+def app_module(database_path):
+    """The Flask app, configured against the database copy"""
+    from config import Config
+    Config.DATABASE_PATH = database_path
+    Config.RESULT_CACHE_PATH = None
+    import app
+    assert Config.get_database_path() == database_path
+    return app
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
@@ -0,0 +1,136 @@
+"""Project diff: matching stages and reuse of the base's saved results"""
+
+import copy
+
+import diff
+
+def test_stages_match_by_id_then_part_number_then_content():
+    base = [
+        {'id': 1, 'style': 'CK', 'part_number': 'A'},
+        {'id': 2, 'style': 'CK', 'part_number': 'B'},
+        {'style': 'CSR', 'capacitance': 4.7},
+        {'style': 'CWR'},
+    ]
+    revision = [
+        {'style': 'CSR', 'capacitance': 4.7, 'id': ''},  # content only; an empty id never matches
+        {'id': 9, 'style': 'CK', 'part_number': 'B', 'temperature': 60},  # new id, same part number
+        {'id': 1, 'style': 'CK', 'part_number': 'A2'},  # same id, part number changed
+        {'style': 'CLR'},
+    ]
+    pairs, added, removed = diff.match_components(base, revision)
+    assert sorted(pairs) == [(0, 2, 'id'), (1, 1, 'part_number'), (2, 0, 'content')]
+    assert added == [3]
+    assert removed == [3]
+
+def test_id_match_takes_precedence_over_part_number():
+    base = [{'id': 'x', 'part_number': 'P'}, {'id': 'y', 'part_number': 'Q'}]
+    revision = [{'id': 'y', 'part_number': 'P'}]
+    pairs, added, removed = diff.match_components(base, revision)
+    assert pairs == [(1, 0, 'id')]
+    assert removed == [0]
+
+def test_part_numbers_are_matched_per_family():
+    base = [{'component_type': 'resistor', 'part_number': 'P1'}]
+    revision = [{'component_type': 'capacitor', 'part_number': 'P1'}]
+    pairs, added, removed = diff.match_components(base, revision)
+    assert pairs == []
+    assert (added, removed) == ([0], [0])
+
+def test_duplicate_keys_pair_up_in_order():
+    base = [{'style': 'CK'}, {'style': 'CK'}, {'style': 'CK'}]
+    revision = [{'style': 'CK'}, {'style': 'CK'}]
+    pairs, added, removed = diff.match_components(base, revision)
+    assert pairs == [(0, 0, 'content'), (1, 1, 'content')]
+    assert removed == [2]
+
+def test_unhashable_values_still_match_by_content():
+    component = {'style': 'CK', 'tags': ['a', 'b']}
+    pairs, _, _ = diff.match_components([component], [dict(component)])
+    assert pairs == [(0, 0, 'content')]
+
+def test_changed_fields_ignore_identity():
+    base = {'id': 1, 'project_name': 'A', 'style': 'CK', 'temperature': 25}
+    revision = {'id': 2, 'project_name': 'B', 'style': 'CK', 'temperature': 60, 'name': 'C7'}
+    assert diff.changed_fields(base, revision) == ['name', 'temperature']
+    assert diff.changed_fields(base, dict(base)) == []
+
+BASE = [
+    {'id': 1, 'style': 'CK', 'capacitance': 0.1, 'part_number': 'P1'},
+    {'id': 2, 'component_type': 'resistor', 'style': 'RC', 'part_number': 'P2'},
+    {'id': 3, 'component_type': 'inductor', 'inductor_type': 'Variable Inductor', 'name': 'L1'},
+]
+
+def _diff(client, saved_results):
+    revision = copy.deepcopy(BASE)
+    revision[0]['temperature'] = 85
+    response = client.post('/api/diff', json={
+        'base': {'components': BASE, 'results': saved_results}, 'revision': {'components': revision}})
+    assert response.status_code == 200
+    return response.get_json()
+
+def test_diff_reuses_matching_saved_results(client):
+    saved = client.post('/api/calculate', json={'components': BASE}).get_json()
+    report = _diff(client, saved)
+    assert report['base_recalculated'] is False
+    assert report['base_total_lambda_p'] == saved['total_lambda_p']
+    assert report['recomputed'] == 1
+    assert [change['index'] for change in report['changed']] == [0]
+    assert report['changed'][0]['delta_lambda_p'] > 0
+
+def test_diff_recalculates_stale_or_misaligned_results(client):
+    saved = client.post('/api/calculate', json={'components': BASE}).get_json()
+    fresh_total = saved['total_lambda_p']
+
+    stale = copy.deepcopy(saved)
+    stale['dataset_version'] = 'older-dataset'
+    for result in stale['components']:
+        result['dataset_version'] = 'older-dataset'
+        result['lambda_p'] = 1.0
+    misaligned = copy.deepcopy(saved)
+    misaligned['components'].reverse()
+    window = copy.deepcopy(saved)
+    del window['components'][1:]
+
+    for saved_results in (stale, misaligned, window, None):
+        report = _diff(client, saved_results)
+        assert report['base_recalculated'] is True
+        assert report['base_total_lambda_p'] == fresh_total
+
+OVERRIDES = {'part_numbers': {'P1': {'lambda_b': 0.5}}}
+
+def _diff_with_overrides(client, saved_results, revision_overrides=OVERRIDES):
+    revision = copy.deepcopy(BASE)
+    revision[0]['capacitance'] = 0.22
+    response = client.post('/api/diff', json={
+        'base': {'components': BASE, 'results': saved_results, 'factor_overrides': OVERRIDES},
+        'revision': {'components': revision, 'factor_overrides': revision_overrides}})
+    assert response.status_code == 200
+    return response.get_json()
+
+def test_diff_applies_each_projects_overrides(client):
+    saved = client.post('/api/calculate', json={'components': BASE, 'factor_overrides': OVERRIDES}).get_json()
+    handbook = client.post('/api/calculate', json={'components': BASE}).get_json()
+    revision = copy.deepcopy(BASE)
+    revision[0]['capacitance'] = 0.22
+    expected = client.post('/api/calculate', json={'components': revision, 'factor_overrides': OVERRIDES}).get_json()
+
+    for saved_results in (saved, None):
+        report = _diff_with_overrides(client, saved_results)
+        assert report['base_recalculated'] is (saved_results is None)
+        assert report['base_total_lambda_p'] == saved['total_lambda_p']
+        assert report['revision_total_lambda_p'] == expected['total_lambda_p']
+        assert report['changed'][0]['lambda_p'] == expected['components'][0]['lambda_p']
+
+    # Results saved without the overrides are not reused for a project that has them
+    report = _diff_with_overrides(client, handbook)
+    assert report['base_recalculated'] is True
+    assert report['base_total_lambda_p'] == saved['total_lambda_p']
+
+def test_diff_reports_rows_whose_overrides_changed(client):
+    saved = client.post('/api/calculate', json={'components': BASE, 'factor_overrides': OVERRIDES}).get_json()
+    response = client.post('/api/diff', json={
+        'base': {'components': BASE, 'results': saved, 'factor_overrides': OVERRIDES},
+        'revision': {'components': BASE}})
+    report = response.get_json()
+    assert [(change['index'], change['fields']) for change in report['changed']] == [(0, ['factor_overrides'])]
+    assert report['revision_total_lambda_p'] < report['base_total_lambda_p']
@@ -0,0 +1,157 @@
+"""Calculation engine: baseline values, dedup and batch validation"""
+
+import math
+
+import pytest
+
+import engine
+
+# Inputs and results recorded from the baseline /api/calculate (before the
+# engine package), so refactors of the hot path can't drift the numbers
+BASELINE = [
+    ({'name': 'C1', 'style': 'CK', 'capacitance': 0.1, 'voltage_stress': 0.3, 'temperature': 40,
+      'quality_level': 'M', 'environment': 'GB'},
+     {'style': 'CK', 'lambda_b': 0.00099, 'pi_t': 1.9, 'pi_c': 0.81, 'pi_v': 1.1, 'pi_q': 1.0, 'pi_e': 1.0,
+      'pi_sr': 1.0, 'lambda_p': 0.001675971}),
+    ({'name': 'C2', 'style': 'CSR', 'capacitance': 4.7, 'voltage_stress': 0.5, 'temperature': 85,
+      'quality_level': 'S,B', 'environment': 'GF', 'series_resistance': 0.5},
+     {'style': 'CSR', 'lambda_b': 0.0004, 'pi_t': 2.66182, 'pi_c': 1.427521, 'pi_v': 1.0, 'pi_q': 0.03,
+      'pi_e': 10.0, 'pi_sr': 1.3, 'lambda_p': 0.0005927694}),
+    ({'name': 'C3', 'style': 'CWR', 'capacitance': 22.0, 'voltage_stress': 0.45, 'temperature': 63.5,
+      'quality_level': 'R', 'environment': 'NS'},
+     {'style': 'CWR', 'lambda_b': 5e-05, 'pi_t': 1.950987, 'pi_c': 2.035904, 'pi_v': 1.007517, 'pi_q': 0.1,
+      'pi_e': 7.0, 'pi_sr': 0.66, 'lambda_p': 9.24434e-05}),
+    ({'name': 'R1', 'component_type': 'resistor', 'style': 'RC', 'watts': 0.25, 'power_stress': 0.4,
+      'temperature': 70, 'quality_level': 'M', 'environment': 'GF'},
+     {'component_type': 'resistor', 'style': 'RC', 'lambda_b': 0.0017, 'pi_t': 2.8, 'pi_p': 0.58, 'pi_s': 1.2,
+      'pi_q': 1.0, 'pi_e': 4.0, 'lambda_p': 0.01325184}),
+    ({'name': 'R2', 'component_type': 'resistor', 'style': 'RN', 'watts': 0.05, 'power_stress': 0.35,
+      'temperature': 55, 'quality_level': 'P', 'environment': 'AIC'},
+     {'component_type': 'resistor', 'style': 'RN', 'lambda_b': 0.0037, 'pi_t': 1.329692, 'pi_p': 0.310884,
+      'pi_s': 1.043426, 'pi_q': 0.3, 'pi_e': 18.0, 'lambda_p': 0.0086180015}),
+    ({'name': 'L1', 'component_type': 'inductor', 'inductor_type': 'Fixed Inductor or Choke', 'temperature': 60,
+      'quality_level': 'MIL-SPEC', 'environment': 'GM'},
+     {'component_type': 'inductor', 'style': 'Fixed Inductor or Choke', 'lambda_b': 3e-05, 'pi_t': 1.568689,
+      'pi_q': 1.0, 'pi_e': 12.0, 'lambda_p': 0.00056472804}),
+    ({'name': 'D1', 'style': 'CK'},
+     {'style': 'CK', 'lambda_b': 0.00099, 'pi_t': 1.0, 'pi_c': 1.0, 'pi_v': 1.6, 'pi_q': 1.0, 'pi_e': 1.0,
+      'pi_sr': 1.0, 'lambda_p': 0.001584}),
+]
+BASELINE_TOTAL = 0.0263797533
+
+def test_results_match_baseline(factor_catalog):
+    report = engine.calculate([component for component, _ in BASELINE], factor_catalog)
+    for result, (component, expected) in zip(report['components'], BASELINE):
+        values = result.to_dict()
+        assert values['name'] == component['name']
+        assert {key: values[key] for key in expected} == expected
+        assert values['dataset_version'] == factor_catalog.version
+    assert report['total_lambda_p'] == BASELINE_TOTAL
+
+def test_defaults_are_reported_as_parameters(factor_catalog):
+    result = engine.calculate([{'name': 'D1', 'style': 'CK'}], factor_catalog)['components'][0]
+    assert result['parameters'] == {
+        'description': '', 'manufacturer': '', 'part_number': '', 'temperature': 25.0, 'capacitance': 1.0,
+        'voltage_stress': 0.5, 'quality_level': 'M', 'environment': 'GB', 'series_resistance': 1.0}
+
+def _bom():
+    rows = []
+    for i in range(60):
+        component = dict(BASELINE[i % len(BASELINE)][0])
+        component['name'] = f'part-{i}'
+        component['part_number'] = f'PN-{i % 7}'
+        if i % 5 == 0:
+            component['temperature'] = 30 + i  # a distinct parameter set
+        rows.append(component)
+    return rows
+
+@pytest.mark.parametrize('overrides', [None, {'styles': {'capacitor': {'CK': {'pi_q': 2.5}}}}])
+def test_dedup_matches_per_row_evaluation(factor_catalog, overrides):
+    rows = _bom()
+    factor_overrides = engine.get_factor_overrides(overrides)
+    results, total_lambda_p, unique_evaluations = engine.evaluate_components(
+        factor_catalog, rows, factor_overrides=factor_overrides)
+
+    expected = []
+    for component in rows:
+        component_type = engine.get_component_type(component)
+        row_overrides = factor_overrides.resolve(component, component_type) if factor_overrides else None
+        expected.append(engine.calculate_single_component(factor_catalog, component, component_type, row_overrides))
+
+    assert [result.to_dict() for result in results] == [result.to_dict() for result in expected]
+    assert total_lambda_p == pytest.approx(math.fsum(result['lambda_p'] for result in expected), rel=1e-12)
+    distinct = {engine.get_calculation_key(component, engine.get_component_type(component)) for component in rows}
+    assert unique_evaluations == len(distinct) < len(rows)
+
+def test_shared_evaluations_keep_row_identity(factor_catalog):
+    rows = [dict(BASELINE[0][0], name='first', part_number='A'), dict(BASELINE[0][0], name='second', part_number='B')]
+    results, _, unique_evaluations = engine.evaluate_components(factor_catalog, rows)
+    assert unique_evaluations == 1
+    assert results[0].evaluation is results[1].evaluation
+    assert [result['name'] for result in results] == ['first', 'second']
+    assert [result['parameters']['part_number'] for result in results] == ['A', 'B']
+
+def test_calculate_columns_matches_records(factor_catalog):
+    rows = [component for component, _ in BASELINE]
+    columns = {field: [row.get(field) for row in rows] for row in rows for field in row}
+    values = engine.calculate_columns(columns, factor_catalog)
+    assert values['lambda_p'] == [expected['lambda_p'] for _, expected in BASELINE]
+
+def test_engine_imports_without_the_application():
+    import subprocess
+    import sys
+    from conftest import SRC_DIR
+    code = (
+        'import sys, engine\n'
+        "loaded = {'config', 'app', 'catalog', 'overrides', 'parts_count', 'flask', 'database.migrations'}\n"
+        'print(sorted(loaded & set(sys.modules)))\n'
+    )
+    output = subprocess.run([sys.executable, '-c', code], cwd=SRC_DIR, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == '[]'
+
+def test_validation_collects_every_violation(factor_catalog):
+    rows = [
+        {'name': 'ok', 'style': 'CK'},
+        {'name': 'bad-style', 'style': 'NOPE', 'temperature': 400},
+        {'name': 'bad-number', 'component_type': 'resistor', 'style': 'RC', 'watts': 'lots'},
+        'not a component',
+        {'name': 'warnings', 'style': 'CK', 'quality_level': 'X', 'environment': 'MARS', 'voltage_stress': 1.5},
+        {'name': 'repeat', 'style': 'NOPE'},
+    ]
+    violations = engine.validate_components(factor_catalog, rows)
+
+    found = [(violation['index'], violation['field'], violation['severity']) for violation in violations]
+    assert found == [
+        (1, 'style', 'error'),
+        (1, 'temperature', 'error'),
+        (2, 'watts', 'error'),
+        (3, None, 'error'),
+        (4, 'voltage_stress', 'warning'),
+        (4, 'quality_level', 'warning'),
+        (4, 'environment', 'warning'),
+        (5, 'style', 'error'),
+    ]
+    assert violations[0]['message'] == "Capacitor style 'NOPE' not found"
+    assert violations[-1]['name'] == 'repeat'
+
+    errors = [violation for violation in violations if violation['severity'] == 'error']
+    message = engine.describe_violations(errors, limit=2)
+    assert message.startswith('5 invalid input(s): component 2 (bad-style):')
+    assert message.endswith('and 3 more')
+
+def test_factors_are_rounded_only_when_read(factor_catalog):
+    result = engine.calculate([BASELINE[2][0]], factor_catalog)['components'][0]
+    # π_V is interpolated between table rows: full precision in the evaluation, 6 digits in the result
+    pi_v = result.evaluation.factors[3]
+    assert pi_v != round(pi_v, 6)
+    assert result['pi_v'] == round(pi_v, 6) == 1.007517
+    assert list(result.to_dict()) == list(result.keys())
+
+def test_result_records_take_caller_keys(factor_catalog):
+    result = engine.calculate([BASELINE[0][0]], factor_catalog)['components'][0]
+    result['id'] = 'row-1'
+    result['name'] = 'Renamed'
+    values = result.to_dict()
+    assert values['id'] == 'row-1'
+    assert values['name'] == 'Renamed'
+    assert list(values)[-1] == 'id'
@@ -0,0 +1,39 @@
+"""Readiness: required warm-up tasks gate it, optional ones only warn"""
+
+import sqlite3
+
+import health
+
+def _fail():
+    raise RuntimeError('no such module: fts5')
+
+def test_failed_optional_task_leaves_the_server_ready():
+    readiness = health.Readiness()
+    ran = []
+    readiness.warm_up([('catalog', lambda: ran.append('catalog'))],
+                      [('search_index', _fail), ('after', lambda: ran.append('after'))])
+    assert readiness.wait(5)
+
+    status = readiness.status()
+    assert status['error'] is None
+    assert status['warnings'] == ['search_index: no such module: fts5']
+    assert [(task['name'], task['status'], task['required']) for task in status['warmup']] == [
+        ('catalog', 'done', True), ('search_index', 'failed', False), ('after', 'done', False)]
+    assert ran == ['catalog', 'after']
+
+def test_failed_required_task_blocks_readiness():
+    readiness = health.Readiness()
+    ran = []
+    readiness.warm_up([('catalog', _fail)], [('search_index', lambda: ran.append('search_index'))])
+    assert readiness.wait(5) is False
+    assert readiness.status()['error'] == 'catalog: no such module: fts5'
+    assert ran == []
+
+def test_search_index_is_not_required(app_module, monkeypatch):
+    def no_fts5(*args, **kwargs):
+        raise sqlite3.OperationalError('no such module: fts5')
+    monkeypatch.setattr(app_module.search, 'ensure_search_schema', no_fts5)
+    readiness = health.Readiness()
+    readiness.warm_up(app_module.WARMUP_TASKS, app_module.OPTIONAL_WARMUP_TASKS)
+    assert readiness.wait(30)
+    assert readiness.status()['warnings'] == ['search_index: no such module: fts5']
@@ -0,0 +1,92 @@
+"""Schema migrations and the code aliases derived from them"""
+
+import sqlite3
+
+import engine
+from database import migrations
+from engine import catalog
+
+ALL_CODE_ALIASES = tuple(table for table, _, _ in catalog.CODE_TABLES)
+
+def _connect(path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def _schema(conn):
+    return sorted(tuple(row) for row in conn.execute('SELECT type, name, sql FROM sqlite_master'))
+
+def test_migrations_apply_once(fresh_database):
+    conn = _connect(fresh_database)
+    try:
+        assert migrations.migrate(conn) == [version for version, _, _ in migrations.MIGRATIONS]
+        schema = _schema(conn)
+        codes = [tuple(row) for row in conn.execute('SELECT * FROM style_codes ORDER BY family, code')]
+
+        assert migrations.migrate(conn) == []
+        assert _schema(conn) == schema
+        assert [tuple(row) for row in conn.execute('SELECT * FROM style_codes ORDER BY family, code')] == codes
+        versions = [row[0] for row in conn.execute('SELECT version FROM schema_version ORDER BY version')]
+        assert versions == [version for version, _, _ in migrations.MIGRATIONS]
+        assert migrations.current_version(conn) == migrations.SCHEMA_VERSION
+    finally:
+        conn.close()
+
+def test_migration_survives_a_reopen(fresh_database):
+    conn = _connect(fresh_database)
+    migrations.migrate(conn)
+    conn.close()
+    conn = _connect(fresh_database)
+    try:
+        assert migrations.migrate(conn) == []
+    finally:
+        conn.close()
+
+def test_refresh_codes_is_repeatable(fresh_database):
+    conn = _connect(fresh_database)
+    try:
+        migrations.migrate(conn)
+        before = [tuple(row) for row in conn.execute('SELECT * FROM quality_codes ORDER BY family, code')]
+        migrations.refresh_codes(conn)
+        migrations.refresh_codes(conn)
+        after = [tuple(row) for row in conn.execute('SELECT * FROM quality_codes ORDER BY family, code')]
+        assert after == before
+        assert ('capacitor', 'B', 'S,B') in after
+    finally:
+        conn.close()
+
+def test_read_only_load_matches_migrated_tables(fresh_database):
+    # The engine never migrates; the code tables it derives must equal migration 2's
+    unmigrated = engine.load_catalog(fresh_database, code_aliases=ALL_CODE_ALIASES)
+    conn = _connect(fresh_database)
+    try:
+        assert migrations.current_version(conn) == 0
+        migrations.migrate(conn)
+        migrated = catalog.FactorCatalog(catalog.read_tables(conn), fresh_database, None,
+                                           code_aliases=ALL_CODE_ALIASES)
+    finally:
+        conn.close()
+    assert unmigrated.digest == migrated.digest
+    assert unmigrated.code_aliases == migrated.code_aliases
+
+def test_style_codes_resolve_by_default(database_path, factor_catalog):
+    composite = engine.calculate([{'style': 'CZ, CZR'}], factor_catalog)['components'][0]
+    code = engine.calculate([{'style': 'CZR'}], factor_catalog)['components'][0]
+    assert code['lambda_p'] == composite['lambda_p']
+    assert engine.validate_components(factor_catalog, [{'style': 'CZR'}]) == []
+
+    # Style aliases only turn errors into results, so the dataset keeps its digest
+    without = engine.load_catalog(database_path, code_aliases=())
+    assert without.digest == factor_catalog.digest
+    assert 'CZR' not in without.capacitor_styles
+
+def test_quality_codes_resolve_only_when_enabled(database_path, factor_catalog):
+    assert 'B' not in factor_catalog.quality_factors
+    [violation] = engine.validate_components(factor_catalog, [{'style': 'CK', 'quality_level': 'B'}])
+    assert violation['message'] == "Unknown quality level 'B', π_Q = 3.0 is used"
+
+    enabled = engine.load_catalog(database_path, code_aliases=ALL_CODE_ALIASES)
+    assert enabled.digest != factor_catalog.digest
+    assert enabled.quality_factors['B'] is enabled.quality_factors['S,B']
+    [violation] = engine.validate_components(enabled, [{'style': 'CK', 'quality_level': 'B'}])
+    assert (violation['severity'], violation['message']) == ('warning', "Quality level 'B' uses the factors of 'S,B'")
@@ -0,0 +1,76 @@
+"""Reliability block diagrams: series, parallel and k-of-n R(t) and MTBF"""
+
+import itertools
+import math
+
+import pytest
+
+from rbd import HOURS_PER_UNIT, BlockDiagram
+
+TIMES = [0.0, 1e3, 1e4, 5e4, 2e5, 1e6]
+
+def part(lambda_p):
+    return {'type': 'component', 'lambda_p': lambda_p}
+
+def survival(lambda_p, t):
+    return math.exp(-lambda_p * t / HOURS_PER_UNIT)
+
+def brute_force_k_of_n(k, rates, t):
+    """P(at least k of the parts survive), summed over every up/down combination"""
+    total = 0.0
+    for states in itertools.product((True, False), repeat=len(rates)):
+        if sum(states) >= k:
+            p = 1.0
+            for up, rate in zip(states, rates):
+                r = survival(rate, t)
+                p *= r if up else 1.0 - r
+            total += p
+    return total
+
+def test_series_of_parts_stays_exponential():
+    diagram = BlockDiagram({'type': 'series', 'blocks': [part(2.0), part(3.0), part(5.0)]})
+    assert diagram.system_lambda_p == 10.0
+    assert diagram.mtbf() == HOURS_PER_UNIT / 10.0
+    assert diagram.reliability(TIMES) == pytest.approx([survival(10.0, t) for t in TIMES], rel=1e-12)
+
+def test_identical_k_of_n_is_binomial():
+    diagram = BlockDiagram({'type': 'k_of_n', 'k': 2, 'blocks': [part(4.0)] * 3})
+    expected = [3 * survival(4.0, t) ** 2 - 2 * survival(4.0, t) ** 3 for t in TIMES]
+    assert diagram.reliability(TIMES) == pytest.approx(expected, rel=1e-12)
+    assert diagram.unique_blocks == 2  # one shared part and the voting block
+
+@pytest.mark.parametrize('k', [1, 2, 3, 4])
+def test_mixed_k_of_n_matches_enumeration(k):
+    rates = [1.0, 2.5, 2.5, 7.0]
+    diagram = BlockDiagram({'type': 'k_of_n', 'k': k, 'blocks': [part(rate) for rate in rates]})
+    expected = [brute_force_k_of_n(k, rates, t) for t in TIMES]
+    assert diagram.reliability(TIMES) == pytest.approx(expected, rel=1e-9, abs=1e-15)
+
+def test_parallel_pair_mtbf():
+    # Two identical parts in parallel: MTBF = 1.5 / λ
+    diagram = BlockDiagram({'type': 'parallel', 'blocks': [part(8.0), part(8.0)]})
+    assert diagram.system_lambda_p is None
+    assert diagram.mtbf() == pytest.approx(1.5 * HOURS_PER_UNIT / 8.0, rel=1e-4)
+
+def test_nested_blocks_share_identical_structure():
+    board = {'type': 'series', 'blocks': [part(1.0), {'type': 'parallel', 'blocks': [part(3.0), part(3.0)]}]}
+    same_board_reordered = {'type': 'series', 'blocks': [{'type': 'parallel', 'blocks': [part(3.0), part(3.0)]},
+                                                         part(1.0)]}
+    diagram = BlockDiagram({'type': 'k_of_n', 'k': 1, 'blocks': [board, same_board_reordered]})
+    board_curve = BlockDiagram(board).reliability(TIMES)
+    assert diagram.reliability(TIMES) == pytest.approx([1 - (1 - r) ** 2 for r in board_curve], rel=1e-12)
+
+def test_zero_rate_redundancy_has_no_mtbf():
+    assert BlockDiagram({'type': 'parallel', 'blocks': [part(0.0), part(2.0)]}).mtbf() is None
+
+@pytest.mark.parametrize('spec', [
+    {'type': 'k_of_n', 'k': 3, 'blocks': [part(1.0), part(2.0)]},
+    {'type': 'k_of_n', 'k': 0, 'blocks': [part(1.0)]},
+    {'type': 'k_of_n', 'k': '2', 'blocks': [part(1.0), part(2.0)]},
+    {'type': 'series', 'blocks': []},
+    {'type': 'bridge', 'blocks': [part(1.0)]},
+    {'type': 'component', 'lambda_p': -1},
+])
+def test_invalid_diagrams_are_rejected(spec):
+    with pytest.raises(ValueError):
+        BlockDiagram(spec)
@@ -0,0 +1,164 @@
+"""Result cache: request keys, single-flight coalescing, eviction and the disk tier"""
+
+import threading
+import time
+
+import pytest
+
+import result_cache
+from result_cache import DiskTier, ResultCache, request_key
+
+def response(rows, tag=''):
+    return {'components': [{'lambda_p': 0.001, 'name': f'{tag}{i}'} for i in range(rows)], 'dataset_version': 'v1'}
+
+def test_request_key_ignores_key_order_and_tracks_the_dataset():
+    key = request_key({'components': [{'style': 'CK', 'temperature': 40}], 'top_n': 5}, 'digest-a')
+    assert key == request_key({'top_n': 5, 'components': [{'temperature': 40, 'style': 'CK'}]}, 'digest-a')
+    assert key != request_key({'components': [{'style': 'CK', 'temperature': 40}], 'top_n': 5}, 'digest-b')
+
+def test_raw_body_alias_gives_the_canonical_key():
+    cache = ResultCache(8, 1000, 60)
+    payload = {'components': [{'style': 'CK'}]}
+    body = b'{"components": [{"style": "CK"}]}'
+    assert cache.key(body, payload, 'd') == request_key(payload, 'd')
+    assert cache.key(body, payload, 'd') == request_key(payload, 'd')  # served by the alias map
+    assert cache.key(body, payload, 'other') == request_key(payload, 'other')
+
+def test_hits_after_the_first_calculation():
+    cache = ResultCache(8, 1000, 60)
+    calls = []
+    def calculate():
+        calls.append(1)
+        return response(3)
+    first, source = cache.get_or_calculate('k', calculate)
+    assert source == 'calculated'
+    second, source = cache.get_or_calculate('k', calculate)
+    assert source == 'memory'
+    assert second is first
+    assert len(calls) == 1
+    assert cache.cache_stats() == (1, 1)
+
+def test_identical_requests_coalesce_into_one_calculation():
+    cache = ResultCache(8, 1000, 60)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    def calculate():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return response(2)
+
+    outcomes = []
+    def request():
+        outcomes.append(cache.get_or_calculate('same', calculate))
+    leader = threading.Thread(target=request)
+    leader.start()
+    assert started.wait(5)
+    followers = [threading.Thread(target=request) for _ in range(5)]
+    for thread in followers:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert len(outcomes) == 6
+    assert len({id(value) for value, _ in outcomes}) == 1
+    sources = sorted(source for _, source in outcomes)
+    assert sources.count('calculated') == 1
+    assert set(sources) <= {'calculated', 'coalesced', 'memory'}
+
+def test_a_failed_calculation_reaches_every_waiter_and_is_not_cached():
+    cache = ResultCache(8, 1000, 60)
+    started = threading.Event()
+    release = threading.Event()
+    def calculate():
+        started.set()
+        release.wait(5)
+        raise ValueError('bad input')
+
+    errors = []
+    def request():
+        try:
+            cache.get_or_calculate('k', calculate)
+        except ValueError as e:
+            errors.append(str(e))
+    threads = [threading.Thread(target=request)]
+    threads[0].start()
+    assert started.wait(5)
+    threads += [threading.Thread(target=request) for _ in range(3)]
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert errors == ['bad input'] * 4
+    assert cache.get_or_calculate('k', lambda: response(1))[1] == 'calculated'
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ResultCache(2, 1000, 60)
+    cache.get_or_calculate('a', lambda: response(1))
+    cache.get_or_calculate('b', lambda: response(1))
+    cache.get_or_calculate('a', lambda: response(1))  # 'a' becomes most recent
+    cache.get_or_calculate('c', lambda: response(1))
+    assert list(cache._entries) == ['a', 'c']
+
+def test_row_budget_evicts_but_keeps_the_newest_response():
+    cache = ResultCache(10, 5, 60)
+    cache.get_or_calculate('a', lambda: response(3))
+    cache.get_or_calculate('b', lambda: response(3))
+    assert list(cache._entries) == ['b']
+    cache.get_or_calculate('huge', lambda: response(50))
+    assert list(cache._entries) == ['huge']
+    assert cache.info()['rows'] == 50
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, 'monotonic', lambda: now[0])
+    cache = ResultCache(8, 1000, 10)
+    cache.get_or_calculate('k', lambda: response(1))
+    now[0] += 5
+    assert cache.get_or_calculate('k', lambda: response(1))[1] == 'memory'
+    now[0] += 11
+    assert cache.get_or_calculate('k', lambda: response(1))[1] == 'calculated'
+
+def test_disabled_memory_tier_still_coalesces_and_calculates():
+    cache = ResultCache(0, 1000, 60)
+    assert cache.get_or_calculate('k', lambda: response(1))[1] == 'calculated'
+    assert cache.get_or_calculate('k', lambda: response(1))[1] == 'calculated'
+    assert cache.info()['entries'] == 0
+
+def test_disk_tier_serves_responses_after_a_restart(tmp_path):
+    path = str(tmp_path / 'results.db')
+    disk = DiskTier(path, 10, 3600)
+    cache = ResultCache(8, 1000, 60, disk)
+    stored, _ = cache.get_or_calculate('k', lambda: response(2, 'row'))
+    disk.flush()
+
+    restarted = ResultCache(8, 1000, 60, DiskTier(path, 10, 3600))
+    value, source = restarted.get_or_calculate('k', lambda: pytest.fail('should not recalculate'))
+    assert source == 'disk'
+    assert value == stored
+    assert restarted.get_or_calculate('k', lambda: response(1))[1] == 'memory'
+
+def test_disk_responses_of_another_version_are_not_served(tmp_path):
+    path = str(tmp_path / 'results.db')
+    payload = {'components': [{'style': 'CK'}]}
+    body = b'{"components": [{"style": "CK"}]}'
+    disk = DiskTier(path, 10, 3600)
+    old = ResultCache(8, 1000, 60, disk, version='1.0.0')
+    old.get_or_calculate(old.key(body, payload, 'd'), lambda: response(1, 'old'))
+    disk.flush()
+
+    upgraded = ResultCache(8, 1000, 60, DiskTier(path, 10, 3600), version='1.1.0')
+    key = upgraded.key(body, payload, 'd')
+    assert key == request_key(payload, 'd', '1.1.0') != request_key(payload, 'd', '1.0.0')
+    assert upgraded.get_or_calculate(key, lambda: response(1, 'new'))[1] == 'calculated'
+
+def test_unusable_disk_path_falls_back_to_memory(tmp_path):
+    assert result_cache.open_disk_tier(None, 10, 60) is None
+    assert result_cache.open_disk_tier(str(tmp_path / 'missing' / 'results.db'), 10, 60) is None
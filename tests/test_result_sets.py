@@ -0,0 +1,164 @@
+"""Result sets: sorted and filtered windows, and the bounded store"""
+
+import random
+
+import pytest
+
+import result_sets
+from result_sets import ResultSet, ResultStore
+
+STYLES = ['CK', 'CSR', 'CWR', 'RC', None]
+
+def _results(count=200, seed=7):
+    rng = random.Random(seed)
+    results = []
+    for i in range(count):
+        style = rng.choice(STYLES)
+        result = {'name': f'part-{rng.randrange(50)}', 'style': style,
+                  'lambda_p': round(rng.choice([0.0, 1e-4, 2e-3]) + rng.random() * 1e-3, 4)}
+        if style == 'RC':
+            result['component_type'] = 'resistor'
+        results.append(result)
+    return results
+
+def _expected(results, sort, descending, style=None, component_type=None, min_lambda=None, max_lambda=None):
+    """The window's rows the slow way: filter, then a stable sort"""
+    rows = [i for i, result in enumerate(results)
+            if (style is None or result['style'] == style)
+            and (component_type is None or result.get('component_type', 'capacitor') == component_type)
+            and (min_lambda is None or result['lambda_p'] >= min_lambda)
+            and (max_lambda is None or result['lambda_p'] <= max_lambda)]
+    if sort != 'index':
+        value = {'lambda_p': lambda i: results[i]['lambda_p'], 'name': lambda i: results[i]['name'],
+                 'style': lambda i: results[i]['style'] or ''}[sort]
+        rows.sort(key=value)
+    return rows[::-1] if descending else rows
+
+@pytest.mark.parametrize('sort', result_sets.SORT_KEYS)
+@pytest.mark.parametrize('descending', [False, True])
+@pytest.mark.parametrize('filters', [
+    {},
+    {'style': 'CSR'},
+    {'component_type': 'resistor'},
+    {'min_lambda': 1e-4, 'max_lambda': 2e-3},
+    {'max_lambda': 1e-4},
+    {'style': 'CK', 'min_lambda': 5e-4},
+])
+def test_windows_match_a_full_sort(sort, descending, filters):
+    results = _results()
+    result_set = ResultSet(results, 1.5, 'v1')
+    expected = _expected(results, sort, descending, **filters)
+
+    window = result_set.window('set-1', offset=10, limit=25, sort=sort, descending=descending, **filters)
+    assert window['matching_count'] == len(expected)
+    assert window['indexes'] == expected[10:35]
+    assert window['components'] == [results[i] for i in expected[10:35]]
+    assert (window['row_count'], window['total_lambda_p'], window['dataset_version']) == (len(results), 1.5, 'v1')
+
+    # A repeated view is served from the filter cache and stays the same
+    assert result_set.window('set-1', offset=10, limit=25, sort=sort, descending=descending, **filters) == window
+
+def test_paging_covers_every_matching_row_once():
+    results = _results()
+    result_set = ResultSet(results, 0.0, 'v1')
+    seen = []
+    for offset in range(0, len(results), 30):
+        seen += result_set.window('set-1', offset=offset, limit=30, sort='lambda_p', descending=True)['indexes']
+    assert seen == _expected(results, 'lambda_p', True)
+    assert result_set.window('set-1', offset=len(results), limit=30)['indexes'] == []
+
+def test_ties_keep_input_order():
+    results = [{'name': 'b', 'lambda_p': 1.0}, {'name': 'a', 'lambda_p': 1.0}, {'name': 'b', 'lambda_p': 0.5}]
+    result_set = ResultSet(results, 2.5, 'v1')
+    assert result_set.window('set-1', sort='lambda_p')['indexes'] == [2, 0, 1]
+    assert result_set.window('set-1', sort='name')['indexes'] == [1, 0, 2]
+
+def test_unknown_sort_is_rejected():
+    with pytest.raises(ValueError, match="Unknown sort key 'mtbf'"):
+        ResultSet(_results(5), 0.0, 'v1').window('set-1', sort='mtbf')
+
+def test_store_evicts_least_recently_used_sets():
+    store = ResultStore(2, 1000, 60)
+    first, first_set = store.put(_results(5), 0.0, 'v1')
+    second, _ = store.put(_results(5), 0.0, 'v1')
+    assert store.get(first) is first_set  # first becomes most recent
+    third, third_set = store.put(_results(5), 0.0, 'v1')
+    assert store.get(second) is None
+    assert store.get(first) is first_set
+    assert store.get(third) is third_set
+
+def test_store_row_budget_keeps_the_newest_set():
+    store = ResultStore(10, 100, 60)
+    first, _ = store.put(_results(60), 0.0, 'v1')
+    second, second_set = store.put(_results(60), 0.0, 'v1')
+    assert store.get(first) is None
+    assert store.get(second) is second_set
+    huge, huge_set = store.put(_results(500), 0.0, 'v1')
+    assert store.get(huge) is huge_set
+    assert store.info()['rows'] == 500
+
+def test_store_sets_expire_after_the_ttl(monkeypatch):
+    now = [500.0]
+    monkeypatch.setattr(result_sets.time, 'monotonic', lambda: now[0])
+    store = ResultStore(10, 1000, 30)
+    result_id, result_set = store.put(_results(5), 0.0, 'v1')
+    now[0] += 20
+    assert store.get(result_id) is result_set
+    now[0] += 31
+    assert store.get(result_id) is None
+    assert store.info()['rows'] == 0
+
+def test_keyed_sets_are_shared_under_separate_ids():
+    store = ResultStore(10, 1000, 60)
+    first, shared = store.put(_results(5), 0.0, 'v1', key='request-a')
+    second, again = store.put(_results(5), 0.0, 'v1', key='request-a')
+    assert again is shared and second != first
+    assert store.info()['rows'] == 5  # shared rows count once
+    assert store.put(_results(5), 0.0, 'v1', key='request-b')[1] is not shared
+    assert store.put(_results(5), 0.0, 'v1')[1] is not shared
+
+    # One client deleting its set leaves the other's in place
+    assert store.delete(first) is True
+    assert store.delete(first) is False
+    assert store.get(second) is shared
+    assert store.put(_results(5), 0.0, 'v1', key='request-a')[1] is shared
+
+def test_keyed_set_is_rebuilt_once_every_id_is_gone():
+    store = ResultStore(10, 1000, 60)
+    result_id, shared = store.put(_results(5), 0.0, 'v1', key='request-a')
+    store.delete(result_id)
+    assert store.info()['rows'] == 0
+    assert store.put(_results(5), 0.0, 'v1', key='request-a')[1] is not shared
+
+def test_results_endpoint_pages_a_calculation(client):
+    components = [{'name': f'C{i}', 'style': 'CK', 'temperature': 25 + i} for i in range(12)]
+    report = client.post('/api/calculate', json={'components': components, 'window': {'limit': 3, 'sort': 'lambda_p',
+                                                                                      'order': 'desc'}}).get_json()
+    result_id = report['result_id']
+    assert report['window']['indexes'] == [11, 10, 9]
+
+    window = client.get(f'/api/results/{result_id}?offset=3&limit=4&sort=lambda_p&order=desc').get_json()
+    assert window['indexes'] == [8, 7, 6, 5]
+    assert window['components'] == [report['components'][i] for i in window['indexes']]
+
+    assert client.get(f'/api/results/{result_id}?sort=mtbf').status_code == 400
+    assert client.get(f'/api/results/{result_id}?order=up').status_code == 400
+    assert client.delete(f'/api/results/{result_id}').status_code == 200
+    assert client.get(f'/api/results/{result_id}').status_code == 404
+    assert client.delete(f'/api/results/{result_id}').status_code == 404
+
+def test_identical_calculations_get_their_own_result_ids(client):
+    request = {'components': [{'name': f'C{i}', 'style': 'CK'} for i in range(4)]}
+    first = client.post('/api/calculate', json=request).get_json()['result_id']
+    second = client.post('/api/calculate', json=request).get_json()['result_id']
+    assert first != second
+    assert client.delete(f'/api/results/{first}').status_code == 200
+    window = client.get(f'/api/results/{second}?limit=2').get_json()
+    assert (window['result_id'], window['indexes']) == (second, [0, 1])
+
+@pytest.mark.parametrize('window', [5, 'first', [0, 10], {'offset': 'ten'}, {'limit': None}, {'sort': ['lambda_p']},
+                                    {'style': {'CK': 1}}, {'min_lambda': [0]}, {'order': 'up'}])
+def test_malformed_windows_are_rejected(client, window):
+    response = client.post('/api/calculate', json={'components': [{'style': 'CK'}], 'window': window})
+    assert response.status_code == 400
+    assert 'error' in response.get_json()